@@ -0,0 +1,179 @@
+"""
+pyperf benchmarks for the ``__eq__`` and ``__hash__`` methods generated
+by :func:`nti.schema.eqhash.EqHash`.
+
+Run with ``python benchmarks/bench_eqhash.py -o eqhash.json``.
+"""
+from __future__ import print_function, absolute_import
+import pyperf
+
+from nti.schema.eqhash import EqHash
+from nti.schema.eqhash import superhash_memo
+from nti.schema.eqhash import content_digest
+from nti.schema.eqhash import unique
+
+INNERLOOPS = 100
+
+@EqHash('a', 'b')
+class Thing(object):
+    a = 'a'
+    b = 'b'
+
+@EqHash('a', 'b', superhash=True)
+class SuperThing(object):
+    a = 'a'
+    b = 'b'
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+@EqHash('a', 'b', include_type=True)
+class TypeThing(object):
+    a = 'a'
+    b = 'b'
+
+@EqHash('c', include_super=True)
+class ChildThing(Thing):
+    c = 'c'
+
+@EqHash('a', 'b', ordering=True)
+class OrderedThing(object):
+
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+@EqHash('a', 'b', 'c', 'd', 'e', 'f')
+class ManyThing(object):
+    a = 'a'
+    b = 'b'
+    c = 'c'
+    d = 'd'
+    e = 'e'
+    f = 'f'
+
+
+def bench_hash(loops, thing):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNERLOOPS):
+            hash(thing)
+    return pyperf.perf_counter() - t0
+
+def bench_eq(loops, thing, thing2):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNERLOOPS):
+            thing == thing2 # pylint:disable=pointless-statement
+    return pyperf.perf_counter() - t0
+
+
+def bench_sort(loops, things, key):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        sorted(things, key=key)
+    return pyperf.perf_counter() - t0
+
+
+INSTANCES = (
+    ('base', Thing, {}),
+    ('super', ChildThing, {}),
+    ('type', TypeThing, {}),
+    ('many', ManyThing, {}),
+    ('superhash', SuperThing, {}),
+    ('superhash dict', SuperThing, {'a': {'key': [1, 2, 3]}}),
+)
+
+runner = pyperf.Runner()
+
+for bench_name, factory, kwargs in INSTANCES:
+    instance = factory(**kwargs) if kwargs else factory()
+    runner.bench_time_func(
+        'hash ' + bench_name,
+        bench_hash,
+        instance,
+        inner_loops=INNERLOOPS
+    )
+
+for bench_name, factory, kwargs in INSTANCES:
+    instance = factory(**kwargs) if kwargs else factory()
+    instance2 = factory(**kwargs) if kwargs else factory()
+    runner.bench_time_func(
+        'eq ' + bench_name,
+        bench_eq,
+        instance,
+        instance2,
+        inner_loops=INNERLOOPS
+    )
+
+ORDERED_THINGS = [OrderedThing(i % 37, -i) for i in range(1000)]
+runner.bench_time_func('sort 1000 ordering', bench_sort, ORDERED_THINGS, None)
+runner.bench_time_func('sort 1000 sort_key', bench_sort, ORDERED_THINGS,
+                       OrderedThing.sort_key())
+
+
+def make_blob(width, depth):
+    # A JSON-like blob of nested dicts and lists.
+    if depth == 0:
+        return list(range(width))
+    return {
+        'key%d' % i: [make_blob(width, depth - 1), 'text', i]
+        for i in range(width)
+    }
+
+def bench_hash_blob(loops, thing, memo):
+    t0 = pyperf.perf_counter()
+    if memo:
+        with superhash_memo():
+            for _ in range(loops):
+                hash(thing)
+    else:
+        for _ in range(loops):
+            hash(thing)
+    return pyperf.perf_counter() - t0
+
+for blob_name, blob in (('wide', make_blob(1000, 1)),
+                        ('deep', make_blob(4, 6))):
+    blob_thing = SuperThing(a=blob)
+    runner.bench_time_func('hash superhash %s blob' % blob_name,
+                           bench_hash_blob, blob_thing, False)
+    runner.bench_time_func('hash superhash %s blob memo' % blob_name,
+                           bench_hash_blob, blob_thing, True)
+
+
+def bench_digest(loops, thing):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        content_digest(thing)
+    return pyperf.perf_counter() - t0
+
+runner.bench_time_func('content_digest base', bench_digest, Thing())
+runner.bench_time_func('content_digest wide blob', bench_digest,
+                       SuperThing(a=make_blob(1000, 1)))
+
+
+def bench_dedupe(loops, func, things):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        func(things)
+    return pyperf.perf_counter() - t0
+
+def dedupe_with_set(things):
+    seen = set()
+    result = []
+    for thing in things:
+        if thing not in seen:
+            seen.add(thing)
+            result.append(thing)
+    return result
+
+DUPLICATE_THINGS = [OrderedThing(i % 1000, 'b') for i in range(100000)]
+runner.bench_time_func('dedupe 100000 set', bench_dedupe,
+                       dedupe_with_set, DUPLICATE_THINGS)
+runner.bench_time_func('dedupe 100000 unique', bench_dedupe,
+                       unique, DUPLICATE_THINGS)
+MANY_THINGS = [ManyThing() for _ in range(100000)]
+runner.bench_time_func('dedupe 100000 many set', bench_dedupe,
+                       dedupe_with_set, MANY_THINGS)
+runner.bench_time_func('dedupe 100000 many unique', bench_dedupe,
+                       unique, MANY_THINGS)
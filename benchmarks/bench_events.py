@@ -0,0 +1,87 @@
+"""
+pyperf benchmarks for the events sent when values are set through the
+fields of :mod:`nti.schema.field`.
+
+Each is measured with no handlers, with
+:func:`nti.schema.subscribers.before_object_assigned_event_dispatcher`
+(as ``configure.zcml`` registers it), and with that plus an object
+event handler that it dispatches to.
+
+Run with ``python benchmarks/bench_events.py -o events.json``.
+"""
+from __future__ import print_function, absolute_import
+import pyperf
+
+# Hook zope.component into zope.event, as including zope.component's
+# configuration does.
+import zope.component.event # pylint:disable=unused-import
+from zope.component import getGlobalSiteManager
+from zope.interface import Interface
+from zope.interface import implementer
+
+from nti.schema.field import ListOrTuple
+from nti.schema.field import Object
+from nti.schema.field import ValidTextLine
+from nti.schema.interfaces import IBeforeSchemaFieldAssignedEvent
+from nti.schema.subscribers import before_object_assigned_event_dispatcher
+
+INNERLOOPS = 100
+
+
+class IThing(Interface): # pylint:disable=inherit-non-class
+    name = ValidTextLine(title=u'Name')
+    tags = ListOrTuple(ValidTextLine(), title=u'Tags')
+    child = Object(Interface, title=u'Child')
+
+@implementer(IThing)
+class Thing(object):
+    name = None
+    tags = ()
+    child = None
+
+#: (name, field, value)
+FIELDS = (
+    ('ValidTextLine', IThing['name'], u'A name'),
+    ('ListOrTuple', IThing['tags'], (u'a', u'b', u'c')),
+    ('Object', IThing['child'], Thing()),
+)
+
+def object_handler(value, context, event): # pylint:disable=unused-argument
+    pass
+
+HANDLERS = (
+    ('no handlers', ()),
+    ('dispatcher', (
+        (before_object_assigned_event_dispatcher, None),
+    )),
+    ('dispatcher and object handler', (
+        (before_object_assigned_event_dispatcher, None),
+        (object_handler, (Interface, IThing, IBeforeSchemaFieldAssignedEvent)),
+    )),
+)
+
+
+def bench_set(loops, field, value, handlers):
+    gsm = getGlobalSiteManager()
+    for handler, required in handlers:
+        gsm.registerHandler(handler, required)
+    try:
+        context = Thing()
+        set_ = field.set
+        t0 = pyperf.perf_counter()
+        for _ in range(loops):
+            for _ in range(INNERLOOPS):
+                set_(context, value)
+        return pyperf.perf_counter() - t0
+    finally:
+        for handler, required in handlers:
+            gsm.unregisterHandler(handler, required)
+
+
+runner = pyperf.Runner()
+
+for handlers_name, bench_handlers in HANDLERS:
+    for field_name, bench_field, bench_value in FIELDS:
+        runner.bench_time_func('set %s %s' % (field_name, handlers_name),
+                               bench_set, bench_field, bench_value, bench_handlers,
+                               inner_loops=INNERLOOPS)
@@ -0,0 +1,135 @@
+"""
+pyperf benchmarks for validating the fields of :mod:`nti.schema.field`,
+and for the paths of :class:`nti.schema.field.Variant` that find a
+matching field on the first try (hit) or don't find one at all (miss).
+
+Run with ``python benchmarks/bench_field.py -o field.json``.
+"""
+from __future__ import print_function, absolute_import
+import datetime
+import decimal
+
+import pyperf
+
+from zope.interface import Interface
+from zope.interface import implementer
+
+from nti.schema.field import Bool
+from nti.schema.field import Date
+from nti.schema.field import Decimal
+from nti.schema.field import Dict
+from nti.schema.field import HTTPURL
+from nti.schema.field import IndexedIterable
+from nti.schema.field import Int
+from nti.schema.field import ListOrTuple
+from nti.schema.field import Number
+from nti.schema.field import Object
+from nti.schema.field import StrippedValidTextLine
+from nti.schema.field import ValidBytes
+from nti.schema.field import ValidChoice
+from nti.schema.field import ValidDatetime
+from nti.schema.field import ValidRegularExpression
+from nti.schema.field import ValidSet
+from nti.schema.field import ValidText
+from nti.schema.field import ValidTextLine
+from nti.schema.field import ValidURI
+from nti.schema.field import Variant
+
+INNERLOOPS = 100
+
+
+class IThing(Interface): # pylint:disable=inherit-non-class
+    name = ValidTextLine(title=u'Name')
+
+@implementer(IThing)
+class Thing(object):
+    name = u'A name'
+
+
+#: (name, field, valid value)
+FIELDS = (
+    ('Bool', Bool(), True),
+    ('Int', Int(min=0, max=1000), 42),
+    ('Number', Number(), 4.2),
+    ('Decimal', Decimal(), decimal.Decimal('4.2')),
+    ('ValidBytes', ValidBytes(max_length=100), b'Some bytes'),
+    ('ValidText', ValidText(max_length=1000), u'Some text\nwith lines'),
+    ('ValidTextLine', ValidTextLine(max_length=100), u'Some text'),
+    ('StrippedValidTextLine', StrippedValidTextLine(max_length=100), u'Some text'),
+    ('ValidRegularExpression',
+     ValidRegularExpression('[a-z]+@[a-z]+', flags=0), u'user@example'),
+    ('ValidURI', ValidURI(), 'http://example.com/path'),
+    ('HTTPURL', HTTPURL(), 'http://example.com/path'),
+    ('Date', Date(), datetime.date(2020, 1, 1)),
+    ('ValidDatetime', ValidDatetime(), datetime.datetime(2020, 1, 1)),
+    ('ValidChoice', ValidChoice(values=('a', 'b', 'c')), 'b'),
+    ('Object', Object(IThing), Thing()),
+    ('ListOrTuple 10', ListOrTuple(ValidTextLine()), [u'text'] * 10),
+    ('IndexedIterable 10', IndexedIterable(ValidTextLine()), [u'text'] * 10),
+    ('ValidSet 10', ValidSet(value_type=Int()), set(range(10))),
+    ('Dict 10', Dict(key_type=ValidTextLine(), value_type=Int()),
+     {u'key%d' % i: i for i in range(10)}),
+)
+
+for _, bench_field, bench_value in FIELDS:
+    bench_field.validate(bench_value)
+
+
+def bench_validate(loops, field, value):
+    validate = field.validate
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNERLOOPS):
+            validate(value)
+    return pyperf.perf_counter() - t0
+
+
+VARIANT = Variant((
+    Int(),
+    Object(IThing),
+    ValidTextLine(),
+    ListOrTuple(ValidTextLine()),
+), __name__='variant')
+
+
+def bench_variant_from_object(loops, value):
+    from_object = VARIANT.fromObject
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNERLOOPS):
+            try:
+                from_object(value)
+            except Exception: # pylint:disable=broad-except
+                pass
+    return pyperf.perf_counter() - t0
+
+
+def bench_variant_validate(loops, value):
+    validate = VARIANT.validate
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNERLOOPS):
+            try:
+                validate(value)
+            except Exception: # pylint:disable=broad-except
+                pass
+    return pyperf.perf_counter() - t0
+
+
+runner = pyperf.Runner()
+
+for bench_name, bench_field, bench_value in FIELDS:
+    runner.bench_time_func('validate ' + bench_name,
+                           bench_validate, bench_field, bench_value,
+                           inner_loops=INNERLOOPS)
+
+# The first field converts it.
+runner.bench_time_func('Variant fromObject hit', bench_variant_from_object, 42,
+                       inner_loops=INNERLOOPS)
+# Every field is tried and fails.
+runner.bench_time_func('Variant fromObject miss', bench_variant_from_object, 4.2,
+                       inner_loops=INNERLOOPS)
+runner.bench_time_func('Variant validate hit', bench_variant_validate, 42,
+                       inner_loops=INNERLOOPS)
+runner.bench_time_func('Variant validate miss', bench_variant_validate, 4.2,
+                       inner_loops=INNERLOOPS)
@@ -0,0 +1,43 @@
+"""
+pyperf benchmarks for ``fromObject`` of the collection fields of
+:mod:`nti.schema.field`, with 10, 1,000 and 100,000 elements.
+
+Run with ``python benchmarks/bench_fromobject.py -o fromobject.json``.
+"""
+from __future__ import print_function, absolute_import
+import pyperf
+
+from nti.schema.field import DictFromObject
+from nti.schema.field import Int
+from nti.schema.field import ListOrTupleFromObject
+from nti.schema.field import TupleFromObject
+from nti.schema.field import ValidTextLine
+
+SIZES = (10, 1000, 100000)
+
+#: (name, field, function to make a value with that many elements)
+FIELDS = (
+    ('ListOrTupleFromObject(Int)', ListOrTupleFromObject(Int()),
+     lambda size: [str(i) for i in range(size)]),
+    ('TupleFromObject(ValidTextLine)', TupleFromObject(ValidTextLine()),
+     lambda size: [u'text %d' % i for i in range(size)]),
+    ('DictFromObject(ValidTextLine, Int)',
+     DictFromObject(key_type=ValidTextLine(), value_type=Int()),
+     lambda size: {u'key%d' % i: str(i) for i in range(size)}),
+)
+
+
+def bench_from_object(loops, field, value):
+    from_object = field.fromObject
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        from_object(value)
+    return pyperf.perf_counter() - t0
+
+
+runner = pyperf.Runner()
+
+for bench_name, bench_field, make_value in FIELDS:
+    for bench_size in SIZES:
+        runner.bench_time_func('fromObject %s %d' % (bench_name, bench_size),
+                               bench_from_object, bench_field, make_value(bench_size))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the time it takes to import ``nti.schema`` modules.
+
+Each loop imports the module in a new interpreter started with
+``-X importtime`` and records the cumulative time the interpreter
+reports for the module, so interpreter startup isn't included.
+Imports that the module shares with ``zope.schema`` can be excluded
+by comparing with the ``zope.schema`` benchmark.
+"""
+import os
+import subprocess
+import sys
+
+import pyperf
+
+
+def import_time(module, code=None):
+    env = dict(os.environ)
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code or 'import ' + module],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+    ).stderr.decode('utf-8')
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    raise AssertionError("Module not imported", module, stderr)
+
+
+def bench_import(loops, module, code=None):
+    total = 0
+    for _ in range(loops):
+        total += import_time(module, code)
+    return total
+
+
+runner = pyperf.Runner()
+runner.bench_time_func('import zope.schema',
+                       bench_import, 'zope.schema')
+runner.bench_time_func('import nti.schema.field',
+                       bench_import, 'nti.schema.field')
+# What the first use of a lazily defined field costs.
+runner.bench_time_func('first use of nti.schema.field.Variant',
+                       bench_import, 'nti.schema._lazyfields',
+                       'import nti.schema.field; nti.schema.field.Variant')
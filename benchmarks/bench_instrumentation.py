@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for ``nti.schema.instrumentation``.
+
+These validate a field, convert a sequence and create a
+``SchemaConfigured`` object with instrumentation disabled (the default)
+and enabled.
+"""
+import pyperf
+
+from zope.interface import Interface
+from zope.interface import implementer
+
+from nti.schema.field import Int
+from nti.schema.field import ListOrTupleFromObject
+from nti.schema.field import ValidTextLine
+from nti.schema.fieldproperty import createDirectFieldProperties
+from nti.schema.instrumentation import disable_instrumentation
+from nti.schema.instrumentation import enable_instrumentation
+from nti.schema.schema import SchemaConfigured
+
+INNERLOOPS = 100
+
+class IThing(Interface): # pylint:disable=inherit-non-class
+    name = ValidTextLine(title=u'Name', max_length=100)
+    size = Int(title=u'Size', min=0)
+
+@implementer(IThing)
+class Thing(SchemaConfigured):
+    createDirectFieldProperties(IThing)
+
+NAME = IThing['name']
+NUMBERS = ListOrTupleFromObject(Int(), __name__='numbers')
+VALUES = ['1', '2', '3']
+
+
+def validate():
+    NAME.validate(u'A name')
+
+def convert():
+    NUMBERS.fromObject(VALUES)
+
+def create():
+    Thing(name=u'A name', size=1)
+
+
+def bench(loops, func, enabled):
+    if enabled:
+        enable_instrumentation()
+    try:
+        t0 = pyperf.perf_counter()
+        for _ in range(loops):
+            for _ in range(INNERLOOPS):
+                func()
+        return pyperf.perf_counter() - t0
+    finally:
+        disable_instrumentation()
+
+
+runner = pyperf.Runner()
+for bench_func in validate, convert, create:
+    for bench_enabled in False, True:
+        runner.bench_time_func(
+            '%s (instrumentation %s)' % (
+                bench_func.__name__, 'enabled' if bench_enabled else 'disabled'),
+            bench, bench_func, bench_enabled,
+            inner_loops=INNERLOOPS
+        )
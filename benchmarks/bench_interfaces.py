@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for ``nti.schema.interfaces``.
+"""
+
+import pyperf
+
+from zope.interface.registry import Components
+from zope.interface import Interface
+from zope.interface import implementer
+from zope.interface.interface import InterfaceClass
+from zope.schema import interfaces as sch_interfaces
+from zope.schema._bootstrapfields import BeforeObjectAssignedEvent
+
+from nti.schema.field import ValidTextLine
+from nti.schema.interfaces import IBeforeSchemaFieldAssignedEvent
+from nti.schema.interfaces import find_most_derived_interface
+
+
+def bench_find_most_derived(loops, field, upper_bound):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        find_most_derived_interface(field, upper_bound)
+    return pyperf.perf_counter() - t0
+
+
+def _handler(*_args):
+    "Does nothing"
+
+def make_registry(count):
+    """
+    Return a registry with *count* event interfaces that each have a
+    subscriber, and a list of objects providing them, and
+    ``BeforeObjectAssignedEvent``, to look up subscribers for.
+    """
+    registry = Components()
+    events = [BeforeObjectAssignedEvent(None, 'name', None)]
+    registry.registerHandler(_handler, (IBeforeSchemaFieldAssignedEvent,))
+    for i in range(count):
+        iface = InterfaceClass('IEvent%d' % i, (Interface,), __module__=__name__)
+        registry.registerHandler(_handler, (iface,))
+        events.append(implementer(iface)(type('Event%d' % i, (object,), {}))())
+    return registry, events
+
+def bench_reassign_bases(loops, count, reassign=True):
+    # Timing the reassignment alone would miss most of the cost, which
+    # is in filling the lookup caches it discards.
+    registry, events = make_registry(count)
+    iface = sch_interfaces.IBeforeObjectAssignedEvent
+    patched_bases = iface.__bases__
+    original_bases = (Interface,)
+    duration = 0
+    try:
+        for _ in range(loops):
+            if reassign:
+                iface.__bases__ = original_bases
+            for event in events:
+                registry.subscribers((event,), None)
+
+            t0 = pyperf.perf_counter()
+            if reassign:
+                iface.__bases__ = patched_bases
+            for event in events:
+                registry.subscribers((event,), None)
+            duration += pyperf.perf_counter() - t0
+    finally:
+        iface.__bases__ = patched_bases
+    return duration
+
+
+runner = pyperf.Runner()
+runner.bench_time_func('find_most_derived_interface ValidTextLine',
+                       bench_find_most_derived,
+                       ValidTextLine(), sch_interfaces.IField)
+for count in (0, 1000):
+    runner.bench_time_func('subscriber lookups with %d registrations' % count,
+                           bench_reassign_bases, count, False)
+    runner.bench_time_func('reassign IBeforeObjectAssignedEvent bases with %d registrations' % count,
+                           bench_reassign_bases, count)
@@ -0,0 +1,138 @@
+"""
+pyperf benchmarks for :class:`nti.schema.jsonschema.JsonSchemafier`.
+
+Run with ``python benchmarks/bench_jsonschema.py -o jsonschema.json``.
+"""
+from __future__ import print_function, absolute_import
+import io
+import json
+
+import pyperf
+
+from zope.interface import Interface
+from zope.interface.interface import InterfaceClass
+from zope.schema import Choice
+from zope.schema.vocabulary import SimpleTerm
+from zope.schema.vocabulary import SimpleVocabulary
+
+from nti.schema.field import Dict
+from nti.schema.field import Int
+from nti.schema.field import ListOrTuple
+from nti.schema.field import Object
+from nti.schema.field import ValidTextLine
+from nti.schema.field import Variant
+from nti.schema.jsonschema import JsonSchemafier
+from nti.schema.jsonschema import get_data_from_choice_field
+from nti.schema.jsonschema import get_json_from_choice_field
+from nti.schema.jsonschema import make_schemas
+
+#: How many levels of nested ``Object`` fields
+DEPTH = 3
+#: How many simple fields at each level
+WIDTH = 10
+
+def make_leaf_fields(prefix):
+    fields = {}
+    for i in range(WIDTH):
+        fields['%s_text_%d' % (prefix, i)] = ValidTextLine(title='Text %d' % i,
+                                                          description='A text field',
+                                                          max_length=100)
+        fields['%s_int_%d' % (prefix, i)] = Int(title='Int %d' % i, min=0)
+    return fields
+
+def make_deep_iface():
+    iface = InterfaceClass('ILeaf', (Interface,), make_leaf_fields('leaf'),
+                           __module__=__name__)
+    for level in range(DEPTH):
+        attrs = make_leaf_fields('level%d' % level)
+        attrs['child'] = Object(iface, title='Child')
+        attrs['children'] = ListOrTuple(Object(iface), title='Children')
+        attrs['mapping'] = Dict(ValidTextLine(), Object(iface))
+        attrs['variant'] = Variant((Object(iface), ValidTextLine()))
+        iface = InterfaceClass('ILevel%d' % level, (Interface,), attrs,
+                               __module__=__name__)
+    return iface
+
+IDeep = make_deep_iface()
+
+#: Many interfaces that share nested interfaces, as in a
+#: large registry.
+IShared = InterfaceClass('IShared', (Interface,), make_leaf_fields('shared'),
+                         __module__=__name__)
+IShared2 = InterfaceClass('IShared2', (Interface,),
+                          dict(make_leaf_fields('shared2'),
+                               shared=Object(IShared),
+                               shared_list=ListOrTuple(Object(IShared))),
+                          __module__=__name__)
+MANY = [
+    InterfaceClass('IMany%d' % i, (Interface,),
+                   dict(make_leaf_fields('many%d' % i),
+                        shared=Object(IShared),
+                        shared2=Object(IShared2)),
+                   __module__=__name__)
+    for i in range(100)
+]
+
+def bench_make_schema(loops, iface, cache, definitions=False):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        JsonSchemafier(iface, cache=cache, definitions=definitions).make_schema()
+    return pyperf.perf_counter() - t0
+
+def bench_translate_template(loops, iface):
+    template = JsonSchemafier(iface).make_schema_template()
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        JsonSchemafier(iface).translate_template(template)
+    return pyperf.perf_counter() - t0
+
+def bench_choices(loops, field, func):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        func(field)
+    return pyperf.perf_counter() - t0
+
+def bench_dumps(loops, iface):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        json.dumps(JsonSchemafier(iface).make_schema(), sort_keys=True).encode('utf-8')
+    return pyperf.perf_counter() - t0
+
+def bench_write_schema(loops, iface):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        JsonSchemafier(iface).write_schema(io.BytesIO())
+    return pyperf.perf_counter() - t0
+
+def bench_many(loops, ifaces):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for iface in ifaces:
+            JsonSchemafier(iface).make_schema()
+    return pyperf.perf_counter() - t0
+
+def bench_make_schemas(loops, ifaces):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        make_schemas(ifaces)
+    return pyperf.perf_counter() - t0
+
+
+runner = pyperf.Runner()
+runner.bench_time_func('make_schema deep', bench_make_schema, IDeep, False)
+runner.bench_time_func('make_schema deep cached', bench_make_schema, IDeep, True)
+runner.bench_time_func('make_schema deep definitions', bench_make_schema, IDeep, False, True)
+runner.bench_time_func('translate_template deep', bench_translate_template, IDeep)
+
+COUNTRIES = Choice(vocabulary=SimpleVocabulary([
+    SimpleTerm('Country %d' % i, 'c%d' % i, 'Country %d' % i)
+    for i in range(250)
+]))
+runner.bench_time_func('get_data_from_choice_field 250 terms', bench_choices,
+                       COUNTRIES, get_data_from_choice_field)
+runner.bench_time_func('get_json_from_choice_field 250 terms', bench_choices,
+                       COUNTRIES, get_json_from_choice_field)
+runner.bench_time_func('json.dumps(make_schema) deep', bench_dumps, IDeep)
+runner.bench_time_func('write_schema deep', bench_write_schema, IDeep)
+runner.bench_time_func('make_schema 100 interfaces', bench_many, MANY)
+runner.bench_time_func('make_schemas 100 interfaces', bench_make_schemas, MANY)
@@ -0,0 +1,53 @@
+"""
+pyperf benchmarks for :mod:`nti.schema.jsonvalidator`.
+
+Run with ``python benchmarks/bench_jsonvalidator.py -o jsonvalidator.json``.
+"""
+from __future__ import print_function, absolute_import
+import pyperf
+
+from zope.interface import Interface
+from zope.schema import Int
+from zope.schema import Object
+
+from nti.schema.field import ListOrTuple
+from nti.schema.field import ValidTextLine
+from nti.schema.jsonvalidator import compile_validator_for_interface
+
+
+class IAddress(Interface):
+    street = ValidTextLine(max_length=100)
+    city = ValidTextLine(max_length=50)
+    zip = ValidTextLine(min_length=5, max_length=10)
+
+class IPerson(Interface):
+    name = ValidTextLine(min_length=1, max_length=100)
+    age = Int(min=0, max=150)
+    address = Object(IAddress)
+    tags = ListOrTuple(ValidTextLine(), required=False)
+
+
+PAYLOAD = {
+    'name': 'Jason',
+    'age': 42,
+    'address': {'street': '123 Main St', 'city': 'Norman', 'zip': '73069'},
+    'tags': ['a', 'b', 'c'],
+}
+
+def bench_validate(loops, validate, payload):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        validate(payload)
+    return pyperf.perf_counter() - t0
+
+def bench_compile(loops, iface):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        compile_validator_for_interface(iface)
+    return pyperf.perf_counter() - t0
+
+
+runner = pyperf.Runner()
+runner.bench_time_func('compile IPerson', bench_compile, IPerson)
+runner.bench_time_func('validate IPerson', bench_validate,
+                       compile_validator_for_interface(IPerson), PAYLOAD)
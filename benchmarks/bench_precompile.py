@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for ``nti.schema.precompile``.
+
+These compute the fields and JSON schema templates of many
+interfaces, as a process does at startup, with and without a cache
+file written by an earlier process.
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+import pyperf
+
+from nti.schema.jsonschema import JsonSchemafier
+from nti.schema.precompile import install_cache
+from nti.schema.precompile import uninstall_cache
+from nti.schema.schema import schemadict
+
+#: The number of interfaces
+COUNT = 600
+
+MODULE = '''
+from zope.interface import Interface
+from nti.schema.field import Int
+from nti.schema.field import ValidTextLine
+from nti.schema.field import Object
+from nti.schema.field import ListOrTuple
+
+class IBase(Interface):
+    id = ValidTextLine(title=u'The id')
+'''
+
+for i in range(COUNT):
+    MODULE += '''
+class IThing%d(IBase):
+    name = ValidTextLine(title=u'The name', max_length=100)
+    size = Int(title=u'The size', min=0)
+    tags = ListOrTuple(ValidTextLine(title=u'A tag'), title=u'The tags')
+    base = Object(IBase, title=u'Something')
+''' % i
+
+DIRECTORY = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, DIRECTORY)
+with open(os.path.join(DIRECTORY, 'bench_precompile_ifaces.py'), 'w') as f:
+    f.write(MODULE)
+sys.path.insert(0, DIRECTORY)
+import bench_precompile_ifaces # pylint:disable=import-error,wrong-import-position
+
+IFACES = [getattr(bench_precompile_ifaces, 'IThing%d' % i) for i in range(COUNT)]
+CACHE_PATH = os.path.join(DIRECTORY, 'cache')
+
+
+def compute():
+    for iface in IFACES:
+        iface.changed(iface)
+    for iface in IFACES:
+        schemadict(iface)
+        JsonSchemafier(iface, cache=True).make_schema_template()
+
+
+def bench_compute(loops, precompiled):
+    duration = 0
+    for _ in range(loops):
+        t0 = pyperf.perf_counter()
+        if precompiled:
+            install_cache(CACHE_PATH)
+        compute()
+        duration += pyperf.perf_counter() - t0
+        uninstall_cache()
+    return duration
+
+
+cache = install_cache(CACHE_PATH)
+compute()
+cache.save()
+uninstall_cache()
+
+runner = pyperf.Runner()
+runner.bench_time_func('compute %d interfaces' % COUNT,
+                       bench_compute, False)
+runner.bench_time_func('compute %d interfaces precompiled' % COUNT,
+                       bench_compute, True)
@@ -0,0 +1,97 @@
+"""
+pyperf benchmarks for :func:`nti.schema.schema.schemadict` on wide
+and deep interface hierarchies, computing the fields (cold) and
+using the cached fields (warm).
+
+Run with ``python benchmarks/bench_schemadict.py -o schemadict.json``.
+"""
+from __future__ import print_function, absolute_import
+import pyperf
+
+from zope.interface import Interface
+from zope.interface import implementedBy
+from zope.interface import implementer
+from zope.interface.interface import InterfaceClass
+
+from nti.schema.field import Int
+from nti.schema.field import ValidTextLine
+from nti.schema.schema import schemadict
+
+#: The number of interfaces in each hierarchy
+COUNT = 100
+INNERLOOPS = 100
+CACHE_KEY = '__nti_schema_schemadict'
+
+# Unrelated interfaces, each declaring two fields.
+leaf_ifaces = [
+    InterfaceClass(
+        'ILeaf%d' % i,
+        (Interface,),
+        {'text_%d' % i: ValidTextLine(), 'int_%d' % i: Int()}
+    )
+    for i in range(COUNT)
+]
+
+# Extends all of them.
+IWide = InterfaceClass('IWide', tuple(leaf_ifaces), {})
+
+def make_deep():
+    base = Interface
+    for i in range(COUNT):
+        base = InterfaceClass(
+            'IDeep%d' % i,
+            (base,),
+            {'text_%d' % i: ValidTextLine(), 'int_%d' % i: Int()}
+        )
+    return base
+
+# Each extends the previous one.
+IDeep = make_deep()
+
+@implementer(*leaf_ifaces)
+class WideClass(object):
+    pass
+
+@implementer(IDeep)
+class DeepClass(object):
+    pass
+
+SPECS = (
+    ('wide interface', IWide),
+    ('deep interface', IDeep),
+    ('implementedBy wide class', implementedBy(WideClass)),
+    ('implementedBy deep class', implementedBy(DeepClass)),
+)
+
+
+def bench_schemadict(loops, spec):
+    attrs = spec._v_attrs # pylint:disable=protected-access
+    if attrs is None:
+        schemadict(spec)
+        attrs = spec._v_attrs # pylint:disable=protected-access
+    duration = 0
+    for _ in range(loops):
+        attrs.pop(CACHE_KEY, None)
+        t0 = pyperf.perf_counter()
+        schemadict(spec)
+        duration += pyperf.perf_counter() - t0
+    return duration
+
+
+def bench_schemadict_cached(loops, spec):
+    schemadict(spec)
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for _ in range(INNERLOOPS):
+            schemadict(spec)
+    return pyperf.perf_counter() - t0
+
+
+runner = pyperf.Runner()
+
+for bench_name, bench_spec in SPECS:
+    runner.bench_time_func('schemadict %s %d' % (bench_name, COUNT),
+                           bench_schemadict, bench_spec)
+    runner.bench_time_func('schemadict %s %d cached' % (bench_name, COUNT),
+                           bench_schemadict_cached, bench_spec,
+                           inner_loops=INNERLOOPS)
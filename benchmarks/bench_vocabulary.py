@@ -0,0 +1,91 @@
+"""
+pyperf benchmarks for :mod:`nti.schema.vocabulary`.
+
+Run with ``python benchmarks/bench_vocabulary.py -o vocabulary.json``.
+"""
+from __future__ import print_function, absolute_import
+import pyperf
+
+from zope import component
+
+from nti.i18n.locales.countries import CountryAvailability
+from nti.i18n.locales.interfaces import ICountryAvailability
+
+from zope.schema.vocabulary import SimpleTerm
+from zope.schema.vocabulary import SimpleVocabulary
+
+from nti.schema.vocabulary import CountryVocabularyFactory
+from nti.schema.vocabulary import LazyVocabulary
+
+import zope.vocabularyregistry.registry # pylint:disable=unused-import
+from zope.schema.interfaces import IVocabularyFactory
+
+from nti.schema.field import ValidChoice
+
+component.provideUtility(CountryAvailability(), ICountryAvailability)
+component.provideUtility(CountryVocabularyFactory, IVocabularyFactory, 'Countries')
+
+
+def bench_country_factory(loops):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        CountryVocabularyFactory(None)
+    return pyperf.perf_counter() - t0
+
+def scan_prefix(vocabulary, prefix):
+    # What autocomplete widgets did before IndexedVocabulary
+    prefix = prefix.casefold()
+    return [term for term in vocabulary
+            if term.token.casefold().startswith(prefix)
+            or term.title.casefold().startswith(prefix)]
+
+def bench_prefix(loops, func, prefix):
+    vocabulary = CountryVocabularyFactory(None)
+    func(vocabulary, prefix) # Build indexes
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        func(vocabulary, prefix)
+    return pyperf.perf_counter() - t0
+
+def bench_fuzzy(loops, text):
+    vocabulary = CountryVocabularyFactory(None)
+    vocabulary.fuzzy_search(text)
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        vocabulary.fuzzy_search(text)
+    return pyperf.perf_counter() - t0
+
+#: A large vocabulary, as raw items.
+LARGE = [('t%d' % i, i, 'Title %d' % i) for i in range(50000)]
+
+def make_simple(items):
+    return SimpleVocabulary([SimpleTerm(value, token, title)
+                             for token, value, title in items])
+
+def bench_first_lookup(loops, factory):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        factory(LARGE).getTermByToken('t25000')
+    return pyperf.perf_counter() - t0
+
+def bench_validate_choice(loops, field):
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        field.validate('us')
+    return pyperf.perf_counter() - t0
+
+
+runner = pyperf.Runner()
+runner.bench_time_func('CountryVocabularyFactory', bench_country_factory)
+runner.bench_time_func('Countries scan prefix', bench_prefix, scan_prefix, 'uni')
+runner.bench_time_func('Countries search prefix', bench_prefix,
+                       lambda vocab, prefix: vocab.search(prefix), 'uni')
+runner.bench_time_func('Countries fuzzy_search', bench_fuzzy, 'Germny')
+runner.bench_time_func('50000 terms first lookup SimpleVocabulary',
+                       bench_first_lookup, make_simple)
+runner.bench_time_func('50000 terms first lookup LazyVocabulary',
+                       bench_first_lookup, LazyVocabulary)
+runner.bench_time_func('ValidChoice Countries validate', bench_validate_choice,
+                       ValidChoice(vocabulary='Countries'))
+runner.bench_time_func('ValidChoice Countries validate snapshot', bench_validate_choice,
+                       ValidChoice(vocabulary='Countries', snapshot=True))
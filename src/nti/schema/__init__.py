@@ -14,3 +14,32 @@ import zope.i18nmessageid
 __docformat__ = "restructuredtext en"
 
 MessageFactory = zope.i18nmessageid.MessageFactory('nti.dataserver')
+
+
+def warmup(interfaces_or_classes, **kwargs):
+    """
+    Fill the caches of this package for *interfaces_or_classes* before
+    forking worker processes.
+
+    See :func:`nti.schema.prefork.warmup`.
+
+    .. versionadded:: NEXT
+    """
+    # This module must stay cheap to import.
+    # pylint:disable-next=import-outside-toplevel
+    from nti.schema.prefork import warmup as _warmup
+    return _warmup(interfaces_or_classes, **kwargs)
+
+
+def profile():
+    """
+    Return a context manager that profiles the time spent in each
+    field while it is active.
+
+    See :func:`nti.schema.profiling.profile`.
+
+    .. versionadded:: NEXT
+    """
+    # pylint:disable-next=import-outside-toplevel
+    from nti.schema.profiling import profile as _profile
+    return _profile()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+The less commonly used fields of :mod:`nti.schema.field`.
+
+These are defined here so that importing :mod:`nti.schema.field`
+doesn't have to pay for them (or for what they import). That module
+imports this one when one of these names is first accessed, and they
+should always be imported from there.
+"""
+
+import collections.abc as abcs
+
+from zope import interface
+from zope import schema
+import zope.interface.common.idatetime
+
+from zope.schema import interfaces as sch_interfaces
+from zope.schema import Datetime
+
+from nti.schema.field import FieldValidationMixin
+from nti.schema.field import ListOrTuple
+from nti.schema.field import _FieldConverter
+from nti.schema.field import _MapFromObjectMixin
+from nti.schema.field import _SequenceFromObjectMixin
+from nti.schema.field import _ValueTypeAddingDocMixin
+from nti.schema.field import _do_set
+from nti.schema.field import _fixup_Object_field
+from nti.schema.field import __with_set as _with_set
+from nti.schema.interfaces import BeforeDictAssignedEvent
+from nti.schema.interfaces import BeforeObjectAssignedEvent
+from nti.schema.interfaces import BeforeSequenceAssignedEvent
+from nti.schema.interfaces import BeforeTextAssignedEvent
+from nti.schema.interfaces import IVariant
+from nti.schema.interfaces import VariantValidationError
+from nti.schema.instrumentation import get_recorder as _get_recorder
+
+__docformat__ = "restructuredtext en"
+
+#: Maintained by :mod:`nti.schema.instrumentation`.
+_recorder = _get_recorder()
+
+# pylint:disable=no-value-for-parameter
+# pylint:disable=arguments-renamed
+# pylint:disable=too-many-ancestors
+
+@interface.implementer(sch_interfaces.IObject)
+class ValidDatetime(FieldValidationMixin, Datetime):
+    """
+    Unlike the standard datetime, this will check that the
+    given object is an instance of IDatetime, and raise
+    the same error as object does.
+    """
+
+    schema = zope.interface.common.idatetime.IDateTime
+
+    def _validate(self, value):
+        try:
+            super()._validate(value)
+        except sch_interfaces.WrongType as e:
+            raise sch_interfaces.SchemaNotProvided(
+                value, e.__doc__,
+                self.__fixup_name__, self.schema,
+                list(interface.providedBy(value))).with_field_and_value(self, value) from e
+
+        # schema has to be provided by value
+        if not self.schema.providedBy(value):  # pragma: no cover
+            raise sch_interfaces.SchemaNotProvided().with_field_and_value(self, value)
+
+
+@interface.implementer(IVariant)
+class Variant(FieldValidationMixin, schema.Field):
+    """
+    Similar to :class:`zope.schema.Object`, but accepts one of many
+    non-overlapping interfaces.
+
+    .. versionchanged:: 1.9.0
+
+        Implementations of :class:`zope.schema.interfaces.ICollection`
+        (like :class:`zope.schema.List`) and
+        :class:`zope.schema.interfaces.IMapping` (like
+        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
+        when they are used as a field of this object *if* their *value_type* is an
+        :class:`zope.schema.interfaces.IObject` (recursively).
+
+    .. versionchanged:: 1.16.0
+       If one of the fields of the variant is (recursively) a ``IMapping``
+       such as a ``Dict``, both the key and value type must be specified. Previously,
+       if they were left ``None``, a validation-time :exc:`AttributeError`
+       would be raised. Now, constructing the variant will raise a ``RequiredMissing``.
+    """
+
+    fields = ()
+
+    def __init__(self, fields, variant_raise_when_schema_provided=False, **kwargs):
+        """
+        :param fields: A list or tuple of field instances.
+        :keyword variant_raise_when_schema_provided: If ``True``, then
+            if a value is provided to ``validate`` that implements
+            the schema of a particular field, and that field raised
+            a validation error, that error will be propagated instead
+            of the error raised by the last field, and no additional fields
+            will be asked to do validation.
+        """
+        if not fields or not all((sch_interfaces.IField.providedBy(x) for x in fields)):
+            raise sch_interfaces.SchemaNotProvided(sch_interfaces.IField)
+
+        # assign our children first so anything we copy to them as a result of the super
+        # constructor (__name__) gets set
+        self.fields = [_fixup_Object_field(field, early_error=True) for field in fields]
+        for f in self.fields:
+            f.__parent__ = self
+
+        self._raise_when_provided = variant_raise_when_schema_provided
+        super().__init__(**kwargs)
+
+    def __get_name(self):
+        return self.__dict__.get('__name__', '')
+
+    def __set_name(self, name):
+        self.__dict__['__name__'] = name
+        for field in self.fields:
+            field.__name__ = name
+    __name__ = property(__get_name, __set_name)
+
+    def getExtraDocLines(self):
+        lines = super().getExtraDocLines()
+        lines.append(".. rubric:: Possible Values")
+
+        for field in self.fields:
+            lines.append(".. rubric:: Option")
+            lines.append(field.getDoc())
+
+        return lines
+
+    def __repr__(self):
+        return "<%s.%s at 0x%x name=%r interface=%r context=%r fields=%r>" % (
+            type(self).__module__, type(self).__name__,
+            id(self), self.__name__,
+            self.interface, self.context, self.fields
+        )
+
+    def bind(self, context):
+        # The fields member really does exist
+        # pylint:disable=no-member
+        clone = super().bind(context)
+        clone.fields = [x.bind(context) for x in clone.fields]
+        for f in clone.fields:
+            f.__parent__ = clone
+        return clone
+
+    def _validate(self, value):
+        super()._validate(value)
+        errors = []
+        for field in self.fields:
+            try:
+                field.validate(value)
+                # one of them accepted, yay!
+                return
+            except sch_interfaces.ValidationError as e:
+                if (self._raise_when_provided
+                        and hasattr(field, 'schema')
+                        and field.schema.providedBy(value)):
+                    self._reraise_validation_error(e, value)
+                    raise AssertionError("This is never reached") from e
+
+                errors.append(e)
+        try:
+            raise VariantValidationError(self, value, errors)
+        finally:
+            # break cycles
+            e = errors = None
+
+    def fromObject(self, obj):
+        """
+        Similar to `fromUnicode`, attempts to turn the given object
+        into something acceptable and valid for this field. Raises a
+        `~.VariantValidationError` if this isn't possible. Adaptation
+        is attempted in the order in which fields were given to the
+        constructor. Some fields cannot be used to adapt.
+
+        .. versionchanged:: 1.8.0
+           Raise `~.VariantValidationError` instead of whatever
+           last error we got.
+        .. versionchanged:: 1.9.1
+           Respect ``self.missing_value`` and don't raise an exception
+           if it is passed to this method and we're not required.
+        """
+        if _recorder is not None:
+            return _recorder.call('from_object', self, self._fromObject, obj)
+        return self._fromObject(obj)
+
+    def _fromObject(self, obj):
+        if obj == self.missing_value:
+            if self.required:
+                raise sch_interfaces.RequiredMissing(self.__name__).with_field_and_value(self, obj)
+
+            # If we're not required, we still attempt all the adaptation steps
+            # just in case some field can convert us very nicely, but
+            # we won't raise the final exception
+
+        errors = []
+
+        for field in self.fields:
+            try:
+                converter = _FieldConverter(field)
+
+                # Try to convert and validate. This calls fromXXX
+                # if defined, and otherwise validates. The fromXXX methods
+                # are also supposed to validate, so validation should be done
+                # when this returns.
+                return converter(obj)
+            except (TypeError, sch_interfaces.ValidationError) as ex:
+                # Nope, no good
+                errors.append(ex)
+
+        # We get here if nothing worked.
+        if obj == self.missing_value:
+            # Well it's the missing value. By definition we're not required
+            # at this point (we would have raised already), so we can just return it.
+            assert not self.required
+            return self.missing_value
+
+        try:
+            raise VariantValidationError(self, obj, errors)
+        finally:
+            # break cycles
+            ex = errors = None
+
+    _EVENT_TYPES = (
+        (str, BeforeTextAssignedEvent),
+        (abcs.Mapping, BeforeDictAssignedEvent),
+        (abcs.Sequence, BeforeSequenceAssignedEvent),
+        (object, BeforeObjectAssignedEvent)
+    )
+
+    def set(self, context, value): # pylint:disable=arguments-differ
+        # Try to determine the most appropriate event to fire
+        # Order matters. It would kind of be nice to direct this to the appropriate
+        # field itself, but that's sort of hard.
+        for kind, factory in self._EVENT_TYPES:
+            if isinstance(value, kind):
+                _do_set(self, context, value, Variant, factory)
+                return
+
+
+class ValidURI(FieldValidationMixin, schema.URI):
+
+    def _fixup_validation_error_args(self, e, value):
+        if isinstance(e, sch_interfaces.InvalidURI):
+            # This class differs by using the value as the argument, not
+            # a message
+            e.__doc__ = e.__doc__.replace('URI', 'URL')
+            e.args = (value, e.__doc__, self.__fixup_name__)
+            e.message = e.i18n_message = e.__doc__
+        else: # pragma: no cover
+            super()._fixup_validation_error_args(e, value)
+
+class HTTPURL(ValidURI):
+    """
+    A URI field that ensures and requires its value to be an absolute
+    HTTP/S URL.
+    """
+
+    def fromUnicode(self, value):
+        # This can wind up producing something invalid if an
+        # absolute URI was already given for mailto: for whatever.
+        # None of the regexs (zopes or grubers) flag that as invalid.
+        # so we try to
+        orig_value = value
+        if value:
+            lower = value.lower()
+            if not lower.startswith('http://') and not lower.startswith('https://'):
+                # assume http
+                value = 'http://' + value
+        result = super().fromUnicode(value)
+        if result.count(':') != 1:
+            self._reraise_validation_error(
+                sch_interfaces.InvalidURI(orig_value).with_field_and_value(self, orig_value),
+                orig_value,
+                _raise=True)
+
+        return result
+
+
+class ListOrTupleFromObject(_SequenceFromObjectMixin, ListOrTuple):
+    """
+    The ``value_type`` MUST be a :class:`Variant`, or more generally,
+    something supporting :class:`IFromObject`, :class:`IFromUnicode`
+    or :class:`IFromBytes`.
+
+    .. versionchanged:: 1.9.0
+
+        Implementations of :class:`zope.schema.interfaces.ICollection`
+        (like :class:`zope.schema.List`) and
+        :class:`zope.schema.interfaces.IMapping` (like
+        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
+        when used as the *value_type* of this object *if* their *value_type* is an
+        :class:`zope.schema.interfaces.IObject` (recursively).
+    """
+
+
+class TupleFromObject(_ValueTypeAddingDocMixin,
+                      _SequenceFromObjectMixin,
+                      FieldValidationMixin,
+                      schema.Tuple):
+    """
+    The ``value_type`` MUST be a :class:`Variant`, or more generally,
+    something supporting :class:`IFromObject`, :class:`IFromUnicode`
+    or :class:`IFromBytes`.
+
+    When setting through this object, we will automatically convert
+    lists and only lists to tuples (for convenience coming in through
+    JSON).
+
+    .. versionchanged:: 1.9.0
+
+        Implementations of :class:`zope.schema.interfaces.ICollection`
+        (like :class:`zope.schema.List`) and
+        :class:`zope.schema.interfaces.IMapping` (like
+        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
+        when used as the *value_type* of this object *if* their *value_type* is an
+        :class:`zope.schema.interfaces.IObject` (recursively).
+    """
+    accept_types = (list, tuple)
+
+    def set(self, context, value): # pylint:disable=arguments-differ
+        if isinstance(value, list):
+            value = tuple(value)
+
+        _do_set(self, context, value, TupleFromObject, BeforeSequenceAssignedEvent)
+
+    def validate(self, value):
+        if isinstance(value, list):
+            value = tuple(value)
+        super().validate(value)
+
+
+@_with_set(BeforeDictAssignedEvent)
+class DictFromObject(_ValueTypeAddingDocMixin,
+                     _MapFromObjectMixin,
+                     FieldValidationMixin,
+                     schema.Mapping):
+    """
+    The `key_type` and `value_type` must be supporting
+    :class:`IFromObject` or :class:`.IFromUnicode` or :class:`IFromBytes`
+
+    .. versionchanged:: 1.4.0
+       Subclass :class:`zope.schema.Mapping` instead of :class:`zope.schema.Dict`,
+       allowing for any mapping (such as BTrees), not just dicts. However, the validated
+       value is still a dict.
+
+    .. versionchanged:: 1.9.0
+
+        Implementations of :class:`zope.schema.interfaces.ICollection`
+        (like :class:`zope.schema.List`) and
+        :class:`zope.schema.interfaces.IMapping` (like
+        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
+        when used as the *value_type* of this object *if* their *value_type* is an
+        :class:`zope.schema.interfaces.IObject` (recursively).
+    """
+
+#: The names :mod:`nti.schema.field` gets from this module.
+__all__ = [
+    'DictFromObject',
+    'HTTPURL',
+    'ListOrTupleFromObject',
+    'TupleFromObject',
+    'ValidDatetime',
+    'ValidURI',
+    'Variant',
+]
+
+# Pickles and documentation should use the public location.
+for _name in __all__:
+    globals()[_name].__module__ = 'nti.schema.field'
+del _name
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Caching values that depend on the current site.
+
+Named vocabularies are found using the vocabulary registry and the
+current site manager, so what's computed from them is cached for
+each. Local site managers are often persistent, loaded once for each
+database connection; the caches here refer to them weakly, so they
+don't keep them (or their connections) alive.
+"""
+
+from weakref import WeakKeyDictionary
+
+from zope.component import getSiteManager
+from zope.schema.vocabulary import getVocabularyRegistry
+
+__docformat__ = "restructuredtext en"
+
+
+class SiteCache(object):
+    """
+    A mapping from keys to values, kept separately for each
+    vocabulary registry and site manager.
+
+    The values must not refer to the site manager, or it
+    will never be discarded.
+    """
+
+    __slots__ = (
+        '_by_site',
+    )
+
+    def __init__(self):
+        self._by_site = WeakKeyDictionary()
+
+    def get(self, key, default=None):
+        """
+        Return the value for *key* in the current site, or *default*.
+        """
+        try:
+            values = self._by_site[getSiteManager()]
+        except (KeyError, TypeError):
+            return default
+        return values.get((getVocabularyRegistry(), key), default)
+
+    def set(self, key, value):
+        """
+        Keep *value* for *key* in the current site.
+
+        Nothing is kept if the site manager can't be weakly referenced.
+        """
+        site_manager = getSiteManager()
+        try:
+            values = self._by_site[site_manager]
+        except KeyError:
+            values = self._by_site[site_manager] = {}
+        except TypeError:
+            return
+        values[(getVocabularyRegistry(), key)] = value
+
+    def clear(self):
+        """
+        Discard the values of every site.
+        """
+        self._by_site.clear()
+
+    def __len__(self):
+        # The number of site managers with values.
+        return len(self._by_site)
@@ -5,28 +5,195 @@ Helpers for hashing and equality based on a list of names.
 
 """
 
+import datetime
+import decimal
 import operator
+from collections.abc import Mapping
+from hashlib import blake2b
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from nti.schema.precompile import compile_source
 
 __docformat__ = "restructuredtext en"
 
-def _superhash_force(value):
-    # Called when we know that we can't hash the value.
+class _HashedTuple(tuple):
+    """
+    A tuple that remembers its hash. Equal to, and hashing the same
+    as, the plain tuple of its contents.
+    """
+
+    _hash = None
+
+    def __hash__(self):
+        h = self._hash
+        if h is None:
+            h = self._hash = tuple.__hash__(self)
+        return h
+
+
+class SuperhashMemo(object):
+    """
+    An identity-keyed memo of the results of superhashing mutable values.
+
+    Entries are keyed by the ``id`` of the value and fingerprinted by its
+    length, so a memoized result is discarded when the value grows
+    or shrinks. Mutating a value in place without changing its length
+    (or mutating a value nested inside it) is *not* detected, so only
+    activate a memo (see :func:`superhash_memo`) for a scope, such as a
+    single request, in which the values being hashed are treated as
+    immutable. The memo keeps a reference to each value it has seen
+    until it is cleared or discarded.
+
+    .. versionadded:: NEXT
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, value):
+        entry = self._entries.get(id(value))
+        # Only values with a length are stored.
+        if entry is not None and entry[0] is value and entry[1] == len(value):
+            return entry[2]
+        return None
+
+    def store(self, value, results):
+        if isinstance(value, tuple):
+            # Tuples are immutable, and they're frequently
+            # temporary (e.g., the items of a dict), so there's no point
+            # remembering them by identity.
+            return tuple(results)
+        result = _HashedTuple(results)
+        try:
+            fingerprint = len(value)
+        except TypeError:
+            # We can't tell if this changes, so don't remember it.
+            return result
+        self._entries[id(value)] = (value, fingerprint, result)
+        return result
+
+#: The memo used by superhash in the current context, if any.
+_current_memo = ContextVar('nti.schema.eqhash.superhash_memo', default=None)
+
+@contextmanager
+def superhash_memo(memo=None):
+    """
+    A context manager that activates a :class:`SuperhashMemo` for the
+    hashing done by ``EqHash(..., superhash=True)`` classes within it.
+
+    Within the block, repeatedly hashing an object holding the same
+    (unchanged) large mutable value only superhashes that value once::
+
+        >>> @EqHash('blob', superhash=True)
+        ... class Thing(object):
+        ...     def __init__(self, blob):
+        ...         self.blob = blob
+        >>> thing = Thing({'key': [1, 2, 3]})
+        >>> with superhash_memo() as memo:
+        ...     hash(thing) == hash(thing)
+        ...     len(memo)
+        True
+        2
+
+    :param memo: If given, the :class:`SuperhashMemo` to use. Otherwise a
+        new one is created (and discarded at the end of the block).
+    :return: The active memo.
+
+    .. versionadded:: NEXT
+    """
+    if memo is None:
+        memo = SuperhashMemo()
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+
+def _superhash_items(value):
     # Dict?
     try:
         # Sort these, they have no order
-        items = sorted(value.items())
+        return iter(sorted(value.items()))
     except AttributeError:
         # mutable iterable, which we must not sort
-        items = value
-
-    return tuple(_superhash(item)
-                  for item
-                  in items)
+        return iter(value)
+
+def _superhash_next_unhashable(items, results, memo):
+    # Add the hashable (or memoized) items to *results*, until we find
+    # one we must descend into; return it, or None when there are no
+    # more items. (Unhashable items are never None.)
+    for item in items:
+        try:
+            hash(item)
+        except TypeError:
+            pass
+        else:
+            results.append(item)
+            continue
+
+        if memo is not None:
+            result = memo.get(item)
+            if result is not None:
+                results.append(result)
+                continue
+
+        return item
+    return None
+
+def _superhash_force(value, memo=None):
+    # Called when we know that we can't hash the value.
 
-def _superhash(value):
+    # This is the iterative equivalent of
+    # ``tuple(_superhash(item) for item in _superhash_items(value))``,
+    # so arbitrarily deeply nested values don't hit the recursion limit.
+    if memo is None:
+        memo = _current_memo.get()
+    if memo is not None:
+        result = memo.get(value)
+        if result is not None:
+            return result
+
+    # Each entry is (the remaining items, the results so far, the value)
+    stack = [(_superhash_items(value), [], value)]
+    # The ids of the values on the stack, so we can detect cycles.
+    active = {id(value)}
+    while stack:
+        items, results, container = stack[-1]
+        item = _superhash_next_unhashable(items, results, memo)
+        if item is not None:
+            if id(item) in active:
+                raise ValueError("Cannot superhash a recursive value")
+            # Descend into this item; we'll come back to the rest of
+            # the items of the container when it's done.
+            stack.append((_superhash_items(item), [], item))
+            active.add(id(item))
+        else:
+            # Finished with this container.
+            stack.pop()
+            active.discard(id(container))
+            result = memo.store(container, results) if memo is not None else tuple(results)
+            if not stack:
+                return result
+            stack[-1][1].append(result)
+
+    raise AssertionError("Not reached")
+
+def _superhash(value, memo=None):
     """
     Returns something that's hashable, either the value itself,
-    or a tuple that can in turn be hashed
+    or a tuple that can in turn be hashed.
+
+    .. versionchanged:: NEXT
+       No longer recursive, so deeply nested values can be used.
+       Add the *memo* argument. If not given, the memo activated
+       with :func:`superhash_memo` (if any) is used.
     """
     try:
         # We used to think that by returning the original value, if it was hashable,
@@ -39,12 +206,12 @@ def _superhash(value):
         hash(value)
         return value
     except TypeError:
-        return _superhash_force(value)
+        return _superhash_force(value, memo)
 
 def EqHash(*names,
            **kwargs):
     """
-    EqHash(*names, include_super=False, superhash=False, include_type=False)
+    EqHash(*names, include_super=False, superhash=False, include_type=False, ordering=False)
 
     A class decorator factory for the common pattern of writing
     ``__eq__``/``__ne__`` and ``__hash__`` methods that check the same
@@ -83,17 +250,45 @@ def EqHash(*names,
         a series of subclasses who differ in no attributes but should not
         compare equal to each other. Note that this can lead to violating
         the commutative property.
-
+    :keyword ordering: If set to ``True`` (*not* the default), then
+        ``__lt__``, ``__le__``, ``__gt__`` and ``__ge__`` are also
+        generated. They compare the values of the names in order, just
+        like tuples do. A ``sort_key`` class method is also added that
+        returns an :func:`operator.attrgetter` for the names; passing
+        that as the ``key`` to :func:`sorted` is faster than relying on
+        the comparison methods::
+
+          >>> @EqHash('last', 'first', ordering=True)
+          ... class Name(object):
+          ...   def __init__(self, first, last):
+          ...     self.first = first
+          ...     self.last = last
+          ...   def __repr__(self):
+          ...     return '<%s %s>' % (self.first, self.last)
+          >>> names = [Name('b', 'z'), Name('a', 'z'), Name('c', 'a')]
+          >>> sorted(names)
+          [<c a>, <a z>, <b z>]
+          >>> sorted(names, key=Name.sort_key()) == sorted(names)
+          True
+
+        This cannot be combined with *include_super*, and at least one
+        name is required.
+
+    .. versionchanged:: NEXT
+       Add the *ordering* keyword.
     """
 
     _include_super = kwargs.pop('include_super', False)
     superhash = kwargs.pop("superhash", False)
     _include_type = kwargs.pop('include_type', False)
+    ordering = kwargs.pop('ordering', False)
 
     if kwargs:
         raise TypeError("Unexpected keyword args", kwargs)
     if not names and not _include_super and not _include_type:
         raise TypeError("Asking to hash/eq nothing, but not including super or type")
+    if ordering and (_include_super or not names):
+        raise TypeError("Ordering requires names and cannot include super")
 
 
     def x(cls):
@@ -102,9 +297,43 @@ def EqHash(*names,
         cls.__eq__ = __eq__
         cls.__hash__ = __hash__
         cls.__ne__ = __ne__
+        # Remember what we did, for content_digest()
+        setattr(cls, _SPEC_ATTR, _EqHashSpec(tuple(str(n) for n in names),
+                                             _include_super, _include_type))
+        if ordering:
+            _add_ordering(cls, names, _include_type)
         return cls
     return x
 
+#: The name of the class attribute holding the :class:`_EqHashSpec`
+#: of a class decorated with :func:`EqHash`.
+_SPEC_ATTR = '__nti_schema_eqhash__'
+
+class _EqHashSpec(object):
+    __slots__ = ('names', 'include_super', 'include_type', 'digest_chunks', 'key_maker')
+
+    def __init__(self, names, include_super, include_type):
+        self.names = names
+        self.include_super = include_super
+        self.include_type = include_type
+        # The encoded type name and attribute names, computed
+        # the first time we need them.
+        self.digest_chunks = None
+        # The (token, getter) used by the bulk helpers, computed
+        # the first time we need it.
+        self.key_maker = None
+
+def _find_spec(cls):
+    """
+    Return ``(declaring_class, spec)`` for the nearest class in the MRO
+    of *cls* that was decorated with :func:`EqHash`, or ``(None, None)``.
+    """
+    for kind in cls.__mro__:
+        spec = kind.__dict__.get(_SPEC_ATTR)
+        if spec is not None:
+            return kind, spec
+    return None, None
+
 def _make_eq(cls, names, include_super, include_type): # pylint:disable=unused-argument
     # 1 and 0 are constants and faster to load than the globals True/False
     # (in python 2)
@@ -137,17 +366,185 @@ def _make_eq(cls, names, include_super, include_type): # pylint:disable=unused-a
 
     # Must use a custom dictionary under Py3
     lcls = dict(locals())
-    exec(eq_stmt, globals(), lcls) # pylint:disable=exec-used
+    exec(compile_source(eq_stmt), globals(), lcls) # pylint:disable=exec-used
 
     return lcls['__eq__']
 
+def _make_superhash_hasher(names):
+    # We assume that instances that use superhash will have
+    # roughly the same shape, and not all attributes will need to be
+    # super-hashed. When an attribute does need to be super-hashed, it will
+    # need to be super-hashed for all instances. Worst case scenario, this winds up
+    # always using the superhash for all attributes of all instances, but if we're lucky
+    # only a small number of the same attributes will need to be superhashed.
+
+    # When there is only a single name, the plain generated hash function
+    # hashes the bare value, not a one-element tuple. Do the same here so that
+    # equal objects of plain and superhash classes still hash equally.
+    single = len(names) == 1
+
+    class Transformers(list):
+        mutated = False
+
+    transformers = Transformers([None for _ in names])
+
+    def _transformed(values):
+        result = tuple(transformer(value) if transformer is not None else value
+                       for transformer, value
+                       in zip(transformers, values))
+        return result[0] if single else result
+
+    def _hash(values):
+        # Hopefully in most cases everything is actually hashable.
+        # This gets our overhead down to the lowest possible.
+        if not transformers.mutated:
+            try:
+                return hash(values[0] if single else values)
+            except TypeError:
+                pass
+
+        # Ok, we found something that can't actually be hashed. Darn.
+        # Replace every non-Hashable transformer with a call to superhash.
+        transformers.mutated = True
+        # Snap. Lets hope that we already checked on what needs to be superhashed
+        # and if so we'll try that.
+        try:
+            return hash(_transformed(values))
+        except TypeError:
+            # Snap. Something changed.
+            _update_superhash_transformers(transformers, values)
+
+        # Ok, good to go. Let's try it.
+        return hash(_transformed(values))
+
+    return _hash
+
+def _update_superhash_transformers(transformers, values):
+    for i, value in enumerate(values):
+        if transformers[i] is _superhash:
+            # We've reached our limit. Nothing else to do
+            # for this one.
+            continue
+
+        if transformers[i] is _superhash_force:
+            try:
+                _superhash_force(value)
+            except TypeError:
+                # OK, this field alternates between
+                # being hashable and nat being hashable. Deal with that.
+                transformers[i] = _superhash
+
+        try:
+            # We could check isinstance(value, collections.Hashable), but
+            # this is slightly more general, albeit probably slower.
+            hash(value)
+        except TypeError:
+            transformers[i] = _superhash_force
+
+def _make_hash(cls, names, include_super, include_type, superhash):
+    # Like _make_eq, we generate the source for a function specialized
+    # to exactly the options we were given. Previously this was a
+    # closure that checked ``include_super`` on every call, and that
+    # went through ``operator.attrgetter`` (and, for superhash, a
+    # generator expression) to produce the values.
+
+    # Our contract for include_super says that hashing
+    # may or may not be included. It shouldn't affect the results
+    # if we do not actually include it, unless there are no values
+    # being hashed from this object. However, for consistency,
+    # we always include it if asked
+    seed = hash(names)
+    if include_type:
+        seed += hash(cls)
+
+    # The constants are passed as default arguments, making them
+    # (fast) local variables.
+    hash_stmt = 'def __hash__(self, seed=seed'
+    if include_super:
+        # We assume the class hierarchy of these objects does not change
+        superclass_hash = cls.__mro__[1].__hash__ # pylint:disable=possibly-unused-variable
+        hash_stmt += ', superclass_hash=superclass_hash'
+    if superhash:
+        _hash = _make_superhash_hasher(names) # pylint:disable=unused-variable
+        hash_stmt += ', _hash=_hash'
+    hash_stmt += '):\n'
+
+    # If we or-equal for every attribute separately, we
+    # easily run the risk of saturating the integer. So we collect
+    # all attributes down to one tuple to hash. With exactly one
+    # name, we hash the bare value (this matches what the
+    # ``operator.attrgetter`` we used to use returned). With no
+    # names, we hash the empty tuple (likewise).
+    if superhash:
+        # The superhash function always takes a tuple so it can
+        # index the transformers.
+        values = '(' + ''.join('self.' + name + ', ' for name in names) + ')'
+        value_hash = '_hash(' + values + ')'
+    elif len(names) == 1:
+        value_hash = 'hash(self.' + names[0] + ')'
+    else:
+        value_hash = 'hash((' + ''.join('self.' + name + ', ' for name in names) + '))'
+
+    hash_stmt += '    h = seed ^ ' + value_hash + '\n'
+    if include_super:
+        hash_stmt += '    h ^= superclass_hash(self) << 2\n'
+    hash_stmt += '    return h'
+
+    # Must use a custom dictionary under Py3
+    lcls = dict(locals())
+    exec(compile_source(hash_stmt), globals(), lcls) # pylint:disable=exec-used
+
+    return lcls['__hash__']
+
+def _make_compare(cls, names, include_type, func_name, op): # pylint:disable=unused-argument
+    # Comparing tuples happens in C and does exactly what we want
+    # (lexicographic comparison, stopping at the first difference), so
+    # unlike __eq__ we don't take the names one at a time. A single
+    # name doesn't need a tuple at all.
+    if len(names) == 1:
+        mine = 'self.' + names[0]
+        theirs = 'other.' + names[0]
+    else:
+        mine = '(' + ''.join('self.' + name + ', ' for name in names) + ')'
+        theirs = '(' + ''.join('other.' + name + ', ' for name in names) + ')'
+
+    cmp_stmt = 'def ' + func_name + '(self, other'
+    if include_type:
+        cmp_stmt += ', cls=cls'
+    cmp_stmt += '):\n'
+    if include_type:
+        cmp_stmt += '    if not isinstance(other, cls): return NotImplemented\n'
+    cmp_stmt += '    try:\n        b = ' + theirs + '\n'
+    cmp_stmt += '    except AttributeError: return NotImplemented\n'
+    cmp_stmt += '    return ' + mine + ' ' + op + ' b'
+
+    # Must use a custom dictionary under Py3
+    lcls = dict(locals())
+    exec(compile_source(cmp_stmt), globals(), lcls) # pylint:disable=exec-used
+
+    return lcls[func_name]
+
+def _add_ordering(cls, names, include_type):
+    names = tuple((str(x) for x in names))
+    for func_name, op in (('__lt__', '<'),
+                          ('__le__', '<='),
+                          ('__gt__', '>'),
+                          ('__ge__', '>=')):
+        setattr(cls, func_name, _make_compare(cls, names, include_type, func_name, op))
+
+    getter = operator.attrgetter(*names)
+
+    def sort_key(cls): # pylint:disable=unused-argument
+        """
+        Return a callable suitable for the ``key`` argument of
+        :func:`sorted`, :meth:`list.sort` or :func:`bisect.bisect`
+        that produces the values compared by the ordering methods.
+        """
+        return getter
+    cls.sort_key = classmethod(sort_key)
+
 def _eq_hash(cls, names, include_super, include_type, superhash):
-    # pylint:disable=too-complex
     names = tuple((str(x) for x in names)) # make sure they're native strings, not unicode on Py2
-    # We assume the class hierarchy of these objects does not change
-    if include_super:
-        superclass = cls.__mro__[1]
-        superclass_hash = superclass.__hash__
 
     __eq__ = _make_eq(cls, names, include_super, include_type)
 
@@ -157,101 +554,383 @@ def _eq_hash(cls, names, include_super, include_type, superhash):
             return eq
         return not eq
 
-    # Our contract for include_super says that hashing
-    # may or may not be included. It shouldn't affect the results
-    # if we do not actually include it, unless there are no values
-    # being hashed from this object. However, for consistency,
-    # we always include it if asked
-    seed = hash(names)
-    if include_type:
-        seed += hash(cls)
+    __hash__ = _make_hash(cls, names, include_super, include_type, superhash)
 
-    if superhash:
-        # We assume that instances that use superhash will have
-        # roughly the same shape, and not all attributes will need to be
-        # super-hashed. When an attribute does need to be super-hashed, it will
-        # need to be super-hashed for all instances. Worst case scenario, this winds up
-        # always using the superhash for all attributes of all instances, but if we're lucky
-        # only a small number of the same attributes will need to be superhashed.
-
-        class Transformers(list):
-            mutated = False
-
-        transformers = Transformers([None for _ in names])
-
-        def _hash(values):
-            # Hopefully in most cases everything is actually hashable.
-            # This gets our overhead down to the lowest possible.
-            if not transformers.mutated:
-                try:
-                    return hash(values)
-                except TypeError:
-                    pass
-
-            # Ok, we found something that can't actually be hashed. Darn.
-            # Replace every non-Hashable transformer with a call to superhash.
-            transformers.mutated = True
-            # Snap. Lets hope that we already checked on what needs to be superhashed
-            # and if so we'll try that.
-            try:
-                return hash(tuple(transformer(value) if transformer is not None else value
-                                   for transformer, value
-                                   in zip(transformers, values)))
-            except TypeError:
-                # Snap. Something changed.
-                for i, value in enumerate(values):
-                    if transformers[i] is _superhash:
-                        # We've reached our limit. Nothing else to do
-                        # for this one.
-                        continue
-
-                    if transformers[i] is _superhash_force:
-                        try:
-                            _superhash_force(value)
-                        except TypeError:
-                            # OK, this field alternates between
-                            # being hashable and nat being hashable. Deal with that.
-                            transformers[i] = _superhash
-
-                    try:
-                        # We could check isinstance(value, collections.Hashable), but
-                        # this is slightly more general, albeit probably slower.
-                        hash(value)
-                    except TypeError:
-                        transformers[i] = _superhash_force
-
-            # Ok, good to go. Let's try it.
-            return hash(tuple(transformer(value) if transformer is not None else value
-                               for transformer, value
-                               in zip(transformers, values)))
+    return __eq__, __hash__, __ne__
+
+
+# Digests. We produce a canonical, prefix-free byte encoding of the
+# values and feed it to blake2b.
+
+class _Raw(bytes):
+    # A chunk of already-encoded output on the encoding stack.
+    __slots__ = ()
+
+class _Done(int):
+    # Marks the end of a container on the encoding stack; the value
+    # is the container's id.
+    __slots__ = ()
+
+def _encode_int(value, out):
+    out += b'i%d;' % value
+
+def _encode_float(value, out):
+    if value.is_integer():
+        # Equal numbers must produce equal digests: 1.0 == 1
+        out += b'i%d;' % value
+    else:
+        out += b'f' + value.hex().encode('ascii') + b';'
+
+def _encode_str(value, out):
+    data = value.encode('utf-8', 'surrogatepass')
+    out += b's%d:' % len(data)
+    out += data
+
+def _encode_bytes(value, out):
+    out += b'b%d:' % len(value)
+    out += value
+
+def _encode_none(_value, out):
+    out += b'N'
+
+def _encode_text(tag, text, out):
+    # Things like dates and decimals, encoded as canonical ASCII text.
+    data = text.encode('ascii')
+    out += b'v%s%d:' % (tag, len(data))
+    out += data
+
+def _encode_decimal(value, out):
+    # Decimals compare equal to the ints and floats with the same
+    # value, and to each other regardless of trailing zeros:
+    # Decimal('1.0') == Decimal('1') == 1, Decimal('1.5') == 1.5
+    if not value.is_finite():
+        if value.is_infinite():
+            _encode_float(float(value), out)
+        else:
+            _encode_text(b'Decimal', str(value), out)
+    elif value == value.to_integral_value():
+        _encode_int(int(value), out)
+    elif decimal.Decimal(float(value)) == value:
+        _encode_float(float(value), out)
+    else:
+        sign, digits, exponent = value.as_tuple()
+        digits = ''.join([str(digit) for digit in digits])
+        significant = digits.rstrip('0')
+        exponent += len(digits) - len(significant)
+        _encode_text(b'Decimal', '%s%sE%d' % ('-' if sign else '', significant, exponent), out)
+
+def _encode_datetime(value, out):
+    # Aware datetimes in different zones compare equal if they are
+    # the same instant.
+    if value.utcoffset() is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    _encode_text(b'datetime', str(value), out)
+
+def _encode_date(value, out):
+    _encode_text(b'date', str(value), out)
+
+def _encode_time(value, out):
+    offset = value.utcoffset()
+    if offset is None:
+        _encode_text(b'time', str(value), out)
     else:
-        # No need to try to wrap in a tuple or anything, we can
-        # just directly call the hash builtin. We'll get passed either
-        # a tuple of values.
-        _hash = hash
-
-    # Unlike __eq__, we use operator.attrgetter because we're always
-    # going to request all the names. In tests, this is ~30% faster than
-    # a manual loop (for two to three names).
+        # Aware times compare by their time of day minus their offset,
+        # without wrapping around midnight.
+        micros = ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000
+        micros += value.microsecond - offset // datetime.timedelta(microseconds=1)
+        _encode_text(b'utctime', str(micros), out)
+
+def _encode_timedelta(value, out):
+    _encode_text(b'timedelta', str(value), out)
+
+_SIMPLE_ENCODERS = {
+    type(None): _encode_none,
+    # True == 1, so bools are encoded as ints.
+    bool: _encode_int,
+    int: _encode_int,
+    float: _encode_float,
+    str: _encode_str,
+    bytes: _encode_bytes,
+    bytearray: _encode_bytes,
+    datetime.datetime: _encode_datetime,
+    datetime.date: _encode_date,
+    datetime.time: _encode_time,
+    datetime.timedelta: _encode_timedelta,
+    decimal.Decimal: _encode_decimal,
+}
+
+def _encode_one(value):
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+def _encode(value, out):
+    # Iterative, for the same reasons as _superhash_force.
+    stack = [value]
+    active = set()
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is _Raw:
+            out += value
+            continue
+        if kind is _Done:
+            active.discard(value)
+            continue
+
+        encoder = _SIMPLE_ENCODERS.get(kind)
+        if encoder is not None:
+            encoder(value, out)
+            continue
+
+        if id(value) in active:
+            raise ValueError("Cannot digest a recursive value")
+
+        children = _encode_container(kind, value, out)
+        if children is not None:
+            active.add(id(value))
+            stack.append(_Done(id(value)))
+            stack.extend(reversed(children))
+
+def _encode_container(kind, value, out):
+    # Write the header of *value*, and return the values that must be
+    # encoded after it, or None if it has been completely written.
+    spec_kind, spec = _find_spec(kind)
+    if spec is not None:
+        children = _eqhash_children(value, spec_kind, spec)
+        out += b'o%d:' % len(children)
+        return children
+
+    if isinstance(value, Mapping):
+        # Order by the encoded keys, which are always sortable.
+        children = []
+        for key_bytes, item in sorted(((_encode_one(k), v) for k, v in value.items()),
+                                      key=_first):
+            children.append(_Raw(key_bytes))
+            children.append(item)
+        out += b'd%d:' % len(value)
+        return children
+
+    if isinstance(value, (set, frozenset)):
+        out += b'S%d:' % len(value)
+        out += b''.join(sorted(_encode_one(v) for v in value))
+        return None
+
+    if isinstance(value, (list, tuple)):
+        out += b'%s%d:' % (b'l' if isinstance(value, list) else b't', len(value))
+        return value
+
+    for base, encoder in _SIMPLE_ENCODERS.items():
+        if isinstance(value, base) and base is not bool:
+            encoder(value, out)
+            return None
+    raise TypeError("Cannot digest value of type %s" % kind.__name__)
+
+def _eqhash_children(value, spec_kind, spec):
+    children = []
+    while spec is not None:
+        chunks = spec.digest_chunks
+        if chunks is None:
+            chunks = spec.digest_chunks = _digest_chunks(spec_kind, spec)
+        type_chunk, name_chunks = chunks
+        if type_chunk is not None:
+            children.append(type_chunk)
+        for name, name_chunk in zip(spec.names, name_chunks):
+            children.append(name_chunk)
+            children.append(getattr(value, name))
+        if not spec.include_super:
+            break
+        spec_kind, spec = _find_spec(spec_kind.__mro__[1])
+    return children
+
+def _digest_chunks(kind, spec):
+    type_chunk = None
+    if spec.include_type:
+        type_chunk = _Raw(b'y' + _encode_one(kind.__module__ + '.' + kind.__qualname__))
+    return type_chunk, tuple(_Raw(b'a' + _encode_one(name)) for name in spec.names)
+
+def _first(pair):
+    return pair[0]
+
+def content_digest(obj, digest_size=16):
+    """
+    Return a deterministic digest (as bytes) of the values compared by
+    ``__eq__`` for an object of a class decorated with :func:`EqHash`.
+
+    Unlike :func:`hash`, this is the same in every process (and on
+    every machine and Python version), so it can be used for
+    things like sharding work or cache keys that are shared across
+    processes. Objects that compare equal have the same digest (but
+    not, in general, the other way around). Numbers are digested by
+    value, so ``1``, ``1.0``, ``Decimal('1.00')`` and ``True`` are the
+    same, and aware datetimes and times are digested as the instant
+    (in UTC) they represent::
+
+        >>> @EqHash('a', 'b', superhash=True)
+        ... class Thing(object):
+        ...    def __init__(self, a, b):
+        ...        self.a = a
+        ...        self.b = b
+        >>> content_digest(Thing(1, {'c': [1, 2]})).hex()
+        '41b46e9b95ef330dc1e15e2e8e21f442'
+        >>> content_digest(Thing(1, {'c': [1, 2]})) == content_digest(Thing(1.0, {'c': [1, 2]}))
+        True
+        >>> content_digest(Thing(1, {'c': [1, 2]})) == content_digest(Thing(1, {'c': [2, 1]}))
+        False
+
+    The values of the names may be (arbitrarily nested) ``None``,
+    numbers, strings, bytes, lists, tuples, sets, mappings, dates,
+    times, decimals, and other objects using :func:`EqHash`.
+    Mappings and sets are digested independent of their order. Any other
+    value raises :exc:`TypeError`.
+
+    The names of the attributes and, if ``include_type`` was used, the
+    qualified name of the class are included. If ``include_super`` was
+    used, the names of the superclass are included as well.
+
+    :param int digest_size: The size of the digest in bytes, between 1
+        and 64.
+
+    .. versionadded:: NEXT
+    """
+    if _find_spec(type(obj))[1] is None:
+        raise TypeError("Not an EqHash object", obj)
+    out = bytearray()
+    _encode(obj, out)
+    return blake2b(out, digest_size=digest_size, person=b'nti.schema').digest()
+
+
+# Bulk operations. Rather than calling the generated (Python)
+# ``__hash__`` and ``__eq__`` methods for each object, we use a C
+# ``operator.attrgetter`` to make a key for each object and let the
+# builtin dict do the rest.
+
+def _identity(obj):
+    return obj
+
+#: The token used for objects that don't use EqHash; they are their own
+#: keys.
+_OBJECT_TOKEN = ('<object>',)
+
+def _make_key_maker(kind, spec):
+    names = []
+    token = []
+    while spec is not None:
+        if spec.include_type:
+            token.append(kind)
+        names.extend(spec.names)
+        if not spec.include_super:
+            break
+        kind, spec = _find_spec(kind.__mro__[1])
+    else:
+        # We included a superclass that doesn't use EqHash. We can't
+        # know what its ``__eq__`` does, so we have to let it decide.
+        return _OBJECT_TOKEN, _identity
+
+    token.append(tuple(names))
     if not names:
-        # Well, ok, nothing special in this class. We can't pass that to attrgetter,
-        # though, it needs at least one name. Make sure to return a tuple for
-        # consistency.
-        def attrgetter(_):
-            return ()
+        return tuple(token), lambda _: ()
+    return tuple(token), operator.attrgetter(*names)
+
+def _key_maker(kind):
+    spec_kind, spec = _find_spec(kind)
+    if spec is None:
+        return _OBJECT_TOKEN, _identity
+    maker = spec.key_maker
+    if maker is None:
+        maker = spec.key_maker = _make_key_maker(spec_kind, spec)
+    return maker
+
+def _keys(objs):
+    kinds = {type(obj) for obj in objs}
+    if len(kinds) == 1:
+        # The common case. All objects have the same token, so
+        # we can just use the values.
+        getter = _key_maker(kinds.pop())[1]
+        keys = [getter(obj) for obj in objs]
     else:
-        # This will return a tuple of the values of the names.
-        attrgetter = operator.attrgetter(*names)
+        makers = {kind: _key_maker(kind) for kind in kinds}
+        keys = []
+        for obj in objs:
+            token, getter = makers[type(obj)]
+            keys.append((token, getter(obj)))
+    return keys
 
-    def __hash__(self):
-        h = seed
-        if include_super:
-            h ^= superclass_hash(self) << 2
-
-        # If we or-equal for every attribute separately, we
-        # easily run the risk of saturating the integer. So we callect
-        # all attributes down to one tuple to hash
-        h ^= _hash(attrgetter(self))
-        return h
+def _superhash_keys(keys):
+    return [_superhash(key) for key in keys]
 
-    return __eq__, __hash__, __ne__
+def unique(objs):
+    """
+    Return a list of the distinct objects in the iterable *objs*,
+    keeping the first of each set of equal objects, in order.
+
+    This is equivalent to, but much faster than, keeping
+    the objects not already found in a set. For classes using :func:`EqHash`,
+    the generated ``__hash__`` and ``__eq__`` methods are not called;
+    instead, the values of the names are compared directly::
+
+        >>> @EqHash('a')
+        ... class Thing(object):
+        ...     def __init__(self, a):
+        ...         self.a = a
+        ...     def __repr__(self):
+        ...         return 'Thing(%r)' % (self.a,)
+        >>> unique([Thing(1), Thing(2), Thing(1), Thing(3), Thing(2)])
+        [Thing(1), Thing(2), Thing(3)]
+
+    Objects of classes using different names are never equal, and
+    objects of classes using ``include_type`` are only equal to objects
+    of exactly the same class. Values that are superhashed are compared
+    by their superhash, so (for example) a list is equal to a tuple with
+    the same contents. Objects of other classes use their own
+    ``__hash__`` and ``__eq__`` methods.
+
+    .. versionadded:: NEXT
+    """
+    objs = list(objs)
+    keys = _keys(objs)
+    # Map each key to the index where it is first found (we go in
+    # reverse, so the last assignment wins). Sorting those indexes is
+    # cheaper than a second pass over all the keys.
+    first_indexes = range(len(objs) - 1, -1, -1)
+    try:
+        firsts = dict(zip(reversed(keys), first_indexes))
+    except TypeError:
+        keys = _superhash_keys(keys)
+        firsts = dict(zip(reversed(keys), first_indexes))
+    return [objs[i] for i in sorted(firsts.values())]
+
+def group_by_identity(objs):
+    """
+    Return a list of lists, grouping together the objects in the
+    iterable *objs* that are equal to each other. The groups, and the
+    objects in each group, are in the order first seen.
+
+    Objects are compared the same way as for :func:`unique`::
+
+        >>> @EqHash('a')
+        ... class Thing(object):
+        ...     def __init__(self, a, b=None):
+        ...         self.a = a
+        ...         self.b = b
+        ...     def __repr__(self):
+        ...         return 'Thing(%r, %r)' % (self.a, self.b)
+        >>> group_by_identity([Thing(1, 'x'), Thing(2), Thing(1, 'y')])
+        [[Thing(1, 'x'), Thing(1, 'y')], [Thing(2, None)]]
+
+    .. versionadded:: NEXT
+    """
+    objs = list(objs)
+    keys = _keys(objs)
+    try:
+        groups = dict.fromkeys(keys)
+    except TypeError:
+        keys = _superhash_keys(keys)
+        groups = dict.fromkeys(keys)
+
+    for key, obj in zip(keys, objs):
+        group = groups[key]
+        if group is None:
+            group = groups[key] = []
+        group.append(obj)
+    return list(groups.values())
@@ -7,22 +7,26 @@ These fields produce better validation errors than the standard
 :mod:`zope.schema` fields do. All the standard fields are also aliased
 to be imported from this module.
 
+.. versionchanged:: NEXT
+   The less commonly used fields (:class:`HTTPURL`, :class:`ValidURI`,
+   :class:`Variant`, :class:`ValidDatetime` and the ``FromObject`` fields)
+   are defined when first accessed, making this module faster to import.
+
 .. TODO: This module is big enough it should be factored into a package and sub-modules.
 """
 
 # stdlib imports
+# ``abcs`` is no longer used here, but remains importable.
+import collections.abc as abcs # pylint:disable=unused-import
 import numbers
 import re
-
-import collections.abc as abcs
-
+import warnings
+from typing import TYPE_CHECKING
 
 from zope import interface
 from zope import schema
-from zope.deferredimport import deprecatedFrom
 
 from zope.event import notify
-import zope.interface.common.idatetime
 from zope.cachedescriptors.property import Lazy
 
 from zope.schema import interfaces as sch_interfaces
@@ -56,8 +60,6 @@ from zope.schema import Rational
 from zope.schema import Integral
 
 from nti.schema import MessageFactory as _
-from nti.schema.interfaces import BeforeDictAssignedEvent
-from nti.schema.interfaces import BeforeObjectAssignedEvent
 from nti.schema.interfaces import BeforeSchemaFieldAssignedEvent
 from nti.schema.interfaces import BeforeSequenceAssignedEvent
 from nti.schema.interfaces import BeforeSetAssignedEvent
@@ -65,8 +67,7 @@ from nti.schema.interfaces import BeforeTextAssignedEvent
 from nti.schema.interfaces import BeforeTextLineAssignedEvent
 from nti.schema.interfaces import IFromObject
 from nti.schema.interfaces import IListOrTuple
-from nti.schema.interfaces import IVariant
-from nti.schema.interfaces import VariantValidationError
+from nti.schema.instrumentation import get_recorder as _get_recorder
 
 
 __docformat__ = "restructuredtext en"
@@ -127,11 +128,52 @@ __all__ = [
 # BWC alias, not in __all__
 DateTime = Datetime
 
-deprecatedFrom(
-    "Moved to nti.schema.schema",
-    "nti.schema.schema",
-    'SchemaConfigured',
-)
+#: The names in ``__all__`` that are defined in
+#: :mod:`nti.schema._lazyfields`, which isn't imported until one of
+#: them is used.
+_LAZY_NAMES = frozenset((
+    'DictFromObject',
+    'HTTPURL',
+    'ListOrTupleFromObject',
+    'TupleFromObject',
+    'ValidDatetime',
+    'ValidURI',
+    'Variant',
+))
+
+if TYPE_CHECKING: # pragma: no cover
+    # For static analysis. At runtime, these are found by __getattr__.
+    from nti.schema._lazyfields import DictFromObject
+    from nti.schema._lazyfields import HTTPURL
+    from nti.schema._lazyfields import ListOrTupleFromObject
+    from nti.schema._lazyfields import TupleFromObject
+    from nti.schema._lazyfields import ValidDatetime
+    from nti.schema._lazyfields import ValidURI
+    from nti.schema._lazyfields import Variant
+
+def __getattr__(name):
+    if name in _LAZY_NAMES:
+        # pylint:disable-next=import-outside-toplevel
+        from nti.schema import _lazyfields
+        module_globals = globals()
+        for lazy_name in _LAZY_NAMES:
+            module_globals[lazy_name] = getattr(_lazyfields, lazy_name)
+        return module_globals[name]
+    if name == 'SchemaConfigured':
+        warnings.warn(
+            "SchemaConfigured is deprecated. Moved to nti.schema.schema",
+            DeprecationWarning, stacklevel=2)
+        # pylint:disable-next=import-outside-toplevel
+        from nti.schema.schema import SchemaConfigured
+        return SchemaConfigured
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_NAMES)
+
+#: The :class:`nti.schema.instrumentation.Recorder` in use, if any.
+#: Maintained by :mod:`nti.schema.instrumentation`.
+_recorder = _get_recorder()
 
 # Stupid pylint doesn't understand how Interfaces work
 # pylint:disable=no-value-for-parameter
@@ -143,6 +185,11 @@ deprecatedFrom(
 # pylint:disable=too-many-ancestors
 
 def _do_set(self, context, value, cls, factory):
+    if _recorder is not None:
+        return _recorder.call('set', self, _notify_and_set, self, context, value, cls, factory)
+    return _notify_and_set(self, context, value, cls, factory)
+
+def _notify_and_set(self, context, value, cls, factory):
     try:
         event = factory(value, self.__name__, context)
         notify(event)
@@ -286,7 +333,11 @@ class FieldValidationMixin(object):
 
     def _validate(self, value):
         try:
-            super()._validate(value)
+            recorder = _recorder
+            if recorder is None:
+                super()._validate(value)
+            else:
+                recorder.call('validate', self, super()._validate, value)
         except sch_interfaces.WrongType as e:
             assert e.expected_type is not None, "The expected_type should be provided"
             raise
@@ -308,29 +359,6 @@ class FieldValidationMixin(object):
             self._reraise_validation_error(e, value)
 
 
-@interface.implementer(sch_interfaces.IObject)
-class ValidDatetime(FieldValidationMixin, Datetime):
-    """
-    Unlike the standard datetime, this will check that the
-    given object is an instance of IDatetime, and raise
-    the same error as object does.
-    """
-
-    schema = zope.interface.common.idatetime.IDateTime
-
-    def _validate(self, value):
-        try:
-            super()._validate(value)
-        except sch_interfaces.WrongType as e:
-            raise sch_interfaces.SchemaNotProvided(
-                value, e.__doc__,
-                self.__fixup_name__, self.schema,
-                list(interface.providedBy(value))).with_field_and_value(self, value) from e
-
-        # schema has to be provided by value
-        if not self.schema.providedBy(value):  # pragma: no cover
-            raise sch_interfaces.SchemaNotProvided().with_field_and_value(self, value)
-
 def _iteritems(o):
     meth = getattr(o, 'iteritems', None) or getattr(o, 'items')
     return meth()
@@ -370,6 +398,11 @@ class FieldConverter:
         return getattr(self.field, 'fromBytes', None)
 
     def __call__(self, value):
+        if _recorder is not None:
+            return _recorder.call('convert', self.field, self._convert, value)
+        return self._convert(value)
+
+    def _convert(self, value):
         # pylint:disable=too-many-function-args
 
         # Take make it easier on implementers of fromObject,
@@ -409,176 +442,6 @@ class FieldConverter:
 
 _FieldConverter = FieldConverter # BWC alias
 
-@interface.implementer(IVariant)
-class Variant(FieldValidationMixin, schema.Field):
-    """
-    Similar to :class:`zope.schema.Object`, but accepts one of many
-    non-overlapping interfaces.
-
-    .. versionchanged:: 1.9.0
-
-        Implementations of :class:`zope.schema.interfaces.ICollection`
-        (like :class:`zope.schema.List`) and
-        :class:`zope.schema.interfaces.IMapping` (like
-        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
-        when they are used as a field of this object *if* their *value_type* is an
-        :class:`zope.schema.interfaces.IObject` (recursively).
-
-    .. versionchanged:: 1.16.0
-       If one of the fields of the variant is (recursively) a ``IMapping``
-       such as a ``Dict``, both the key and value type must be specified. Previously,
-       if they were left ``None``, a validation-time :exc:`AttributeError`
-       would be raised. Now, constructing the variant will raise a ``RequiredMissing``.
-    """
-
-    fields = ()
-
-    def __init__(self, fields, variant_raise_when_schema_provided=False, **kwargs):
-        """
-        :param fields: A list or tuple of field instances.
-        :keyword variant_raise_when_schema_provided: If ``True``, then
-            if a value is provided to ``validate`` that implements
-            the schema of a particular field, and that field raised
-            a validation error, that error will be propagated instead
-            of the error raised by the last field, and no additional fields
-            will be asked to do validation.
-        """
-        if not fields or not all((sch_interfaces.IField.providedBy(x) for x in fields)):
-            raise sch_interfaces.SchemaNotProvided(sch_interfaces.IField)
-
-        # assign our children first so anything we copy to them as a result of the super
-        # constructor (__name__) gets set
-        self.fields = [_fixup_Object_field(field, early_error=True) for field in fields]
-        for f in self.fields:
-            f.__parent__ = self
-
-        self._raise_when_provided = variant_raise_when_schema_provided
-        super().__init__(**kwargs)
-
-    def __get_name(self):
-        return self.__dict__.get('__name__', '')
-
-    def __set_name(self, name):
-        self.__dict__['__name__'] = name
-        for field in self.fields:
-            field.__name__ = name
-    __name__ = property(__get_name, __set_name)
-
-    def getExtraDocLines(self):
-        lines = super().getExtraDocLines()
-        lines.append(".. rubric:: Possible Values")
-
-        for field in self.fields:
-            lines.append(".. rubric:: Option")
-            lines.append(field.getDoc())
-
-        return lines
-
-    def __repr__(self):
-        return "<%s.%s at 0x%x name=%r interface=%r context=%r fields=%r>" % (
-            type(self).__module__, type(self).__name__,
-            id(self), self.__name__,
-            self.interface, self.context, self.fields
-        )
-
-    def bind(self, context):
-        # The fields member really does exist
-        # pylint:disable=no-member
-        clone = super().bind(context)
-        clone.fields = [x.bind(context) for x in clone.fields]
-        for f in clone.fields:
-            f.__parent__ = clone
-        return clone
-
-    def _validate(self, value):
-        super()._validate(value)
-        errors = []
-        for field in self.fields:
-            try:
-                field.validate(value)
-                # one of them accepted, yay!
-                return
-            except sch_interfaces.ValidationError as e:
-                if (self._raise_when_provided
-                        and hasattr(field, 'schema')
-                        and field.schema.providedBy(value)):
-                    self._reraise_validation_error(e, value)
-                    raise AssertionError("This is never reached") from e
-
-                errors.append(e)
-        try:
-            raise VariantValidationError(self, value, errors)
-        finally:
-            # break cycles
-            e = errors = None
-
-    def fromObject(self, obj):
-        """
-        Similar to `fromUnicode`, attempts to turn the given object
-        into something acceptable and valid for this field. Raises a
-        `~.VariantValidationError` if this isn't possible. Adaptation
-        is attempted in the order in which fields were given to the
-        constructor. Some fields cannot be used to adapt.
-
-        .. versionchanged:: 1.8.0
-           Raise `~.VariantValidationError` instead of whatever
-           last error we got.
-        .. versionchanged:: 1.9.1
-           Respect ``self.missing_value`` and don't raise an exception
-           if it is passed to this method and we're not required.
-        """
-        if obj == self.missing_value:
-            if self.required:
-                raise sch_interfaces.RequiredMissing(self.__name__).with_field_and_value(self, obj)
-
-            # If we're not required, we still attempt all the adaptation steps
-            # just in case some field can convert us very nicely, but
-            # we won't raise the final exception
-
-        errors = []
-
-        for field in self.fields:
-            try:
-                converter = _FieldConverter(field)
-
-                # Try to convert and validate. This calls fromXXX
-                # if defined, and otherwise validates. The fromXXX methods
-                # are also supposed to validate, so validation should be done
-                # when this returns.
-                return converter(obj)
-            except (TypeError, sch_interfaces.ValidationError) as ex:
-                # Nope, no good
-                errors.append(ex)
-
-        # We get here if nothing worked.
-        if obj == self.missing_value:
-            # Well it's the missing value. By definition we're not required
-            # at this point (we would have raised already), so we can just return it.
-            assert not self.required
-            return self.missing_value
-
-        try:
-            raise VariantValidationError(self, obj, errors)
-        finally:
-            # break cycles
-            ex = errors = None
-
-    _EVENT_TYPES = (
-        (str, BeforeTextAssignedEvent),
-        (abcs.Mapping, BeforeDictAssignedEvent),
-        (abcs.Sequence, BeforeSequenceAssignedEvent),
-        (object, BeforeObjectAssignedEvent)
-    )
-
-    def set(self, context, value): # pylint:disable=arguments-differ
-        # Try to determine the most appropriate event to fire
-        # Order matters. It would kind of be nice to direct this to the appropriate
-        # field itself, but that's sort of hard.
-        for kind, factory in self._EVENT_TYPES:
-            if isinstance(value, kind):
-                _do_set(self, context, value, Variant, factory)
-                return
-
 class ObjectLen(FieldValidationMixin, schema.MinMaxLen, _ObjectBase):  # order matters
     """
     Allows specifying a length for arbitrary object fields (though the
@@ -619,9 +482,69 @@ class Number(FieldValidationMixin, schema.Float):
     """
     _type = numbers.Number
 
+def _named_vocabulary_snapshot(name):
+    # nti.schema.vocabulary is comparatively expensive to import, so
+    # do it on first use, and then replace ourself with the real function.
+    global _named_vocabulary_snapshot # pylint:disable=global-statement
+    # pylint:disable-next=import-outside-toplevel
+    from nti.schema.vocabulary import _named_vocabulary_snapshot as func
+    _named_vocabulary_snapshot = func
+    return func(name)
+
 @__with_set()
 class ValidChoice(FieldValidationMixin, schema.Choice):
-    pass
+    """
+    A choice that produces slightly better error messages.
+
+    :keyword bool snapshot: If true (*not* the default), and this
+        field uses a vocabulary by name, the vocabulary is found once
+        for each site (without a context) and this field, and the
+        copies made by :meth:`bind`, validate values against a snapshot of
+        its membership (see :func:`nti.schema.vocabulary.named_membership_snapshot`)
+        instead of finding the vocabulary in the registry for each
+        validation or binding. This is only appropriate for
+        vocabularies whose contents change only when the registry
+        does.
+
+    .. versionchanged:: NEXT
+       Add the *snapshot* keyword.
+    """
+
+    snapshot = False
+
+    #: The membership snapshot of the vocabulary of a bound copy.
+    _membership = None
+
+    def __init__(self, *args, **kwargs):
+        self.snapshot = kwargs.pop('snapshot', False)
+        super().__init__(*args, **kwargs)
+
+    def _vocabulary_snapshot(self):
+        """
+        Return the ``(vocabulary, membership)`` pair to use instead of
+        finding the vocabulary, or None.
+        """
+        if self._membership is not None:
+            return self.vocabulary, self._membership
+        if self.snapshot and self.vocabulary is None and self.vocabularyName:
+            return _named_vocabulary_snapshot(self.vocabularyName)
+        return None
+
+    def _resolve_vocabulary(self, value):
+        snapshot = self._vocabulary_snapshot()
+        if snapshot is not None:
+            return snapshot[1]
+        return super()._resolve_vocabulary(value)
+
+    def bind(self, context):
+        snapshot = self._vocabulary_snapshot()
+        if snapshot is None:
+            return super().bind(context)
+        # Like Choice.bind, but the vocabulary has already been found.
+        # pylint:disable-next=bad-super-call
+        clone = super(schema.Choice, self).bind(context)
+        clone.vocabulary, clone._membership = snapshot
+        return clone
 
 @__with_set()
 class ValidBytesLine(FieldValidationMixin, schema.BytesLine):
@@ -718,44 +641,6 @@ class ValidRegularExpression(ValidTextLine):
 
 ValidRegEx = ValidRegularExpression
 
-class ValidURI(FieldValidationMixin, schema.URI):
-
-    def _fixup_validation_error_args(self, e, value):
-        if isinstance(e, sch_interfaces.InvalidURI):
-            # This class differs by using the value as the argument, not
-            # a message
-            e.__doc__ = e.__doc__.replace('URI', 'URL')
-            e.args = (value, e.__doc__, self.__fixup_name__)
-            e.message = e.i18n_message = e.__doc__
-        else: # pragma: no cover
-            super()._fixup_validation_error_args(e, value)
-
-class HTTPURL(ValidURI):
-    """
-    A URI field that ensures and requires its value to be an absolute
-    HTTP/S URL.
-    """
-
-    def fromUnicode(self, value):
-        # This can wind up producing something invalid if an
-        # absolute URI was already given for mailto: for whatever.
-        # None of the regexs (zopes or grubers) flag that as invalid.
-        # so we try to
-        orig_value = value
-        if value:
-            lower = value.lower()
-            if not lower.startswith('http://') and not lower.startswith('https://'):
-                # assume http
-                value = 'http://' + value
-        result = super().fromUnicode(value)
-        if result.count(':') != 1:
-            self._reraise_validation_error(
-                sch_interfaces.InvalidURI(orig_value).with_field_and_value(self, orig_value),
-                orig_value,
-                _raise=True)
-
-        return result
-
 class _ValueTypeAddingDocMixin(object):
     """
     A mixin for fields that wrap a value type field (e.g., Object)
@@ -891,84 +776,6 @@ class _MapFromObject(_MapFromObjectMixin):
         return getattr(self.__field, name)
 
 
-class ListOrTupleFromObject(_SequenceFromObjectMixin, ListOrTuple):
-    """
-    The ``value_type`` MUST be a :class:`Variant`, or more generally,
-    something supporting :class:`IFromObject`, :class:`IFromUnicode`
-    or :class:`IFromBytes`.
-
-    .. versionchanged:: 1.9.0
-
-        Implementations of :class:`zope.schema.interfaces.ICollection`
-        (like :class:`zope.schema.List`) and
-        :class:`zope.schema.interfaces.IMapping` (like
-        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
-        when used as the *value_type* of this object *if* their *value_type* is an
-        :class:`zope.schema.interfaces.IObject` (recursively).
-    """
-
-
-class TupleFromObject(_ValueTypeAddingDocMixin,
-                      _SequenceFromObjectMixin,
-                      FieldValidationMixin,
-                      schema.Tuple):
-    """
-    The ``value_type`` MUST be a :class:`Variant`, or more generally,
-    something supporting :class:`IFromObject`, :class:`IFromUnicode`
-    or :class:`IFromBytes`.
-
-    When setting through this object, we will automatically convert
-    lists and only lists to tuples (for convenience coming in through
-    JSON).
-
-    .. versionchanged:: 1.9.0
-
-        Implementations of :class:`zope.schema.interfaces.ICollection`
-        (like :class:`zope.schema.List`) and
-        :class:`zope.schema.interfaces.IMapping` (like
-        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
-        when used as the *value_type* of this object *if* their *value_type* is an
-        :class:`zope.schema.interfaces.IObject` (recursively).
-    """
-    accept_types = (list, tuple)
-
-    def set(self, context, value): # pylint:disable=arguments-differ
-        if isinstance(value, list):
-            value = tuple(value)
-
-        _do_set(self, context, value, TupleFromObject, BeforeSequenceAssignedEvent)
-
-    def validate(self, value):
-        if isinstance(value, list):
-            value = tuple(value)
-        super().validate(value)
-
-
-@__with_set(BeforeDictAssignedEvent)
-class DictFromObject(_ValueTypeAddingDocMixin,
-                     _MapFromObjectMixin,
-                     FieldValidationMixin,
-                     schema.Mapping):
-    """
-    The `key_type` and `value_type` must be supporting
-    :class:`IFromObject` or :class:`.IFromUnicode` or :class:`IFromBytes`
-
-    .. versionchanged:: 1.4.0
-       Subclass :class:`zope.schema.Mapping` instead of :class:`zope.schema.Dict`,
-       allowing for any mapping (such as BTrees), not just dicts. However, the validated
-       value is still a dict.
-
-    .. versionchanged:: 1.9.0
-
-        Implementations of :class:`zope.schema.interfaces.ICollection`
-        (like :class:`zope.schema.List`) and
-        :class:`zope.schema.interfaces.IMapping` (like
-        :class:`zope.schema.Dict`) will automatically be given a ``fromObject`` method
-        when used as the *value_type* of this object *if* their *value_type* is an
-        :class:`zope.schema.interfaces.IObject` (recursively).
-    """
-
-
 @__with_set(BeforeSetAssignedEvent)
 class ValidSet(_ValueTypeAddingDocMixin,
                _SequenceFromObjectMixin,
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Optional instrumentation of validation and conversion.
+
+When enabled, these are counted and timed, per field:
+
+``validate``
+    :class:`nti.schema.field.FieldValidationMixin` validation (which
+    most fields of :mod:`nti.schema.field` use).
+``convert``
+    Calls to :class:`nti.schema.field.FieldConverter` (which the
+    ``FromObject`` fields use for their contents).
+``from_object``
+    :meth:`nti.schema.field.Variant.fromObject`.
+``set``
+    Setting values through the fields of :mod:`nti.schema.field` that
+    send assignment events.
+``init``
+    Creating :class:`nti.schema.schema.SchemaConfigured` objects
+    (recorded per class).
+
+Fields are identified by the interface and name they have in that
+interface (for example, ``nti.schema.interfaces.IFoo.bar``), or by
+their name or class if they aren't part of an interface.
+Times include the time of nested operations, such as validating the
+fields of an ``Object``.
+
+  >>> from nti.schema.instrumentation import enable_instrumentation
+  >>> from nti.schema.instrumentation import disable_instrumentation
+  >>> from nti.schema.field import ValidTextLine
+  >>> recorder = enable_instrumentation()
+  >>> field = ValidTextLine(__name__='title', max_length=5)
+  >>> field.validate(u'Hi')
+  >>> field.validate(u'Too long')
+  Traceback (most recent call last):
+  ...
+  zope.schema._bootstrapinterfaces.TooLong: ...
+  >>> print(recorder.snapshot()['validate']['title']['count'])
+  2
+  >>> print(recorder.snapshot()['validate']['title']['failures'])
+  1
+  >>> print(recorder.to_prometheus().splitlines()[2])
+  nti_schema_calls_total{operation="validate",field="title"} 2
+  >>> _ = disable_instrumentation()
+
+When disabled (the default), each instrumented operation costs one
+check of a global variable.
+
+.. versionadded:: NEXT
+"""
+
+import sys
+from time import perf_counter
+
+__docformat__ = "restructuredtext en"
+
+#: The modules with a ``_recorder`` global that we maintain.
+_INSTRUMENTED_MODULES = (
+    'nti.schema.field',
+    'nti.schema._lazyfields',
+    'nti.schema.schema',
+)
+
+_recorder = None
+
+
+def _field_label(field):
+    name = getattr(field, '__name__', None) or ''
+    iface = getattr(field, 'interface', None)
+    if iface is not None:
+        return iface.__identifier__ + '.' + name
+    return name or type(field).__name__
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Recorder(object):
+    """
+    Collects the number of calls, the cumulative time, and the number of
+    failures (exceptions) of each operation on each field.
+
+    Updates aren't locked, so counts may be slightly low when many
+    threads use the same fields at once.
+    """
+
+    def __init__(self):
+        self._stats = {}
+
+    def record(self, operation, field, seconds, failed):
+        """
+        Record that *operation* took *seconds* for *field* (a field,
+        or a string identifying something), and whether it *failed*.
+        """
+        label = field if isinstance(field, str) else _field_label(field)
+        key = (operation, label)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = [0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += seconds
+        if failed:
+            stats[2] += 1
+
+    def call(self, operation, field, func, *args):
+        """
+        Call *func* with *args*, recording it as *operation* for
+        *field*, and return the result.
+        """
+        start = perf_counter()
+        try:
+            result = func(*args)
+        except BaseException:
+            self.record(operation, field, perf_counter() - start, True)
+            raise
+        self.record(operation, field, perf_counter() - start, False)
+        return result
+
+    def reset(self):
+        """
+        Discard everything recorded.
+        """
+        self._stats = {}
+
+    def snapshot(self):
+        """
+        Return a new dictionary ``{operation: {field: {'count': int,
+        'seconds': float, 'failures': int}}}``.
+        """
+        result = {}
+        for (operation, label), (count, seconds, failures) in list(self._stats.items()):
+            result.setdefault(operation, {})[label] = {
+                'count': count,
+                'seconds': seconds,
+                'failures': failures,
+            }
+        return result
+
+    def to_prometheus(self, prefix='nti_schema'):
+        """
+        Return the statistics in the Prometheus text exposition format,
+        as the counters ``<prefix>_calls_total``,
+        ``<prefix>_seconds_total`` and ``<prefix>_failures_total``,
+        labeled by ``operation`` and ``field``.
+        """
+        stats = sorted(self._stats.items())
+        lines = []
+        for index, (metric, description) in enumerate((
+                ('calls', 'Number of calls.'),
+                ('seconds', 'Cumulative time of calls, in seconds.'),
+                ('failures', 'Number of calls that raised an exception.'),
+        )):
+            name = '%s_%s_total' % (prefix, metric)
+            lines.append('# HELP %s %s' % (name, description))
+            lines.append('# TYPE %s counter' % (name,))
+            for (operation, label), values in stats:
+                lines.append('%s{operation="%s",field="%s"} %s' % (
+                    name, _escape_label(operation), _escape_label(label),
+                    repr(values[index])))
+        return '\n'.join(lines) + '\n'
+
+
+def _install(recorder):
+    global _recorder # pylint:disable=global-statement
+    _recorder = recorder
+    for name in _INSTRUMENTED_MODULES:
+        module = sys.modules.get(name)
+        if module is not None:
+            module._recorder = recorder # pylint:disable=protected-access
+
+def enable_instrumentation(recorder=None):
+    """
+    Start recording with *recorder*, or a new :class:`Recorder`, and return
+    it.
+    """
+    recorder = recorder if recorder is not None else Recorder()
+    _install(recorder)
+    return recorder
+
+def disable_instrumentation():
+    """
+    Stop recording, and return the recorder that was in use (or None).
+    """
+    recorder = _recorder
+    _install(None)
+    return recorder
+
+def get_recorder():
+    """
+    Return the recorder in use, or None.
+    """
+    return _recorder
+
+try:
+    from zope.testing import cleanup
+except ImportError: # pragma: no cover
+    pass
+else:
+    cleanup.addCleanUp(disable_instrumentation)
+    del cleanup
@@ -4,8 +4,18 @@
 Interfaces describing the events and fields this package uses.
 
 Also utility functions.
+
+Importing this module changes some things in :mod:`zope.schema.interfaces`
+(see :func:`apply_interface_patches`). If the environment variable
+``NTI_SCHEMA_DEFER_INTERFACE_PATCHES`` is set to a non-empty value when
+this module is first imported, those changes aren't made until
+:func:`apply_interface_patches` is called.
+
+.. versionchanged:: NEXT
+   Add ``NTI_SCHEMA_DEFER_INTERFACE_PATCHES``.
 """
 
+import os
 import warnings
 import traceback
 
@@ -36,7 +46,8 @@ class IBeforeSchemaFieldAssignedEvent(Interface):
 
     The interface
     :class:`zope.schema.interfaces.IBeforeObjectAssignedEvent` is a
-    sub-interface of this one once this module is imported.
+    sub-interface of this one once this module is imported (or
+    :func:`apply_interface_patches` is called).
     """
     object = Attribute("The object that is going to be assigned. Subscribers may modify this")
 
@@ -44,11 +55,6 @@ class IBeforeSchemaFieldAssignedEvent(Interface):
 
     context = Attribute("The context object where the object will be assigned to.")
 
-# Make this a base of the zope interface so our handlers
-# are compatible. This is dangerous if any lookups or registrations have already been done,
-# as zope.interface maintains a cache of these things.
-sch_interfaces.IBeforeObjectAssignedEvent.__bases__ = (IBeforeSchemaFieldAssignedEvent,)
-
 @implementer(IBeforeSchemaFieldAssignedEvent)
 class BeforeSchemaFieldAssignedEvent(object):
 
@@ -160,20 +166,59 @@ def _InvalidValue__init__(self, *args, **kwargs):
     if field is not None or value is not None:
         self.with_field_and_value(field, value)
 
+_interface_patches_applied = False
 
-sch_interfaces.InvalidValue.__init__ = _InvalidValue__init__
-
-del _InvalidValue__init__
-
-deprecated('InvalidValue',
-           "This is a synonym for zope.schema.interfaces.InvalidValue. "
-           "Use its .with_field_and_value() method to set the field and value. "
-           "Do not try to pass them as keywords to the constructor."
-           )
+def apply_interface_patches():
+    """
+    Make the changes to :mod:`zope.schema.interfaces` this package
+    relies on, if they haven't already been made.
+
+    - :class:`zope.schema.interfaces.IBeforeObjectAssignedEvent` becomes
+      a sub-interface of :class:`IBeforeSchemaFieldAssignedEvent`, so
+      subscribers for the latter see the events sent by
+      :class:`zope.schema.Object` fields.
+    - The constructor of :class:`zope.schema.interfaces.InvalidValue`
+      accepts (deprecated) ``field`` and ``value`` keywords.
+    - Accessing ``InvalidValue`` from this module produces a
+      deprecation warning.
+
+    This is done when this module is imported, unless the environment
+    variable ``NTI_SCHEMA_DEFER_INTERFACE_PATCHES`` is set. Changing
+    the bases of an interface discards the adapter and subscriber
+    lookups that have been cached by every registry that has used it,
+    so applications that set that variable should call this early, before
+    components are registered and looked up.
+
+    .. versionadded:: NEXT
+    """
+    global _interface_patches_applied # pylint:disable=global-statement
+    if _interface_patches_applied:
+        return
+    _interface_patches_applied = True
+
+    # Make this a base of the zope interface so our handlers
+    # are compatible. This is dangerous if any lookups or registrations have already been done,
+    # as zope.interface maintains a cache of these things. Don't do it
+    # again if it's already done (e.g., this module has been reloaded) to
+    # avoid discarding those caches.
+    bases = (IBeforeSchemaFieldAssignedEvent,)
+    if sch_interfaces.IBeforeObjectAssignedEvent.__bases__ != bases:
+        sch_interfaces.IBeforeObjectAssignedEvent.__bases__ = bases
+
+    sch_interfaces.InvalidValue.__init__ = _InvalidValue__init__
+
+    deprecated('InvalidValue',
+               "This is a synonym for zope.schema.interfaces.InvalidValue. "
+               "Use its .with_field_and_value() method to set the field and value. "
+               "Do not try to pass them as keywords to the constructor."
+               )
 
 assert hasattr(sch_interfaces.InvalidValue, 'value')
 assert hasattr(sch_interfaces.ValidationError, 'field')
 
+if not os.environ.get('NTI_SCHEMA_DEFER_INTERFACE_PATCHES'):
+    apply_interface_patches()
+
 
 class IFromObject(Interface):
     """
@@ -245,6 +290,25 @@ class VariantValidationError(sch_interfaces.ValidationError):
 class IListOrTuple(sch_interfaces.IList):
     pass
 
+def _spec_cache(spec):
+    """
+    Return the ``_v_attrs`` dictionary of the specification *spec*, creating
+    it if need be, or None if *spec* isn't a specification.
+
+    ``zope.interface`` discards this dictionary when the specification (or
+    one of its bases) changes, making it a good place to cache things
+    derived from the specification.
+    """
+    try:
+        cache_in = spec._v_attrs # pylint:disable=protected-access
+    except AttributeError:
+        return None
+    if cache_in is None:
+        cache_in = spec._v_attrs = {}
+    return cache_in
+
+_MOST_DERIVED_CACHE_KEY = '__nti_schema_most_derived'
+
 def find_most_derived_interface(ext_self, iface_upper_bound, possibilities=None):
     """
     Search for the most derived version of the interface `iface_upper_bound`
@@ -252,13 +316,28 @@ def find_most_derived_interface(ext_self, iface_upper_bound, possibilities=None)
 
     :keyword possibilities: An iterable of schemas to consider. If not given,
         all the interfaces provided by ``ext_self`` will be considered.
+
+    When *possibilities* is None or a tuple, the result is cached on the
+    specification provided by *ext_self* (and discarded when that
+    specification changes).
     """
-    if possibilities is None:
-        possibilities = providedBy(ext_self)
+    spec = providedBy(ext_self)
+    cache = None
+    if possibilities is None or type(possibilities) is tuple: # pylint:disable=unidiomatic-typecheck
+        attrs = _spec_cache(spec)
+        if attrs is not None:
+            cache = attrs.setdefault(_MOST_DERIVED_CACHE_KEY, {})
+            key = (iface_upper_bound, possibilities)
+            result = cache.get(key)
+            if result is not None:
+                return result
+
     _iface = iface_upper_bound
-    for iface in possibilities:
+    for iface in possibilities if possibilities is not None else spec:
         if iface.isOrExtends(_iface):
             _iface = iface
+    if cache is not None:
+        cache[key] = _iface
     return _iface
 
 try:
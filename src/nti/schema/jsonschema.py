@@ -9,13 +9,20 @@ on fields of interfaces, helping determine how the schema is built.
 
 ..  note:: This schema is ad-hoc and non-standard.
 """
+import io
+import json
 from copy import copy
+from weakref import WeakSet
 from collections.abc import Sequence
 from numbers import Number
 
 
+
+from zope.i18n import negotiate
 from zope.i18n import translate
+from zope.i18n.interfaces import IUserPreferredLanguages
 
+from zope.interface import providedBy
 from zope.interface.interfaces import IMethod
 from zope.interface.interfaces import IInterface
 
@@ -24,6 +31,9 @@ from zope.schema import vocabulary as sch_vocabulary
 
 from nti.schema.interfaces import IVariant
 from nti.schema.interfaces import find_most_derived_interface
+from nti.schema.interfaces import _spec_cache
+from nti.schema.precompile import get_installed_cache
+from nti.schema._sitecache import SiteCache
 
 __docformat__ = "restructuredtext en"
 
@@ -81,11 +91,75 @@ def get_ui_type_from_field_interface(field):
     return None
 _ui_type_from_field_iface = ui_type_from_field_iface = get_ui_type_from_field_interface # BWC
 
+#: Maps field classes to ``(ui_type, ui_base_type)``
+_registered_ui_types = {}
+#: Incremented when :data:`_registered_ui_types` changes, invalidating
+#: every memo made by :func:`get_ui_types_from_field`
+_ui_types_generation = 0
+
+_UI_TYPES_CACHE_KEY = '__nti_schema_ui_types'
+
+def register_ui_types(field_class, ui_type, ui_base_type=None):
+    """
+    Make :func:`get_ui_types_from_field` return ``(ui_type, ui_base_type)``
+    for instances of *field_class* (and its subclasses, unless
+    they're registered too), instead of deriving them from the field.
+
+    .. versionadded:: NEXT
+    """
+    global _ui_types_generation # pylint:disable=global-statement
+    _registered_ui_types[field_class] = (ui_type, ui_base_type)
+    _ui_types_generation += 1
+
+def unregister_ui_types(field_class):
+    """
+    Undo a :func:`register_ui_types` for *field_class*.
+
+    .. versionadded:: NEXT
+    """
+    global _ui_types_generation # pylint:disable=global-statement
+    if _registered_ui_types.pop(field_class, None) is not None:
+        _ui_types_generation += 1
+
 def get_ui_types_from_field(field):
+    """
+    Return a tuple ``(ui_type, ui_base_type)`` describing *field*.
+
+    The answer depends only on the class of the field, its ``_type``,
+    and the interfaces it provides, so it is cached on the
+    specification the field provides. Field classes for which the
+    derived answer is unsuitable can use :func:`register_ui_types`.
+    """
+    _type = getattr(field, '_type', None)
+    kind = type(field)
+    attrs = _spec_cache(providedBy(field))
+    if attrs is None: # pragma: no cover
+        return _compute_ui_types_from_field(field, kind, _type)
+
+    generation, cache = attrs.get(_UI_TYPES_CACHE_KEY, (None, None))
+    if generation != _ui_types_generation:
+        cache = {}
+        attrs[_UI_TYPES_CACHE_KEY] = (_ui_types_generation, cache)
+
+    try:
+        key = (kind, _type)
+        return cache[key]
+    except TypeError: # pragma: no cover
+        # Unhashable _type
+        return _compute_ui_types_from_field(field, kind, _type)
+    except KeyError:
+        result = cache[key] = _compute_ui_types_from_field(field, kind, _type)
+        return result
+
+def _compute_ui_types_from_field(field, kind, _type):
     # TODO: Refactor and simplify
     # pylint:disable=too-complex,too-many-branches
+    if _registered_ui_types:
+        for cls in kind.__mro__:
+            if cls in _registered_ui_types:
+                return _registered_ui_types[cls]
+
     ui_type = ui_base_type = None
-    _type = getattr(field, '_type', None)
     if isinstance(_type, type):
         ui_type = _type.__name__
     elif isinstance(_type, tuple):
@@ -126,20 +200,26 @@ def get_ui_types_from_field(field):
 
 _ui_type_from_field = ui_type_from_field = get_ui_types_from_field # BWC
 
-def get_data_from_choice_field(v, base_type=None):
-    # Vocabulary could be a name or the vocabulary itself
-    choices:Sequence = ()
-    vocabulary = None
-    # pylint:disable-next=no-value-for-parameter
-    if sch_interfaces.IVocabulary.providedBy(v.vocabulary): # pragma: no cover
-        vocabulary = v.vocabulary
-    elif isinstance(v.vocabularyName, str):
-        name = v.vocabularyName
-        vocabulary = sch_vocabulary.getVocabularyRegistry().get(None, name)
+_json_scalar_types = (str, int, float, type(None))
 
-    if vocabulary is not None:
+class _ExportedVocabulary(object):
+    """
+    The choices exported from a vocabulary, and a JSON
+    serialization of them, computed when first needed.
+    """
+
+    __slots__ = (
+        'choices',
+        'values',
+        'string_tokens',
+        '_json',
+    )
+
+    def __init__(self, vocabulary):
         choices = []
-        tokens = []
+        values = []
+        bare = False
+        string_tokens = True
         for term in vocabulary:
             # For BWC, we do different things depending on whether
             # there is a title or not
@@ -155,21 +235,221 @@ def get_data_from_choice_field(v, base_type=None):
                     }
 
                 choices.append(choice)
-            else: # pragma: no cover
+            else:
                 choices.append(term.token)  # bare; ideally this would go away
-            tokens.append(term.token)
-
+                bare = True
+            value = term.value
+            values.append(value if isinstance(value, _json_scalar_types) else term.token)
+            string_tokens = string_tokens and isinstance(term.token, str)
+
+        self.choices = tuple(choices)
+        # Bare tokens don't say what the values are; the validator
+        # needs them.
+        self.values = tuple(values) if bare else None
         # common case, these will all be the same type
-        if  not base_type \
-            and all((isinstance(x, str) for x in tokens)):
-            base_type = 'string'
-    return choices, base_type
+        self.string_tokens = string_tokens
+        self._json = None
+
+    @property
+    def json(self):
+        if self._json is None:
+            self._json = json.dumps(self.choices, sort_keys=True,
+                                    separators=(',', ':')).encode('utf-8')
+        return self._json
+
+_EXPORTED_VOCABULARY_ATTR = '_v_nti_schema_exported'
+
+#: Vocabularies found by name, exported. Kept by name for each
+#: vocabulary registry and site manager.
+_exported_by_name = SiteCache()
+
+def _export_vocabulary(vocabulary):
+    try:
+        return vocabulary.__dict__[_EXPORTED_VOCABULARY_ATTR]
+    except KeyError:
+        pass
+    except AttributeError: # pragma: no cover
+        # No instance dictionary, can't cache.
+        return _ExportedVocabulary(vocabulary)
+    exported = _ExportedVocabulary(vocabulary)
+    vocabulary.__dict__[_EXPORTED_VOCABULARY_ATTR] = exported
+    return exported
+
+def _get_exported_vocabulary(v):
+    # Vocabulary could be a name or the vocabulary itself
+    # pylint:disable-next=no-value-for-parameter
+    if sch_interfaces.IVocabulary.providedBy(v.vocabulary):
+        return _export_vocabulary(v.vocabulary)
+    if isinstance(v.vocabularyName, str):
+        name = v.vocabularyName
+        exported = _exported_by_name.get(name)
+        if exported is None:
+            vocabulary = sch_vocabulary.getVocabularyRegistry().get(None, name)
+            exported = _export_vocabulary(vocabulary)
+            _exported_by_name.set(name, exported)
+        return exported
+    return None
+
+def vocabularies_changed(vocabulary=None):
+    """
+    Discard the choices cached by :func:`get_data_from_choice_field`.
+
+    If *vocabulary* is given, only the choices cached for that
+    vocabulary object are discarded; this is needed only if the terms
+    of a vocabulary are modified in place. Otherwise, the choices
+    cached for every named vocabulary are discarded. This is called
+    automatically when an
+    :class:`~zope.schema.interfaces.IVocabularyFactory` is registered
+    or unregistered.
+
+    The schemas and templates cached by :class:`JsonSchemafier` objects
+    created with ``cache=True`` include choices, so they are
+    discarded in either case.
+
+    .. versionadded:: NEXT
+    """
+    if vocabulary is not None:
+        vars(vocabulary).pop(_EXPORTED_VOCABULARY_ATTR, None)
+    else:
+        _exported_by_name.clear()
+    _discard_cached_schemas()
+
+def get_data_from_choice_field(v, base_type=None, start=0, limit=None):
+    """
+    Return a list of the choices in the vocabulary of the choice
+    field *v*, and the *base_type*, or the base type of the tokens if
+    *base_type* is not given.
+
+    :keyword int start: The index of the first choice to return.
+    :keyword int limit: If given, return at most this many choices.
+
+    .. versionchanged:: NEXT
+       The exported choices are cached for each vocabulary object,
+       and for each vocabulary name in each site; the choice
+       dictionaries returned are copies and may be modified. See
+       :func:`vocabularies_changed`. Add the *start* and *limit*
+       keywords.
+    """
+    exported = _get_exported_vocabulary(v)
+    if exported is None: # pragma: no cover
+        return (), base_type
+    if not base_type and exported.string_tokens:
+        base_type = 'string'
+    end = None if limit is None else start + limit
+    return [
+        copy(choice) if isinstance(choice, dict) else choice
+        for choice in exported.choices[start:end]
+    ], base_type
+
+def get_json_from_choice_field(v):
+    """
+    Return the choices of :func:`get_data_from_choice_field` already
+    serialized as (UTF-8 encoded) JSON bytes, suitable for including
+    directly in a response body. Titles are not translated.
+
+    The result is cached along with the choices.
+
+    .. versionadded:: NEXT
+    """
+    exported = _get_exported_vocabulary(v)
+    if exported is None: # pragma: no cover
+        return b'[]'
+    return exported.json
+
 _process_choice_field = process_choice_field = get_data_from_choice_field
 
 
+try:
+    from zope.testing import cleanup
+except ImportError: # pragma: no cover
+    pass
+else:
+    cleanup.addCleanUp(vocabularies_changed)
+    del cleanup
+
+
+class _Untranslated(str):
+    """
+    A string in a schema template that will be translated.
+
+    It is equal to the text that will be translated (which is kept in
+    *msgid*, since that may be a :class:`zope.i18nmessageid.Message`
+    with a domain and mapping).
+    """
+
+    def __new__(cls, msgid):
+        self = str.__new__(cls, msgid)
+        self.msgid = msgid
+        return self
+
+    def __reduce__(self):
+        return (_Untranslated, (self.msgid,))
+
+
+def _copy_schema_value(value, _immutable=(str, bytes, Number, type(None), tuple)):
+    # Copy the dicts and lists making up a schema. The values of
+    # TAG_APPLICATION_INFO may be anything, so those get copied like
+    # they did when they were put in the schema.
+    if isinstance(value, dict):
+        return {k: _copy_schema_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_schema_value(v) for v in value]
+    if isinstance(value, _immutable):
+        return value
+    return copy(value)
+
+#: The key in a schema's ``_v_attrs`` holding cached schemas.
+_SCHEMA_CACHE_KEY = '__nti_schema_jsonschema'
+#: The key in a schema's ``_v_attrs`` holding cached schema templates.
+_TEMPLATE_CACHE_KEY = '__nti_schema_jsonschema_template'
+
+#: The specifications with schemas or templates cached in them.
+_specs_with_cached_schemas = WeakSet()
+
+def _site_cache(spec, name):
+    # Named vocabularies are found using the vocabulary registry and
+    # the current site (see _get_exported_vocabulary), so schemas
+    # that include their choices are cached for each of them.
+    cache = _spec_cache(spec)
+    if cache is None:
+        return None
+    result = cache.get(name)
+    if result is None:
+        result = cache[name] = SiteCache()
+        _specs_with_cached_schemas.add(spec)
+    return result
+
+def _discard_cached_schemas():
+    for spec in list(_specs_with_cached_schemas):
+        cache = spec._v_attrs # pylint:disable=protected-access
+        if cache:
+            cache.pop(_SCHEMA_CACHE_KEY, None)
+            cache.pop(_TEMPLATE_CACHE_KEY, None)
+    _specs_with_cached_schemas.clear()
+
+
+#: The key in a schema holding the definitions of nested interfaces
+#: when a :class:`JsonSchemafier` is created with ``definitions=True``.
+DEFINITIONS_KEY = '$defs'
+
+def _definition_ref(iface):
+    return {'$ref': '#/%s/%s' % (DEFINITIONS_KEY, iface.__identifier__)}
+
+
 class JsonSchemafier(object):
 
-    def __init__(self, schema, readonly_override=None, context=None):
+    #: While generating a schema with definitions, maps interface
+    #: identifiers to their templates (or None while they're being generated).
+    #: Shared by the objects produced by :meth:`bind`.
+    _definitions = None
+
+    #: While generating several schemas with :func:`make_schemas`, maps
+    #: interfaces to their templates. Shared by the objects produced
+    #: by :meth:`bind`.
+    _batch_templates = None
+
+    def __init__(self, schema, readonly_override=None, context=None, cache=False,
+                 definitions=False):
         """
         Create a new schemafier.
 
@@ -177,10 +457,24 @@ class JsonSchemafier(object):
         :param bool readonly_override: If given, a boolean value that will replace all
             readonly values in the schema.
         :param context: The context passed to :func:`zope.i18n.translate`
+        :keyword bool cache: If true (*not* the default), :meth:`make_schema`
+            caches its results (see :meth:`cache_key`).
+        :keyword bool definitions: If true (*not* the default), nested
+            interfaces (such as the ``schema`` of an ``Object`` field) are
+            generated only once. Each is placed under its
+            ``__identifier__`` in a mapping stored in the schema under
+            :data:`DEFINITIONS_KEY`, and referenced where it's used as
+            ``{"$ref": "#/$defs/<identifier>"}``. This also allows for
+            interfaces that refer to themselves.
+
+        .. versionchanged:: NEXT
+           Add the *cache* and *definitions* keywords.
         """
         self.schema = schema
         self.readonly_override = readonly_override
         self.context = context
+        self.cache = cache
+        self.definitions = definitions
 
     def _iter_names_and_descriptions(self):
         """
@@ -221,7 +515,36 @@ class JsonSchemafier(object):
     process_choice_field = get_data_from_choice_field # BWC
 
     def post_process_field(self, name, field, item_schema):
-        pass
+        """
+        Subclass hook to change the *item_schema* of the top-level
+        field *field* named *name* in place.
+
+        The strings in *item_schema* are translated. Overriding this
+        (or :meth:`make_schema`) means the schema can't be made from a
+        language-independent template: each language walks the
+        interface again, and nested interfaces are produced by calling
+        :meth:`make_schema` of a :meth:`bound <bind>` copy of this
+        object, as they were before templates existed. Override
+        :meth:`post_process_field_template` instead if possible.
+        """
+
+    def post_process_field_template(self, name, field, item_template):
+        """
+        Subclass hook like :meth:`post_process_field`, but called with
+        the language-independent *item_template*: strings that will be
+        translated are placeholders equal to the untranslated string
+        (see :meth:`make_schema_template`).
+
+        .. versionadded:: NEXT
+        """
+
+    def _uses_templates(self):
+        # Before templates, post_process_field saw translated text and
+        # nested interfaces went through make_schema. Subclasses that
+        # override either still get that.
+        cls = type(self)
+        return (cls.make_schema is JsonSchemafier.make_schema
+                and cls.post_process_field is JsonSchemafier.post_process_field)
 
     def bind(self, schema):
         clone = self.__class__.__new__(self.__class__)
@@ -229,6 +552,76 @@ class JsonSchemafier(object):
         clone.schema = schema
         return clone
 
+    def share_schema_templates(self, templates):
+        """
+        Keep the templates made by :meth:`make_schema_template` in the
+        mapping *templates*, keyed by interface, and use those already
+        there. Objects produced by :meth:`bind` share it.
+
+        This is how :func:`make_schemas` generates the template of each
+        interface only once; it's useful for other batches of schemas
+        made by the same kind of object with the same arguments.
+
+        .. versionadded:: NEXT
+        """
+        self._batch_templates = templates
+
+    def template_cache_key(self):
+        """
+        Return a hashable key for the output of :meth:`make_schema_template`,
+        or None if the output cannot be cached.
+
+        By default this is the type of this object and the
+        ``readonly_override`` (and a marker if ``definitions`` are
+        used). Subclasses that produce schemas that vary in other ways
+        must extend this. (Subclasses whose templates are translated,
+        see :meth:`post_process_field`, use the :meth:`cache_key` instead.)
+
+        Because named vocabularies are found in the current site,
+        cached templates (and schemas) are kept separately for each
+        vocabulary registry and site manager, in addition to this key.
+        Site managers are referred to weakly, so local (persistent)
+        site managers aren't kept alive by the cache. The cached
+        templates are discarded by :func:`vocabularies_changed`.
+
+        .. versionadded:: NEXT
+        """
+        key = (type(self), self.readonly_override)
+        if self.definitions:
+            key += (DEFINITIONS_KEY,)
+        return key
+
+    def cache_key(self):
+        """
+        Return a hashable key for the output of :meth:`make_schema`, or
+        None if the output cannot be cached.
+
+        By default this is the :meth:`template_cache_key` plus the
+        language that strings will be translated to. That's either the
+        language negotiated for the ``context`` by
+        :func:`zope.i18n.negotiate`, or the preferred
+        languages of the ``context``
+        (:class:`zope.i18n.interfaces.IUserPreferredLanguages`). If the
+        ``context`` is neither None nor adaptable to that interface, the
+        output is not cached.
+
+        .. versionadded:: NEXT
+        """
+        key = self.template_cache_key()
+        if key is None:
+            return None
+        context = self.context
+        language = None
+        if context is not None:
+            language = negotiate(context)
+            if language is None:
+                languages = IUserPreferredLanguages(context, None)
+                if languages is None:
+                    return None
+                # pylint:disable-next=too-many-function-args
+                language = tuple(languages.getPreferredLanguages())
+        return key + (language,)
+
     def make_schema(self):
         """
         Create the JSON schema.
@@ -236,11 +629,167 @@ class JsonSchemafier(object):
         Individual fields of the schema will be checked and returned. See the various
         ``TAG`` constants for ways that the schema externalization can be influenced.
 
+        This is done by translating the result of :meth:`make_schema_template`.
+
+        If this object was created with ``cache=True``, the schema is
+        cached (in the same place ``zope.interface`` caches things)
+        under the :meth:`cache_key` and a copy returned. Calling
+        ``changed()`` on the interface invalidates the cache. Note that
+        changing the tagged values of fields, or changing nested
+        interfaces, does not call ``changed()``, so do that yourself.
+
         :return: A dictionary consisting of dictionaries, one for each field. All the keys
             are strings and the values are strings, bools, numbers, or lists of primitives.
             Will be suitable for writing to JSON.
+
+        .. versionchanged:: NEXT
+           Support caching.
+        """
+        if not self.cache:
+            return self.translate_template(self._make_schema_template())
+
+        key = self.cache_key()
+        schemas = _site_cache(self.schema, _SCHEMA_CACHE_KEY) if key is not None else None
+        if schemas is None:
+            return self.translate_template(self.make_schema_template())
+
+        ext_schema = schemas.get(key)
+        if ext_schema is None:
+            ext_schema = self.translate_template(self.make_schema_template())
+            schemas.set(key, ext_schema)
+        # Callers are free to modify what they get, so they must not get
+        # what we cached.
+        return _copy_schema_value(ext_schema)
+
+    def make_schema_template(self):
+        """
+        Create the language-independent part of the JSON schema.
+
+        This is like :meth:`make_schema`, except that strings that would
+        be translated are instead placeholders (equal to the
+        untranslated string). Pass the result to
+        :meth:`translate_template` to get the schema. (If a subclass
+        overrides :meth:`post_process_field` or :meth:`make_schema`,
+        the strings are already translated; see :meth:`post_process_field`.)
+
+        If this object was created with ``cache=True``, the template is
+        cached (like the schema is) under the :meth:`template_cache_key`,
+        so producing the schema in a new language doesn't need to walk
+        the interface again. It's also kept in the :mod:`nti.schema.precompile`
+        cache, if one is installed. The result is shared and *must not*
+        be modified.
+
+        .. versionadded:: NEXT
         """
-        ext_schema = {}
+        batch_templates = self._batch_templates
+        if batch_templates is None:
+            return self._make_cached_schema_template()
+        try:
+            return batch_templates[self.schema]
+        except KeyError:
+            template = batch_templates[self.schema] = self._make_cached_schema_template()
+            return template
+
+    def _make_cached_schema_template(self):
+        if not self.cache:
+            return self._make_schema_template()
+
+        uses_templates = self._uses_templates()
+        # Without templates, what we make is already translated.
+        key = self.template_cache_key() if uses_templates else self.cache_key()
+        templates = _site_cache(self.schema, _TEMPLATE_CACHE_KEY) if key is not None else None
+        if templates is None:
+            return self._make_schema_template()
+        template = templates.get(key)
+        if template is not None:
+            return template
+        precompiled = get_installed_cache() if uses_templates else None
+        template = precompiled.get_template(self.schema, key) if precompiled is not None else None
+        if template is None:
+            template = self._make_schema_template()
+            if precompiled is not None:
+                precompiled.set_template(self.schema, key, template)
+        templates.set(key, template)
+        return template
+
+    def translate_template(self, template):
+        """
+        Return a copy of *template* (as produced by :meth:`make_schema_template`)
+        with the placeholder strings translated using the ``context``.
+
+        .. versionadded:: NEXT
+        """
+        return self._translate_value(template)
+
+    def _translate_value(self, value):
+        # Like _copy_schema_value, but translating.
+        if type(value) is _Untranslated: # pylint:disable=unidiomatic-typecheck
+            return self._translate(value.msgid)
+        if isinstance(value, dict):
+            return {k: self._translate_value(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._translate_value(v) for v in value]
+        if isinstance(value, str):
+            # Including str itself
+            return value
+        return _copy_schema_value(value)
+
+    def write_schema(self, stream, flush=False, encoding='utf-8'):
+        """
+        Write the JSON serialization of :meth:`make_schema` to *stream*.
+
+        This produces the same document as ``json.dump(self.make_schema(),
+        stream, sort_keys=True)``, but without building the whole schema
+        first: the fields are written one at a time, in sorted order.
+
+        There are two exceptions, where the whole (untranslated)
+        template is built before anything is written, though each
+        field is still translated and written one at a time. If this
+        object was created with ``cache=True``, the template is kept
+        in the cache anyway (see :meth:`make_schema_template`); and if
+        it was created with ``definitions=True``, the definitions,
+        which are written first, aren't known until every field has
+        been generated.
+
+        :param stream: A file-like object with a ``write`` method. If it is a
+            binary stream (an instance of :class:`io.RawIOBase` or
+            :class:`io.BufferedIOBase`), *encoding* is used to encode the text;
+            otherwise text is written.
+        :keyword bool flush: If true, the stream is flushed after
+            each top-level field is written.
+
+        .. versionadded:: NEXT
+        """
+        encoder = json.JSONEncoder(sort_keys=True)
+        binary = isinstance(stream, (io.RawIOBase, io.BufferedIOBase))
+        if binary:
+            def write(text):
+                stream.write(text.encode(encoding))
+        else:
+            write = stream.write
+
+        if self.cache or self.definitions:
+            # With definitions, we don't know the contents of the
+            # first key until we've seen all the fields.
+            fields = sorted(self.make_schema_template().items())
+        else:
+            fields = ((k, self._make_field_template(k, v))
+                      for k, v in sorted(self._iter_allowed_fields()))
+
+        separator = '{'
+        for k, item_template in fields:
+            write(separator
+                  + encoder.encode(k)
+                  + ': '
+                  + encoder.encode(self.translate_template(item_template)))
+            separator = ', '
+            if flush:
+                stream.flush()
+        write('}' if separator == ', ' else '{}')
+        if flush:
+            stream.flush()
+
+    def _iter_allowed_fields(self):
         for k, v in self._iter_names_and_descriptions():
             __traceback_info__ = k, v
             # pylint:disable-next=no-value-for-parameter
@@ -251,17 +800,55 @@ class JsonSchemafier(object):
                 # If we disallow at the top level, we don't even
                 # hint to its existence.
                 continue
+            yield k, v
 
-            item_schema = self._make_field_schema(v, k)
-
-            self.post_process_field(k, v, item_schema)
-            ext_schema[k] = item_schema
+    def _make_field_template(self, k, v):
+        item_schema = self._make_field_schema(v, k)
+        self.post_process_field_template(k, v, item_schema)
+        self.post_process_field(k, v, item_schema)
+        return item_schema
 
-        return ext_schema
+    def _make_schema_template(self):
+        if not self.definitions or self._definitions is not None:
+            return {
+                k: self._make_field_template(k, v)
+                for k, v in self._iter_allowed_fields()
+            }
+
+        # Starting a new generation
+        self._definitions = {}
+        try:
+            template = self._make_schema_template()
+            if self._definitions:
+                template[DEFINITIONS_KEY] = self._definitions
+        finally:
+            del self._definitions
+        return template
+
+    def _make_nested_schema_template(self, iface):
+        if self._definitions is None:
+            if not self._uses_templates():
+                return self.bind(iface).make_schema()
+            return self.bind(iface).make_schema_template()
+
+        definitions = self._definitions
+        name = iface.__identifier__
+        if name not in definitions:
+            definitions[name] = None # In case it refers to itself
+            # pylint:disable-next=protected-access
+            definitions[name] = self.bind(iface)._make_schema_template()
+        return _definition_ref(iface)
 
     def _translate(self, text):
         return translate(text, context=self.context)
 
+    def _defer_translation(self, text):
+        # Called while building a template for strings that
+        # will be translated by translate_template.
+        if not self._uses_templates():
+            return self._translate(text)
+        return _Untranslated(text)
+
     def _make_field_schema(self, field, name=None):
         name = name or field.__name__ or ''
         if not self.allow_field(name, field):
@@ -305,6 +892,9 @@ class JsonSchemafier(object):
             choices, base_type = self.get_data_from_choice_field(field, ui_base_type)
             item_schema['choices'] = choices
             item_schema['base_type'] = base_type
+            exported = _get_exported_vocabulary(field)
+            if exported is not None and exported.values is not None:
+                item_schema['choice_values'] = list(exported.values)
         # pylint:disable-next=no-value-for-parameter
         if IVariant.providedBy(field):
             # 'fields' is not actually declared in the IVariant
@@ -318,7 +908,7 @@ class JsonSchemafier(object):
 
         application_info = field.queryTaggedValue(TAG_APPLICATION_INFO) or {}
         item_schema['application_info'] = {
-            k: self._translate(v) if isinstance(v, str) else copy(v)
+            k: self._defer_translation(v) if isinstance(v, str) else copy(v)
             for k, v in application_info.items()
         }
 
@@ -358,11 +948,65 @@ class JsonSchemafier(object):
                 # so we need to recurse
                 value = self._make_field_schema(value)
             elif IInterface.providedBy(value):
-                schemafier = self.bind(value)
-                value = schemafier.make_schema()
+                value = self._make_nested_schema_template(value)
             elif isinstance(value, str):
-                value = self._translate(value)
+                value = self._defer_translation(value)
 
             if not isinstance(value, _allowed_value_types):
                 continue # pragma: no cover
             item_schema[name] = value
+
+
+def _make_schema_templates(factory, schemas, kwargs):
+    batch_templates = {}
+    templates = []
+    for schema in schemas:
+        schemafier = factory(schema, **kwargs)
+        schemafier.share_schema_templates(batch_templates)
+        templates.append(schemafier.make_schema_template())
+    return templates
+
+def make_schemas(schemas, context=None, factory=JsonSchemafier, processes=None, **kwargs):
+    """
+    Create the JSON schema for each interface in *schemas*.
+
+    This is like calling ``factory(schema, context=context,
+    **kwargs).make_schema()`` for each schema, but the template of
+    each interface (including nested interfaces) is generated only
+    once for the whole batch. (The global caches for UI types,
+    vocabulary choices and derived interfaces are also shared.)
+
+    :param schemas: A sequence of interfaces.
+    :keyword factory: A callable, usually a subclass of
+        :class:`JsonSchemafier`, accepting a schema, the ``context``,
+        and the *kwargs*.
+    :keyword int processes: If given and greater than 1, the
+        templates are generated by a pool of this many processes, and
+        translated in this process. The *factory* and the *schemas*
+        must be pickleable, and the worker processes must have the
+        same configuration (e.g., registered vocabularies) as this
+        process, which is typically the case when they are forked.
+    :return: A list of the schemas, in the same order as *schemas*.
+
+    .. versionadded:: NEXT
+    """
+    schemas = list(schemas)
+    if processes and processes > 1 and len(schemas) > 1:
+        # pylint:disable-next=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+        processes = min(processes, len(schemas))
+        chunks = [schemas[i::processes] for i in range(processes)]
+        templates = [None] * len(schemas)
+        with ProcessPoolExecutor(processes) as pool:
+            for i, chunk_templates in enumerate(pool.map(_make_schema_templates,
+                                                         [factory] * processes,
+                                                         chunks,
+                                                         [kwargs] * processes)):
+                templates[i::processes] = chunk_templates
+    else:
+        templates = _make_schema_templates(factory, schemas, kwargs)
+
+    return [
+        factory(schema, context=context, **kwargs).translate_template(template)
+        for schema, template in zip(schemas, templates)
+    ]
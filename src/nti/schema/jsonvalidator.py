@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Validating plain data against the output of
+:class:`nti.schema.jsonschema.JsonSchemafier`.
+
+This lets a tier that receives JSON payloads (for example, at the edge)
+reject invalid data cheaply, using the same constraints the server
+will apply, without importing :mod:`zope.interface` or
+:mod:`zope.schema`. Schemas are compiled once into a tree of closures::
+
+  >>> from nti.schema.jsonvalidator import compile_validator
+  >>> validate = compile_validator({
+  ...     'name': {'type': 'string', 'base_type': 'string', 'required': True,
+  ...              'min_length': 1, 'max_length': 10},
+  ...     'age': {'type': 'int', 'base_type': 'int', 'required': False,
+  ...             'min': 0, 'max': None},
+  ... })
+  >>> validate({'name': 'Jason', 'age': 42})
+  []
+  >>> validate({'age': -1})
+  [(('age',), 'TooSmall'), (('name',), 'RequiredMissing')]
+
+Errors are reported as ``(path, error_name)`` pairs, where the *path*
+is a tuple of keys and indexes leading to the invalid value, and the
+*error_name* is the name of the corresponding exception in
+:mod:`zope.schema.interfaces`.
+
+Only the constraints that can be expressed in the schema are checked:
+types, required values, lengths, bounds, choices, uniqueness, nested
+objects and variants. Like ``Choice.validate``, choices are checked
+against the values of the terms (or their tokens, for values that
+can't be represented in JSON). Values of types the validator doesn't know are
+accepted; keys in the data that aren't in the schema are ignored, as
+are readonly fields.
+
+.. versionadded:: NEXT
+"""
+
+__docformat__ = "restructuredtext en"
+
+#: The ``base_type`` values we can check, and the Python types
+#: JSON decodes them as.
+_BASE_TYPES = {
+    'string': (str,),
+    'int': (int,),
+    'float': (int, float),
+    'bool': (bool,),
+}
+
+_LIST_TYPES = frozenset((
+    'list',
+    'List',
+    'Tuple',
+    'Set',
+    'FrozenSet',
+    'ListOrTuple',
+    'UniqueIterable',
+    'IndexedIterable',
+    'Iterable',
+    'Sequence',
+    'MutableSequence',
+))
+
+_DEFINITIONS_KEY = '$defs'
+_REF_PREFIX = '#/%s/' % _DEFINITIONS_KEY
+
+
+def _noop(_value, _path, _errors):
+    pass
+
+def _is_unique(items):
+    try:
+        return len(set(items)) == len(items)
+    except TypeError:
+        # Lists or dicts
+        seen = []
+        for item in items:
+            if item in seen:
+                return False
+            seen.append(item)
+        return True
+
+
+class _Compiler(object):
+
+    def __init__(self, definitions):
+        self.definitions = definitions or {}
+        self.compiled_definitions = {}
+
+    def compile_object(self, schema):
+        fields = tuple(
+            (name, bool(field.get('required')), self.compile_field(field))
+            for name, field in sorted(schema.items())
+            if name != _DEFINITIONS_KEY and not field.get('readonly')
+        )
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, 'WrongType'))
+                return
+            for name, required, check in fields:
+                field_value = value.get(name)
+                if field_value is None:
+                    if required:
+                        errors.append((path + (name,), 'RequiredMissing'))
+                    continue
+                check(field_value, path + (name,), errors)
+        return check_object
+
+    def compile_reference(self, ref):
+        if not ref.startswith(_REF_PREFIX) or ref[len(_REF_PREFIX):] not in self.definitions:
+            raise ValueError("Unknown reference", ref)
+        name = ref[len(_REF_PREFIX):]
+        compiled = self.compiled_definitions
+        if name not in compiled:
+            # Set first so that recursive references find it
+            compiled[name] = None
+            compiled[name] = self.compile_object(self.definitions[name])
+
+        def check_reference(value, path, errors):
+            # Late bound, for recursive definitions
+            return compiled[name](value, path, errors)
+        return check_reference
+
+    def compile_field(self, field):
+        if field.get('choices') is not None:
+            # The base type of a choice is that of its tokens, which
+            # aren't necessarily its values, so only the values are checked.
+            return self._compile_choices(field['choices'], field.get('choice_values'))
+        check = self._compile_type(field)
+        return check if check is not None else _noop
+
+    def _compile_type(self, field):
+        kind = field.get('type')
+        if 'value_type_options' in field:
+            return self._compile_variant(field['value_type_options'])
+        if 'schema' in field:
+            return self._compile_schema(field['schema'])
+        if kind == 'dict':
+            return self._compile_dict(field)
+        if kind in _LIST_TYPES:
+            return self._compile_list(field)
+        base_types = _BASE_TYPES.get(field.get('base_type'))
+        if base_types is not None:
+            return self._compile_base_type(field, base_types)
+        return None
+
+    def _compile_schema(self, nested):
+        if not isinstance(nested, dict):
+            return None
+        if '$ref' in nested:
+            return self.compile_reference(nested['$ref'])
+        return self.compile_object(nested)
+
+    def _compile_base_type(self, field, types):
+        exclude_bool = bool not in types
+        lower = field.get('min')
+        upper = field.get('max')
+        min_length = field.get('min_length')
+        max_length = field.get('max_length')
+
+        def check_base_type(value, path, errors):
+            if not isinstance(value, types) or (exclude_bool and isinstance(value, bool)):
+                errors.append((path, 'WrongType'))
+            elif lower is not None and value < lower:
+                errors.append((path, 'TooSmall'))
+            elif upper is not None and value > upper:
+                errors.append((path, 'TooBig'))
+            elif min_length and len(value) < min_length:
+                errors.append((path, 'TooShort'))
+            elif max_length is not None and len(value) > max_length:
+                errors.append((path, 'TooLong'))
+        return check_base_type
+
+    def _compile_length(self, field):
+        min_length = field.get('min_length')
+        max_length = field.get('max_length')
+        if not min_length and max_length is None:
+            return None
+
+        def check_length(value, path, errors):
+            if min_length and len(value) < min_length:
+                errors.append((path, 'TooShort'))
+                return False
+            if max_length is not None and len(value) > max_length:
+                errors.append((path, 'TooLong'))
+                return False
+            return True
+        return check_length
+
+    def _compile_list(self, field):
+        check_length = self._compile_length(field)
+        check_item = self.compile_field(field['value_type']) if field.get('value_type') else _noop
+        unique = field.get('unique')
+
+        def check_list(value, path, errors):
+            if not isinstance(value, list):
+                errors.append((path, 'WrongType'))
+                return
+            if check_length is not None and not check_length(value, path, errors):
+                return
+            if unique and not _is_unique(value):
+                errors.append((path, 'NotUnique'))
+                return
+            if check_item is not _noop:
+                for i, item in enumerate(value):
+                    check_item(item, path + (i,), errors)
+        return check_list
+
+    def _compile_dict(self, field):
+        check_length = self._compile_length(field)
+        check_key = self.compile_field(field['key_type']) if field.get('key_type') else _noop
+        check_value = self.compile_field(field['value_type']) if field.get('value_type') else _noop
+
+        def check_dict(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, 'WrongType'))
+                return
+            if check_length is not None and not check_length(value, path, errors):
+                return
+            for k, v in value.items():
+                check_key(k, path + (k,), errors)
+                check_value(v, path + (k,), errors)
+        return check_dict
+
+    def _compile_variant(self, options):
+        checks = tuple(self.compile_field(option) for option in options)
+
+        def check_variant(value, path, errors):
+            for check in checks:
+                option_errors = []
+                check(value, path, option_errors)
+                if not option_errors:
+                    return
+            errors.append((path, 'WrongContainedType'))
+        return check_variant
+
+    def _compile_choices(self, choices, choice_values):
+        # Like ``Choice.validate``, check the values of the terms. Those
+        # of bare tokens are in *choice_values*; when a value can't be
+        # represented in JSON, its token is used instead.
+        values = set(choice_values or ())
+        for choice in choices:
+            if isinstance(choice, dict):
+                value = choice.get('value')
+                values.add(value if isinstance(value, (str, int, float)) else choice.get('token'))
+            elif choice_values is None:
+                values.add(choice)
+        allowed = frozenset(values)
+
+        def check_choice(value, path, errors):
+            try:
+                if value in allowed:
+                    return
+            except TypeError:
+                pass
+            errors.append((path, 'ConstraintNotSatisfied'))
+        return check_choice
+
+
+def compile_validator(schema):
+    """
+    Compile *schema*, a mapping as produced by
+    :meth:`nti.schema.jsonschema.JsonSchemafier.make_schema` (with or
+    without ``definitions``), into a function.
+
+    The function accepts a mapping (as decoded from JSON) and returns a
+    list of ``(path, error_name)`` pairs; the list is empty if the data
+    is valid.
+    """
+    check = _Compiler(schema.get(_DEFINITIONS_KEY)).compile_object(schema)
+
+    def validate(data):
+        errors = []
+        check(data, (), errors)
+        return errors
+    return validate
+
+
+def compile_validator_for_interface(iface, factory=None, **kwargs):
+    """
+    Compile a validator for the JSON schema of the interface *iface*.
+
+    The schema is produced by *factory* (by default,
+    :class:`nti.schema.jsonschema.JsonSchemafier`) called with *iface*
+    and *kwargs*; nested interfaces are emitted as definitions so each
+    is compiled only once. Unlike :func:`compile_validator`, this
+    requires :mod:`zope.interface`, but the validator it returns does
+    not use it.
+    """
+    # pylint:disable-next=import-outside-toplevel
+    from nti.schema.jsonschema import JsonSchemafier
+    factory = factory or JsonSchemafier
+    kwargs.setdefault('definitions', True)
+    return compile_validator(factory(iface, **kwargs).make_schema())
@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+An optional on-disk cache of things this package computes from
+interfaces and classes.
+
+Each process that uses many interfaces computes the same things at
+startup: the fields of interfaces and classes (:func:`nti.schema.schema.schemadict`),
+the methods generated by :func:`nti.schema.eqhash.EqHash`, and
+(when caching is enabled) the templates of
+:class:`nti.schema.jsonschema.JsonSchemafier`. A :class:`PrecompileCache`
+keeps them in a file, so only the first process has to compute them::
+
+  >>> from nti.schema.precompile import install_cache
+  >>> cache = install_cache('/var/cache/myapp/nti.schema.cache') # doctest: +SKIP
+  >>> # ... import, configure and generate schemas ...
+  >>> cache.save() # doctest: +SKIP
+
+Fields are cached by name, so they are always those of the
+interfaces in this process. Entries are keyed by the dotted name of the
+interface or class, the names of the interfaces it provides, and a
+hash of the source of the modules that define them; interfaces and
+classes that can't be found by their dotted name (such as those defined
+in functions) aren't cached. The keys of templates also include the
+names and hashes of the interfaces their fields nest (for example,
+the ``schema`` of an ``Object`` field, including one used as the
+``value_type`` of a collection), and of the interfaces those nest.
+Templates that include the choices of a vocabulary aren't stored:
+vocabularies can change without changing any source, and named
+vocabularies can differ between sites.
+
+.. caution::
+
+   The file is read with :mod:`pickle`, so loading it can run
+   arbitrary code. Only use a file in a location that nothing less
+   trusted than the application itself can write to.
+
+The file is read when the cache is created, but each entry is only
+decoded the first time it is used.
+
+.. versionadded:: NEXT
+"""
+
+import marshal
+import os
+import pickle
+import sys
+from hashlib import blake2b
+
+__docformat__ = "restructuredtext en"
+
+#: Changes when the format of the file or of its entries changes.
+_FORMAT = 3
+
+_SCHEMADICT = 'schemadict'
+_TEMPLATE = 'template'
+_CODE = 'code'
+
+#: Source hashes of modules, by name. Modules aren't expected
+#: to change while the process is running.
+_module_hashes = {}
+
+def _module_hash(name):
+    try:
+        return _module_hashes[name]
+    except KeyError:
+        pass
+    path = getattr(sys.modules.get(name), '__file__', None)
+    digest = None
+    if name in sys.builtin_module_names:
+        # Can only change with Python itself.
+        digest = name.encode('ascii')
+    elif path:
+        try:
+            with open(path, 'rb') as f:
+                digest = blake2b(f.read(), digest_size=16).digest()
+        except OSError: # pragma: no cover
+            pass
+    _module_hashes[name] = digest
+    return digest
+
+def _is_reachable(obj, module_name, qualname):
+    target = sys.modules.get(module_name)
+    for name in qualname.split('.'):
+        target = getattr(target, name, None)
+    return target is obj
+
+def _spec_key(spec):
+    # Return ``(dotted name, hash)`` for an interface or the
+    # specification of what a class implements, or None.
+    cls = getattr(spec, 'inherit', None)
+    if isinstance(cls, type):
+        if not _is_reachable(cls, cls.__module__, cls.__qualname__):
+            return None
+        name = 'implementedBy ' + cls.__module__ + '.' + cls.__qualname__
+        modules = {kind.__module__ for kind in cls.__mro__}
+    else:
+        name = getattr(spec, '__identifier__', None)
+        if not name or not _is_reachable(spec, spec.__module__, spec.__name__):
+            return None
+        modules = set()
+    iro = getattr(spec, '__iro__', ())
+    modules.update(iface.__module__ for iface in iro)
+
+    digest = blake2b(digest_size=16)
+    for iface in iro:
+        digest.update(iface.__identifier__.encode('utf-8'))
+        digest.update(b'\0')
+    for module_name in sorted(modules):
+        module_hash = _module_hash(module_name)
+        if module_hash is None:
+            return None
+        digest.update(module_hash)
+    return name, digest.hexdigest()
+
+def _nested_interfaces(iface):
+    # The interfaces found in the attributes of the fields of *iface*,
+    # or of fields in those attributes (like ``value_type``), and
+    # in turn in those of their fields. This can include interfaces
+    # that aren't actually part of the template.
+    # pylint:disable-next=import-outside-toplevel
+    from zope.interface.interfaces import IInterface
+    # pylint:disable-next=import-outside-toplevel
+    from zope.schema.interfaces import IField
+    found = {iface.__identifier__: iface}
+    pending = [desc for _, desc in iface.namesAndDescriptions(all=True)]
+    while pending:
+        obj = pending.pop()
+        # pylint:disable-next=no-value-for-parameter
+        if not IField.providedBy(obj):
+            continue
+        for value in vars(obj).values():
+            # pylint:disable-next=no-value-for-parameter
+            if IInterface.providedBy(value):
+                if value.__identifier__ not in found:
+                    found[value.__identifier__] = value
+                    pending.extend(desc for _, desc in value.namesAndDescriptions(all=True))
+            else:
+                pending.append(value)
+    del found[iface.__identifier__]
+    return found.values()
+
+def _nested_key(iface):
+    # Return a hash of the keys of the nested interfaces of *iface*,
+    # or None if one of them can't be cached.
+    digest = blake2b(digest_size=16)
+    for nested in sorted(_nested_interfaces(iface), key=lambda i: i.__identifier__):
+        spec_key = _spec_key(nested)
+        if spec_key is None:
+            return None
+        for part in spec_key:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+def _dotted_key(key):
+    # Template cache keys hold classes, which we store by name.
+    result = []
+    for part in key:
+        if isinstance(part, type):
+            if not _is_reachable(part, part.__module__, part.__qualname__):
+                return None
+            part = part.__module__ + '.' + part.__qualname__
+        elif part is not None and not isinstance(part, (str, int, tuple)):
+            return None
+        result.append(part)
+    return tuple(result)
+
+def _has_choices(template):
+    if isinstance(template, dict):
+        if 'choices' in template:
+            return True
+        template = template.values()
+    elif not isinstance(template, list):
+        return False
+    return any(_has_choices(value) for value in template)
+
+
+class PrecompileCache(object):
+    """
+    The cache stored in the file *path*.
+
+    The file is read, if it exists and was written by a compatible
+    version of Python and this package with the same *version*. It is
+    written only when :meth:`save` is called. The file must be trusted
+    (see :mod:`nti.schema.precompile`).
+    """
+
+    #: Whether there are entries that haven't been saved.
+    dirty = False
+
+    def __init__(self, path, version=''):
+        self.path = path
+        self.version = version
+        self._entries = {}
+        self._values = {}
+        self._load()
+
+    def _header(self):
+        return (_FORMAT, sys.implementation.cache_tag, marshal.version, self.version)
+
+    def _load(self):
+        try:
+            f = open(self.path, 'rb') # pylint:disable=consider-using-with
+        except OSError:
+            return
+        with f:
+            data = f.read()
+        try:
+            header, entries = pickle.loads(data)
+        except Exception: # pylint:disable=broad-except
+            # Empty, corrupt, or written by something else.
+            return
+        if header == self._header():
+            self._entries = entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, loads=pickle.loads):
+        """
+        Return the value stored for *key*, or None.
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        data = self._entries.get(key)
+        if data is None:
+            return None
+        value = self._values[key] = loads(data)
+        return value
+
+    def set(self, key, value, dumps=pickle.dumps):
+        """
+        Store *value* for *key*. Values that can't be serialized with
+        *dumps* are ignored.
+        """
+        try:
+            data = dumps(value)
+        except Exception: # pylint:disable=broad-except
+            return
+        self._values[key] = value
+        self._entries[key] = data
+        self.dirty = True
+
+    def clear(self):
+        """
+        Discard all entries. The file isn't changed until :meth:`save`.
+        """
+        self._entries = {}
+        self._values = {}
+        self.dirty = True
+
+    def save(self):
+        """
+        Write the entries to the file, if there are new entries.
+
+        The file is replaced atomically, so processes reading it at the
+        same time see either the old or the new entries.
+        """
+        if not self.dirty:
+            return
+        # pylint:disable-next=import-outside-toplevel
+        import tempfile
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.nti.schema.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((self._header(), self._entries), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.dirty = False
+
+    def get_code(self, source):
+        """
+        Return the code object compiled from *source*.
+        """
+        key = (_CODE, source)
+        code = self.get(key, marshal.loads)
+        if code is None:
+            code = compile(source, '<string>', 'exec')
+            self.set(key, code, marshal.dumps)
+        return code
+
+    def get_schemadict(self, spec):
+        """
+        Return what :func:`nti.schema.schema.schemadict` returns for
+        *spec*, or None if it isn't cached.
+        """
+        spec_key = _spec_key(spec)
+        if spec_key is None:
+            return None
+        names = self.get((_SCHEMADICT,) + spec_key)
+        if names is None:
+            return None
+        iro = spec.__iro__
+        result = {}
+        for name, index in names:
+            attr = iro[index].direct(name) if index < len(iro) else None
+            if attr is None: # pragma: no cover
+                # It changed without changing the source.
+                return None
+            result[name] = attr
+        return result
+
+    def set_schemadict(self, spec, result):
+        """
+        Store the *result* of :func:`nti.schema.schema.schemadict` for *spec*.
+        """
+        spec_key = _spec_key(spec)
+        if spec_key is None:
+            return
+        iro = spec.__iro__
+        names = []
+        for name, attr in result.items():
+            for index, iface in enumerate(iro):
+                if iface.direct(name) is attr:
+                    names.append((name, index))
+                    break
+            else: # pragma: no cover
+                return
+        self.set((_SCHEMADICT,) + spec_key, tuple(names))
+
+    def get_template(self, iface, key):
+        """
+        Return the :meth:`~nti.schema.jsonschema.JsonSchemafier.make_schema_template`
+        of *iface* for the
+        :meth:`~nti.schema.jsonschema.JsonSchemafier.template_cache_key` *key*,
+        or None.
+        """
+        full_key = self._template_key(iface, key)
+        return self.get(full_key) if full_key is not None else None
+
+    def set_template(self, iface, key, template):
+        """
+        Store the *template* of *iface* for *key*, unless it includes
+        the choices of a vocabulary.
+        """
+        full_key = self._template_key(iface, key)
+        if full_key is not None and not _has_choices(template):
+            self.set(full_key, template)
+
+    @staticmethod
+    def _template_key(iface, key):
+        spec_key = _spec_key(iface)
+        key = _dotted_key(key)
+        if spec_key is None or key is None:
+            return None
+        nested_key = _nested_key(iface)
+        if nested_key is None:
+            return None
+        return (_TEMPLATE,) + spec_key + (nested_key,) + key
+
+
+_installed_cache = None
+
+def install_cache(path, version=''):
+    """
+    Create a :class:`PrecompileCache` for *path* and *version*, and use
+    it until :func:`uninstall_cache` is called. Return the cache.
+    """
+    global _installed_cache # pylint:disable=global-statement
+    _installed_cache = PrecompileCache(path, version)
+    return _installed_cache
+
+def uninstall_cache():
+    """
+    Stop using the cache installed by :func:`install_cache`, and
+    return it (or None).
+    """
+    global _installed_cache # pylint:disable=global-statement
+    cache = _installed_cache
+    _installed_cache = None
+    return cache
+
+def get_installed_cache():
+    """
+    Return the cache installed by :func:`install_cache`, or None.
+    """
+    return _installed_cache
+
+def compile_source(source):
+    """
+    Compile the Python *source* for :func:`exec`, using the installed cache
+    if there is one.
+    """
+    cache = _installed_cache
+    if cache is None:
+        return compile(source, '<string>', 'exec')
+    return cache.get_code(source)
+
+try:
+    from zope.testing import cleanup
+except ImportError: # pragma: no cover
+    pass
+else:
+    cleanup.addCleanUp(uninstall_cache)
+    del cleanup
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Filling the caches of this package before forking worker processes.
+
+Most of what this package computes from interfaces and classes is
+computed when first needed and cached. In a server that forks worker
+processes, each worker would compute (and store) its own copy. Calling
+:func:`warmup` in the parent process computes them once, before
+forking, so the workers share them::
+
+  >>> from nti.schema import warmup
+  >>> report = warmup([IMyContent, MyContent]) # doctest: +SKIP
+
+To share as much memory as possible, follow the usual pattern for
+:func:`gc.freeze`: call :func:`gc.disable` early in the parent
+process, call :func:`warmup` (or :func:`gc.freeze`) right before
+forking, and call :func:`gc.enable` early in each worker.
+
+.. versionadded:: NEXT
+"""
+
+import gc
+import time
+
+from zope.interface import implementedBy
+from zope.interface.interfaces import IInterface
+from zope.schema.interfaces import IChoice
+from zope.schema.interfaces import IField
+from zope.schema.interfaces import IObject
+
+from nti.schema.interfaces import apply_interface_patches
+from nti.schema.jsonschema import JsonSchemafier
+from nti.schema.jsonschema import get_json_from_choice_field
+from nti.schema.schema import SchemaConfigured
+from nti.schema.schema import schemadict
+from nti.schema.vocabulary import named_membership_snapshot
+
+__docformat__ = "restructuredtext en"
+
+
+class WarmupReport(object):
+    """
+    What :func:`warmup` computed.
+    """
+
+    #: The number of interfaces whose fields were computed.
+    interfaces = 0
+    #: The number of classes whose fields were computed.
+    classes = 0
+    #: The number of :class:`~nti.schema.schema.SchemaConfigured`
+    #: classes prepared.
+    schema_configured = 0
+    #: The number of fields found.
+    fields = 0
+    #: The number of JSON schema templates computed.
+    templates = 0
+    #: The number of named vocabularies whose choices were exported.
+    vocabularies = 0
+    #: The number of objects moved to the permanent generation by
+    #: :func:`gc.freeze`, or None if that wasn't done.
+    frozen = None
+    #: How long it took, in seconds.
+    duration = 0.0
+
+    def __str__(self):
+        return (
+            "Warmed up %d interfaces, %d classes (%d SchemaConfigured) with %d fields, "
+            "%d JSON schema templates and %d vocabularies in %.3fs; froze %s objects" % (
+                self.interfaces, self.classes, self.schema_configured, self.fields,
+                self.templates, self.vocabularies, self.duration,
+                self.frozen if self.frozen is not None else 'no'
+            )
+        )
+
+
+class _Warmer(object):
+
+    def __init__(self, json_schemas, json_schema_kwargs):
+        self.json_schemas = json_schemas
+        self.json_schema_kwargs = json_schema_kwargs or {}
+        self.report = WarmupReport()
+        self.seen = set()
+        self.vocabulary_names = set()
+
+    def interface(self, iface):
+        if iface in self.seen:
+            return
+        self.seen.add(iface)
+        self.report.interfaces += 1
+        self.fields(schemadict(iface))
+        if self.json_schemas:
+            schemafier = JsonSchemafier(iface, cache=True, **self.json_schema_kwargs)
+            try:
+                schemafier.make_schema_template()
+            except LookupError:
+                # A vocabulary that isn't registered (yet)
+                return
+            self.report.templates += 1
+
+    def klass(self, cls):
+        if cls in self.seen:
+            return
+        self.seen.add(cls)
+        self.report.classes += 1
+        if issubclass(cls, SchemaConfigured):
+            self.report.schema_configured += 1
+            fields = cls.sc_warmup()
+        else:
+            fields = schemadict(implementedBy(cls))
+        self.fields(fields)
+        for iface in implementedBy(cls):
+            self.interface(iface)
+
+    def fields(self, fields):
+        self.report.fields += len(fields)
+        for field in fields.values():
+            self.field(field)
+
+    def field(self, field):
+        # pylint:disable=no-value-for-parameter
+        if IChoice.providedBy(field) and isinstance(field.vocabularyName, str):
+            self.vocabulary(field)
+        elif IObject.providedBy(field):
+            self.interface(field.schema)
+        # The fields of collections and mappings
+        for name in ('key_type', 'value_type'):
+            nested = getattr(field, name, None)
+            if IField.providedBy(nested):
+                self.field(nested)
+
+    def vocabulary(self, field):
+        name = field.vocabularyName
+        if name in self.vocabulary_names:
+            return
+        self.vocabulary_names.add(name)
+        try:
+            get_json_from_choice_field(field)
+        except LookupError:
+            # Not registered (yet)
+            return
+        self.report.vocabularies += 1
+        named_membership_snapshot(name)
+        vocabulary = field.bind(None).vocabulary
+        build_indexes = getattr(vocabulary, 'build_indexes', None)
+        if build_indexes is not None:
+            build_indexes()
+
+
+def warmup(interfaces_or_classes, json_schemas=True, json_schema_kwargs=None,
+           freeze=True, collect=False):
+    """
+    Compute and cache what this package needs for each of the
+    *interfaces_or_classes*, and return a :class:`WarmupReport`.
+
+    - The fields of each interface and class
+      (:func:`nti.schema.schema.schemadict`), and what
+      :class:`nti.schema.schema.SchemaConfigured` subclasses need (see
+      :meth:`~nti.schema.schema.SchemaConfigured.sc_warmup`).
+    - For each class, the same things for the interfaces it implements.
+    - For each field using a named vocabulary, the exported choices
+      (:func:`nti.schema.jsonschema.get_data_from_choice_field`), the
+      membership snapshot (:func:`nti.schema.vocabulary.named_membership_snapshot`)
+      and the indexes of the vocabulary. Vocabularies are found in the
+      current site; those that aren't registered are skipped.
+    - For each interface, and each interface used by an ``Object`` field
+      (including as the ``value_type`` or ``key_type`` of another
+      field), the template of a :class:`~nti.schema.jsonschema.JsonSchemafier`
+      created with ``cache=True`` and *json_schema_kwargs*, unless
+      *json_schemas* is false. Templates that use vocabularies that
+      aren't registered are skipped.
+
+    Only those templates are computed: schemafiers created with other
+    arguments, without ``cache=True``, or of subclasses that don't use
+    templates still compute their schemas in each worker. Interfaces
+    and vocabularies that are only reached some other way (for example,
+    through a ``Variant`` field, or a vocabulary given as an object
+    rather than by name) aren't warmed up either.
+
+    The changes :mod:`nti.schema.interfaces` makes to
+    :mod:`zope.schema` are applied first (see
+    :func:`nti.schema.interfaces.apply_interface_patches`).
+
+    If *freeze* is true, :func:`gc.freeze` is called (if it exists)
+    at the end, so that the garbage collector doesn't touch (and make
+    private copies of the memory of) the objects that exist now. Only
+    if *collect* is also true is a full collection done first; that
+    frees garbage, but leaves holes in memory pages that are then
+    filled, and copied, by the workers. (If more objects are created
+    between calling this and forking, call :func:`gc.freeze` again.)
+    """
+    start = time.perf_counter()
+    apply_interface_patches()
+    warmer = _Warmer(json_schemas, json_schema_kwargs)
+    for obj in interfaces_or_classes:
+        # pylint:disable-next=no-value-for-parameter
+        if IInterface.providedBy(obj):
+            warmer.interface(obj)
+        else:
+            warmer.klass(obj)
+
+    report = warmer.report
+    if freeze and hasattr(gc, 'freeze'):
+        if collect:
+            gc.collect()
+        before = gc.get_freeze_count()
+        gc.freeze()
+        report.frozen = gc.get_freeze_count() - before
+    report.duration = time.perf_counter() - start
+    return report
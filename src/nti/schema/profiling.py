@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Profiling the time spent in each field.
+
+:func:`profile` (also available as ``nti.schema.profile``) uses the
+hooks of :mod:`nti.schema.instrumentation` to record the time spent in
+each field, and in the fields called from it, while it is active::
+
+  >>> from nti.schema import profile
+  >>> from nti.schema.field import Int
+  >>> from nti.schema.field import ValidTextLine
+  >>> from nti.schema.field import Variant
+  >>> field = Variant((Int(), ValidTextLine()), __name__='id')
+  >>> with profile() as profiler:
+  ...     _ = field.fromObject(u'abc')
+  >>> print(profiler.format_tree(unit='calls'))
+  1 calls from_object:id(Variant)
+    1 calls convert:id(Int) (1 failed)
+    1 calls convert:id(ValidTextLine)
+      1 calls validate:id(ValidTextLine)
+
+Each frame is the operation (see :mod:`nti.schema.instrumentation`)
+and the field: the interface and name of the field, or its name or
+class when it isn't part of an interface, followed by its class. Fields that a
+:class:`~nti.schema.field.Variant` tried and that failed are included,
+with the number of failures.
+
+:meth:`Profiler.collapsed` produces the "collapsed stack" format used
+by flame graph tools such as ``flamegraph.pl`` and speedscope. It can be
+used around a ``pytest-benchmark`` run (or any other code)::
+
+  def test_parse(benchmark):
+      with profile() as profiler:
+          benchmark(parse_request)
+      profiler.write_collapsed('parse.folded')
+
+.. versionadded:: NEXT
+"""
+
+import threading
+from time import perf_counter
+
+from nti.schema.instrumentation import Recorder
+from nti.schema.instrumentation import _field_label
+from nti.schema.instrumentation import enable_instrumentation
+from nti.schema.instrumentation import disable_instrumentation
+from nti.schema.instrumentation import get_recorder
+
+__docformat__ = "restructuredtext en"
+
+
+def _frame_name(operation, field):
+    if isinstance(field, str):
+        name = '%s:%s' % (operation, field)
+    else:
+        label = _field_label(field)
+        kind = type(field).__name__
+        # The alternatives of a Variant have its name.
+        name = ('%s:%s' % (operation, label)
+                if label == kind
+                else '%s:%s(%s)' % (operation, label, kind))
+    # ';' separates frames in the collapsed format, and the
+    # count follows the last space.
+    return name.replace(';', ',').replace(' ', '_')
+
+
+class Profiler(Recorder):
+    """
+    A :class:`~nti.schema.instrumentation.Recorder` that also records
+    the stack of operations each one happened in.
+
+    The statistics of :class:`~nti.schema.instrumentation.Recorder`
+    are available as well. Each thread has its own stack.
+    """
+
+    def __init__(self):
+        Recorder.__init__(self)
+        self._paths = {}
+        self._local = threading.local()
+        self._previous = None
+
+    def call(self, operation, field, func, *args):
+        try:
+            stack = self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+        path = (stack[-1] if stack else ()) + (_frame_name(operation, field),)
+        stack.append(path)
+        failed = True
+        start = perf_counter()
+        try:
+            result = func(*args)
+            failed = False
+        finally:
+            seconds = perf_counter() - start
+            stack.pop()
+            self.record(operation, field, seconds, failed)
+            stats = self._paths.get(path)
+            if stats is None:
+                stats = self._paths[path] = [0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += seconds
+            if failed:
+                stats[2] += 1
+        return result
+
+    def reset(self):
+        Recorder.reset(self)
+        self._paths = {}
+
+    def __enter__(self):
+        self._previous = get_recorder()
+        enable_instrumentation(self)
+        return self
+
+    def __exit__(self, t, v, tb):
+        if self._previous is not None:
+            enable_instrumentation(self._previous)
+        else:
+            disable_instrumentation()
+        self._previous = None
+
+    def paths(self):
+        """
+        Return a new dictionary ``{(frame, ...): {'count': int,
+        'seconds': float, 'failures': int}}``. The time of each path
+        includes the time of the paths below it.
+        """
+        return {
+            path: {'count': count, 'seconds': seconds, 'failures': failures}
+            for path, (count, seconds, failures) in list(self._paths.items())
+        }
+
+    def _self_times(self):
+        paths = dict(self._paths)
+        result = {path: stats[1] for path, stats in paths.items()}
+        for path, stats in paths.items():
+            parent = path[:-1]
+            if parent in result:
+                result[parent] -= stats[1]
+        return result
+
+    def collapsed(self, scale=1e6):
+        """
+        Return the time spent in each stack, not counting the stacks
+        below it, in the collapsed stack format: one line per stack,
+        with the frames separated by ``;``, followed by a space and
+        the time, multiplied by *scale* (by default, in microseconds)
+        and rounded. Stacks that round to 0 are omitted.
+        """
+        lines = []
+        for path, seconds in sorted(self._self_times().items()):
+            value = int(round(max(seconds, 0.0) * scale))
+            if value:
+                lines.append('%s %d' % (';'.join(path), value))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_collapsed(self, path, scale=1e6):
+        """
+        Write :meth:`collapsed` to the file named *path*.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed(scale))
+
+    def format_tree(self, unit='ms'):
+        """
+        Return a text tree of the stacks, one line per stack, indented
+        below the stack it was called from, with its number of calls
+        and failures.
+
+        The lines begin with the total time in *unit* (``'s'``,
+        ``'ms'`` or ``'us'``), or with just the number of calls if
+        *unit* is ``'calls'``.
+        """
+        scale = {'s': 1.0, 'ms': 1e3, 'us': 1e6, 'calls': None}[unit]
+        lines = []
+        for path, (count, seconds, failures) in sorted(self._paths.items()):
+            line = '  ' * (len(path) - 1)
+            if scale is not None:
+                line += '%.3f%s ' % (seconds * scale, unit)
+            line += '%d calls %s' % (count, path[-1])
+            if failures:
+                line += ' (%d failed)' % (failures,)
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.format_tree()
+
+
+def profile():
+    """
+    Return a new :class:`Profiler`, to be used as a context manager.
+
+    While it is active, it replaces any recorder that was enabled with
+    :func:`nti.schema.instrumentation.enable_instrumentation`; that
+    recorder is restored (and records nothing in the meantime).
+    """
+    return Profiler()
@@ -19,7 +19,9 @@ from zope.interface import implementer
 from zope.schema.interfaces import IValidatable
 from zope.schema.fieldproperty import FieldProperty
 
+from .instrumentation import get_recorder as _get_recorder
 from .interfaces import ISchemaConfigured
+from .precompile import get_installed_cache
 
 __docformat__ = "restructuredtext en"
 
@@ -61,6 +63,9 @@ def schemadict(spec):
     .. versionchanged:: 1.15.0
        Added caching and re-implemented the schemadict algorithm for speed.
        The return value must now be treated as immutable.
+
+    .. versionchanged:: NEXT
+       Use the :mod:`nti.schema.precompile` cache, if one is installed.
     """
     try:
         cache_in = spec._v_attrs # pylint:disable=protected-access
@@ -77,6 +82,29 @@ def schemadict(spec):
         except KeyError:
             pass
 
+    result = _precompiled_schemadict(spec)
+
+    # If we have somewhere to stick a cache, do so.
+    # Note that we don't look up _v_attrs again, just in case it changed
+    # concurrently.
+    try:
+        cache_in['__nti_schema_schemadict'] = result
+    except NameError:
+        pass
+    return result
+
+def _precompiled_schemadict(spec):
+    # Use the nti.schema.precompile cache, if one is installed.
+    precompiled = get_installed_cache()
+    if precompiled is None:
+        return _compute_schemadict(spec)
+    result = precompiled.get_schemadict(spec)
+    if result is None:
+        result = _compute_schemadict(spec)
+        precompiled.set_schemadict(spec, result)
+    return result
+
+def _compute_schemadict(spec):
     # ``zope.schema.getFields`` and ``getFieldsInOrder`` deal with a
     # single interface, only. So in the past, we handled the latter
     # two cases (which are the most common cases, especially the
@@ -109,21 +137,16 @@ def schemadict(spec):
             # pylint:disable=no-value-for-parameter
             if name not in result and is_field(attr)
         )
-
-    # If we have somewhere to stick a cache, do so.
-    # Note that we don't look up _v_attrs again, just in case it changed
-    # concurrently.
-    try:
-        cache_in['__nti_schema_schemadict'] = result
-    except NameError:
-        pass
-
     return result
 
 
 
 _marker = object()
 
+#: The :class:`nti.schema.instrumentation.Recorder` in use, if any.
+#: Maintained by :mod:`nti.schema.instrumentation`.
+_recorder = _get_recorder()
+
 
 @implementer(ISchemaConfigured)
 class SchemaConfigured(object):
@@ -150,6 +173,14 @@ class SchemaConfigured(object):
     SC_OPTIMIZE_FIELD_PROPERTY = True
 
     def __init__(self, **kw):
+        if _recorder is not None:
+            cls = type(self)
+            _recorder.call('init', cls.__module__ + '.' + cls.__qualname__,
+                           self.__configure, kw)
+        else:
+            self.__configure(kw)
+
+    def __configure(self, kw):
         schema = schemadict(self.sc_schema_spec())
         for k, v in kw.items():
             # might want to control this check
@@ -223,6 +254,23 @@ class SchemaConfigured(object):
             except AttributeError: # pragma: no cover
                 pass
 
+    @classmethod
+    def sc_warmup(cls):
+        """
+        Compute and cache what creating instances of this class needs,
+        as creating the first instance would. Returns the schema
+        (a dictionary that must not be modified).
+
+        The schema is found using :meth:`sc_schema_spec` of an
+        instance of this class that hasn't been initialized.
+
+        .. versionadded:: NEXT
+        """
+        schema = schemadict(cls.__new__(cls).sc_schema_spec())
+        if cls.SC_OPTIMIZE_FIELD_PROPERTY:
+            cls.__elide_fieldproperty(schema)
+        return schema
+
     # provide control over which interfaces define the data schema
     SC_SCHEMAS = None
 
@@ -11,7 +11,17 @@ from __future__ import print_function
 from zope.component import adapter
 from zope.component import handle
 
+from zope.interface.interfaces import IRegistrationEvent
+from zope.interface.interfaces import IUtilityRegistration
+
+from zope.schema.interfaces import IVocabularyFactory
+
+from nti.i18n.locales.interfaces import ICountryAvailability
+
 from nti.schema.interfaces import IBeforeSchemaFieldAssignedEvent
+from nti.schema.jsonschema import vocabularies_changed
+from nti.schema.vocabulary import country_vocabularies_changed
+from nti.schema.vocabulary import vocabulary_snapshots_changed
 
 __docformat__ = "restructuredtext en"
 
@@ -30,3 +40,33 @@ def before_object_assigned_event_dispatcher(event):
     :func:`zope.component.event.objectEventNotify`
     """
     handle(event.object, event.context, event)
+
+
+@adapter(IUtilityRegistration, IRegistrationEvent)
+def vocabulary_factory_registration_changed(registration, _event):
+    """
+    Listens for :class:`~zope.schema.interfaces.IVocabularyFactory`
+    utilities being registered or unregistered and discards the
+    vocabulary choices cached by :mod:`nti.schema.jsonschema` and
+    the membership snapshots cached by :mod:`nti.schema.vocabulary`.
+
+    .. versionadded:: NEXT
+    """
+    if registration.provided.isOrExtends(IVocabularyFactory):
+        vocabularies_changed()
+        vocabulary_snapshots_changed()
+
+
+@adapter(IUtilityRegistration, IRegistrationEvent)
+def country_availability_registration_changed(registration, _event):
+    """
+    Listens for :class:`~nti.i18n.locales.interfaces.ICountryAvailability`
+    utilities being registered or unregistered and discards the
+    country vocabularies (and the choices and snapshots made from them).
+
+    .. versionadded:: NEXT
+    """
+    if registration.provided.isOrExtends(ICountryAvailability):
+        country_vocabularies_changed()
+        vocabularies_changed()
+        vocabulary_snapshots_changed()
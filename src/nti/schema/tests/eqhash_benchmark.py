@@ -155,6 +155,25 @@ def bench_eq(): # pragma: no cover
 # Avg Super2  eq 0.208957354228 stddev 0.00508863378261
 # Avg many  eq 0.797417243322 stddev 0.0198358058579
 
+## Hashing (python -m timeit 'hash(thing)', best of 5)
+# Before: closure over attrgetter, checking include_super each call
+# Base  hash 337 nsec
+# Child hash 730 nsec
+# Super  hash 645 nsec
+# Type  hash 404 nsec
+# Super2  hash 2.39 usec
+# Many  hash 534 nsec
+
+# Code generation
+# Base  hash 336 nsec
+# Child hash 484 nsec
+# Super  hash 475 nsec
+# Type  hash 390 nsec
+# Super2  hash 2.1 usec
+# Many  hash 410 nsec
+
+# See also benchmarks/bench_eqhash.py, which uses pyperf.
+
 if __name__ == '__main__':
     import sys
     if '--timehash' in sys.argv:
@@ -19,6 +19,10 @@ from hamcrest import assert_that
 from hamcrest import calling
 from hamcrest import is_
 from hamcrest import is_not
+from hamcrest import contains_exactly
+from hamcrest import has_length
+from hamcrest import none
+from hamcrest import same_instance
 from hamcrest import raises
 
 __docformat__ = "restructuredtext en"
@@ -67,6 +71,27 @@ class ManyThing(object):
     e = 'e'
     f = 'f'
 
+@EqHash('a')
+class SingleThing(object):
+    a = 'a'
+
+@EqHash('a', superhash=True)
+class SingleThing2(object):
+    a = 'a'
+
+@EqHash('a', 'b', ordering=True)
+class OrderedThing(object):
+
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+
+@EqHash('a', ordering=True, include_type=True)
+class OrderedTypeThing(object):
+
+    def __init__(self, a):
+        self.a = a
+
 class TestEqHash(unittest.TestCase):
 
     def test_eq_hash(self):
@@ -131,6 +156,27 @@ class TestEqHash(unittest.TestCase):
         assert_that(hash(thing_superhash2), is_(hash(thing_superhash)))
 
 
+    def test_eq_hash_single_name(self):
+        # A single name hashes the bare value, with or without superhash.
+        assert_that(hash(SingleThing()), is_(hash(('a',)) ^ hash('a')))
+        assert_that(hash(SingleThing2()), is_(hash(SingleThing())))
+
+        # A single unhashable value is superhashed as a whole, not
+        # treated as the tuple of values.
+        thing1 = SingleThing2()
+        thing1.a = [1, 2]
+        thing2 = SingleThing2()
+        thing2.a = [1, 2]
+        assert_that(hash(thing1), is_(hash(thing2)))
+        assert_that(hash(thing1), is_(hash(('a',)) ^ hash((1, 2))))
+
+        thing2.a = [2, 1]
+        assert_that(hash(thing1), is_not(hash(thing2)))
+
+    def test_eq_hash_type(self):
+        assert_that(hash(NotThing()), is_not(hash(Thing())))
+        assert_that(hash(NotThing()), is_(hash(NotThing())))
+
     def test_eq_hash_classes(self):
         # Default doesn't include classes
 
@@ -174,8 +220,47 @@ class TestEqHash(unittest.TestCase):
         assert_that(thing1, is_not(thing2))
         assert_that(hash(thing1), is_not(hash(thing2)))
 
+    def test_ordering(self):
+        # pylint:disable=no-member
+        import bisect
+        things = [OrderedThing(2, 1), OrderedThing(1, 2), OrderedThing(1, 1)]
+        sorted_things = sorted(things)
+        assert_that([(t.a, t.b) for t in sorted_things],
+                    is_([(1, 1), (1, 2), (2, 1)]))
+        assert_that(sorted(things, key=OrderedThing.sort_key()),
+                    is_(sorted_things))
+
+        one = OrderedThing(1, 1)
+        two = OrderedThing(1, 2)
+        assert_that(one < two, is_(True))
+        assert_that(one <= two, is_(True))
+        assert_that(one <= OrderedThing(1, 1), is_(True))
+        assert_that(two > one, is_(True))
+        assert_that(two >= one, is_(True))
+        assert_that(one > two, is_(False))
+
+        keys = [OrderedThing.sort_key()(t) for t in sorted_things]
+        assert_that(bisect.bisect(keys, (1, 2)), is_(2))
+        assert_that(bisect.bisect(sorted_things, two), is_(2))
+
+        # Missing attributes mean we can't compare
+        assert_that(OrderedThing.__lt__(one, self), is_(NotImplemented))
+        assert_that(calling(lambda: one < self), raises(TypeError))
+
+    def test_ordering_type(self):
+        # pylint:disable=no-member
+        assert_that(OrderedTypeThing(1) < OrderedTypeThing(2), is_(True))
+        assert_that(OrderedTypeThing(1) >= OrderedTypeThing(2), is_(False))
+        assert_that(OrderedTypeThing.sort_key()(OrderedTypeThing(3)), is_(3))
+        assert_that(OrderedTypeThing.__lt__(OrderedTypeThing(1), OrderedThing(1, 2)),
+                    is_(NotImplemented))
+
     def test_bad_construct(self):
         assert_that(calling(EqHash), raises(TypeError, "Asking to hash"))
+        assert_that(calling(EqHash).with_args('a', include_super=True, ordering=True),
+                    raises(TypeError, "Ordering requires"))
+        assert_that(calling(EqHash).with_args(include_type=True, ordering=True),
+                    raises(TypeError, "Ordering requires"))
         assert_that(calling(EqHash).with_args(foo=True),
                     raises(TypeError, "Unexpected keyword"))
 
@@ -217,6 +302,276 @@ class TestSuperHash(unittest.TestCase):
                     is_(hash(t)))
 
 
+class TestSuperHashIterative(unittest.TestCase):
+
+    def test_deeply_nested(self):
+        import sys
+        from ..eqhash import _superhash
+        value = []
+        current = value
+        for i in range(sys.getrecursionlimit() * 2):
+            nested = [i]
+            current.append(nested)
+            current = nested
+
+        result = _superhash(value)
+        assert_that(result, is_(tuple))
+        assert_that(hash(result), is_(hash(_superhash(value))))
+
+    def test_recursive_value(self):
+        from ..eqhash import _superhash
+        value = [1]
+        value.append({'key': value})
+        assert_that(calling(_superhash).with_args(value),
+                    raises(ValueError, "recursive"))
+
+    def test_not_iterable(self):
+        from ..eqhash import _superhash_force
+        assert_that(calling(_superhash_force).with_args(object()),
+                    raises(TypeError))
+
+
+class TestSuperHashMemo(unittest.TestCase):
+
+    def test_memo_reuses_results(self):
+        from ..eqhash import SuperhashMemo
+        from ..eqhash import superhash_memo
+        from ..eqhash import _superhash
+
+        blob = {'key': [1, 2, {'nested': [3]}], 'other': 4}
+        expected = _superhash(blob)
+
+        memo = SuperhashMemo()
+        with superhash_memo(memo) as active:
+            assert_that(active, is_(memo))
+            first = _superhash(blob)
+            assert_that(first, is_(expected))
+            assert_that(hash(first), is_(hash(expected)))
+            assert_that(_superhash(blob), is_(same_instance(first)))
+
+        # Outside the block, the memo isn't used, but can be passed
+        assert_that(_superhash(blob), is_not(same_instance(first)))
+        assert_that(_superhash(blob, memo), is_(same_instance(first)))
+
+        # Changing the length invalidates
+        blob['third'] = 5
+        assert_that(_superhash(blob, memo), is_not(same_instance(first)))
+        assert_that(_superhash(blob, memo), is_(_superhash(blob)))
+
+        memo.clear()
+        assert_that(memo, has_length(0))
+
+    def test_memo_eqhash(self):
+        from ..eqhash import superhash_memo
+        thing = Thing2(a={'key': [1, 2]}, b=[3])
+        expected = hash(thing)
+        with superhash_memo() as memo:
+            assert_that(hash(thing), is_(expected))
+            assert_that(hash(thing), is_(expected))
+            # The dict, the list in the dict, and b
+            assert_that(memo, has_length(3))
+
+    def test_memo_no_len(self):
+        from ..eqhash import SuperhashMemo
+        from ..eqhash import _superhash
+
+        class Unhashable(object):
+            __hash__ = None
+            def __iter__(self):
+                return iter([[1], [2]])
+
+        value = Unhashable()
+        memo = SuperhashMemo()
+        result = _superhash(value, memo)
+        assert_that(result, is_(((1,), (2,))))
+        # The lists were memoized, but not the value itself
+        assert_that(memo, has_length(2))
+        assert_that(memo.get(value), is_(none()))
+
+class TestContentDigest(unittest.TestCase):
+
+    def _digest(self, obj, **kwargs):
+        from ..eqhash import content_digest
+        return content_digest(obj, **kwargs)
+
+    def test_equal_objects(self):
+        assert_that(self._digest(Thing()), is_(self._digest(Thing())))
+        # Just like equality, the class doesn't matter
+        assert_that(self._digest(Thing()), is_(self._digest(Thing2())))
+        # Unless we ask for it
+        assert_that(self._digest(NotThing()), is_not(self._digest(Thing())))
+
+        thing = Thing()
+        thing.b = 'B'
+        assert_that(self._digest(thing), is_not(self._digest(Thing())))
+
+        assert_that(self._digest(Thing(), digest_size=32), has_length(32))
+
+    def test_values(self):
+        import datetime
+        import decimal
+        import math
+
+        def check_same(a, b):
+            assert_that(self._digest(Thing2(a=a)), is_(self._digest(Thing2(a=b))))
+
+        def check_different(a, b):
+            assert_that(self._digest(Thing2(a=a)), is_not(self._digest(Thing2(a=b))))
+
+        check_same(1, 1.0)
+        check_same(True, 1)
+        check_same(b'abc', bytearray(b'abc'))
+        check_same({'a': 1, 'b': [2]}, {'b': [2], 'a': 1})
+        check_same({1, 'a', 2.5}, frozenset([2.5, 'a', 1]))
+        check_same(datetime.date(2020, 1, 2), datetime.date(2020, 1, 2))
+        check_same(decimal.Decimal('1.5'), decimal.Decimal('1.5'))
+
+        class MyStr(str):
+            pass
+        check_same(MyStr('abc'), 'abc')
+
+        # Equal numbers
+        D = decimal.Decimal
+        check_same(D('1.0'), D('1'))
+        check_same(D('1'), 1)
+        check_same(D('100'), D('1E+2'))
+        check_same(D('1.50'), 1.5)
+        check_same(D('0.10'), D('0.1'))
+        check_same(D('-0.10'), D('-0.100'))
+        check_same(D('Infinity'), math.inf)
+        check_different(D('0.1'), 0.1)
+        check_different(D('0.1'), D('0.01'))
+        check_different(D('0.1'), D('-0.1'))
+        check_different(D('0.1'), D('NaN'))
+
+        # The same instants
+        utc = datetime.timezone.utc
+        est = datetime.timezone(datetime.timedelta(hours=-5))
+        check_same(datetime.datetime(2020, 1, 2, 12, tzinfo=utc),
+                   datetime.datetime(2020, 1, 2, 7, tzinfo=est))
+        check_different(datetime.datetime(2020, 1, 2, 12, tzinfo=utc),
+                        datetime.datetime(2020, 1, 2, 12))
+        check_different(datetime.datetime(2020, 1, 2), datetime.date(2020, 1, 2))
+        check_same(datetime.time(12, tzinfo=utc), datetime.time(7, tzinfo=est))
+        check_different(datetime.time(12, tzinfo=utc), datetime.time(12))
+        check_different(datetime.time(23, tzinfo=est), datetime.time(4, tzinfo=utc))
+
+        check_different(1, 1.5)
+        check_different(1.5, 2.5)
+        check_different('abc', b'abc')
+        check_different([1, 2], (1, 2))
+        check_different([1, 2], [2, 1])
+        check_different([[1], 2], [1, [2]])
+        check_different(None, 'None')
+        check_different({'a': 1}, {'a': 2})
+        check_different(datetime.timedelta(1), datetime.timedelta(2))
+
+    def test_nested_and_super(self):
+        outer = Thing2(a=Thing(), b=[ChildThing()])
+        outer2 = Thing2(a=Thing(), b=[ChildThing()])
+        assert_that(self._digest(outer), is_(self._digest(outer2)))
+        outer2.b[0].a = 'A'
+        assert_that(self._digest(outer), is_not(self._digest(outer2)))
+
+        child = ChildThing()
+        assert_that(self._digest(child), is_not(self._digest(ChildThingNoSuper())))
+        child.a = 'A'
+        assert_that(self._digest(child), is_not(self._digest(ChildThing())))
+        # Undecorated subclasses use the parent's names
+        class SubThing(Thing):
+            pass
+        assert_that(self._digest(SubThing()), is_(self._digest(Thing())))
+        # No names, only super
+        assert_that(self._digest(ChildThingNoNames()), is_(self._digest(ChildThingNoNames())))
+
+    def test_deeply_nested(self):
+        import sys
+        value = []
+        current = value
+        for _ in range(sys.getrecursionlimit() * 2):
+            nested = []
+            current.append(nested)
+            current = nested
+        assert_that(self._digest(Thing2(a=value)), has_length(16))
+
+    def test_bad_values(self):
+        from ..eqhash import content_digest
+        assert_that(calling(content_digest).with_args(object()),
+                    raises(TypeError, "Not an EqHash"))
+        assert_that(calling(content_digest).with_args(Thing2(a=object())),
+                    raises(TypeError, "Cannot digest"))
+        value = [1]
+        value.append(value)
+        assert_that(calling(content_digest).with_args(Thing2(a=value)),
+                    raises(ValueError, "recursive"))
+
+class TestBulk(unittest.TestCase):
+
+    def test_unique_same_class(self):
+        from ..eqhash import unique
+        things = [OrderedThing(i % 3, 1) for i in range(10)]
+        result = unique(things)
+        assert_that(result, has_length(3))
+        assert_that(result[0], is_(same_instance(things[0])))
+        assert_that([t.a for t in result], is_([0, 1, 2]))
+        assert_that(unique(iter(things)), is_(result))
+        assert_that(unique([]), is_([]))
+
+    def test_unique_mixed(self):
+        from ..eqhash import unique
+        thing = Thing()
+        thing2 = Thing2()
+        not_thing = NotThing()
+        # Equal without include_type
+        assert_that(unique([thing, thing2]), is_([thing]))
+        assert_that(unique([not_thing, thing, NotThing()]),
+                    contains_exactly(same_instance(not_thing), same_instance(thing)))
+        # Super is included
+        child = ChildThing()
+        child2 = ChildThing()
+        child2.a = 'A'
+        assert_that(unique([child, ChildThing(), child2]), has_length(2))
+        assert_that(unique([ChildThingNoNames(), ChildThingNoNames()]), has_length(1))
+        # Non-EqHash objects use their own equality
+        assert_that(unique([1, thing, 1.0, 'a', thing2]), is_([1, thing, 'a']))
+
+    def test_unique_superhash(self):
+        from ..eqhash import unique
+        things = [Thing2(a=[1, 2]), Thing2(a=[1, 2]), Thing2(a={'k': [3]})]
+        assert_that(unique(things), has_length(2))
+
+    def test_unique_include_super_not_eqhash(self):
+        from ..eqhash import unique
+
+        class Base(object):
+            pass
+
+        @EqHash('a', include_super=True)
+        class Child(Base):
+            a = 1
+
+        one = Child()
+        # object.__eq__ is identity, so these aren't equal
+        assert_that(one, is_not(Child()))
+        assert_that(unique([one, Child(), one]), has_length(2))
+
+    def test_group_by_identity(self):
+        from ..eqhash import group_by_identity
+
+        @EqHash('a')
+        class AThing(object):
+            def __init__(self, a, b):
+                self.a = a
+                self.b = b
+
+        things = [AThing(i % 3, i) for i in range(7)]
+        groups = group_by_identity(things)
+        assert_that([[t.b for t in group] for group in groups],
+                    is_([[0, 3, 6], [1, 4], [2, 5]]))
+
+        groups = group_by_identity([Thing2(a=[1]), Thing2(a=[1]), Thing2(a=[2])])
+        assert_that([len(group) for group in groups], is_([2, 1]))
+
 def test_suite():
     import doctest
     suite = unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -431,6 +431,24 @@ class TestConfiguredVariant(unittest.TestCase):
         assert_that(events, has_length(1))
         assert_that(events, contains(has_property('object', {'k': 'v'})))
 
+class TestConfiguredValidChoice(unittest.TestCase):
+
+    layer = SchemaLayer
+
+    def test_set_notifies(self):
+        from nti.schema.field import ValidChoice
+        from nti.schema.interfaces import IBeforeSchemaFieldAssignedEvent
+        field = ValidChoice(values=('a', 'b'), __name__='choice')
+
+        class X(object):
+            pass
+        x = X()
+        field.set(x, 'a')
+
+        events = eventtesting.getEvents(IBeforeSchemaFieldAssignedEvent)
+        assert_that(events, contains(has_property('object', 'a')))
+        assert_that(x, has_property('choice', 'a'))
+
 class TestValidSet(unittest.TestCase):
 
     def _getTargetClass(self):
@@ -864,3 +882,42 @@ class TestFunctions(unittest.TestCase):
         field.key_type = TextLine()
         _fixup_Object_field(field)
         assert_that(field, verifiably_provides(IFromObject))
+
+
+class TestLazyNames(unittest.TestCase):
+
+    def test_lazy_names_not_imported(self):
+        import subprocess
+        import sys
+        out = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys; import nti.schema.field; '
+            'print("nti.schema._lazyfields" in sys.modules, '
+            '"zope.interface.common.idatetime" in sys.modules)'
+        ])
+        assert_that(out.strip(), is_(b'False False'))
+
+    def test_lazy_names(self):
+        from nti.schema import field
+        from nti.schema import _lazyfields
+        # pylint:disable=protected-access
+        for name in field._LAZY_NAMES:
+            value = getattr(field, name)
+            self.assertIs(value, getattr(_lazyfields, name))
+            assert_that(value, has_property('__module__', 'nti.schema.field'))
+            self.assertIn(name, field.__all__)
+            self.assertIn(name, dir(field))
+
+    def test_missing_name(self):
+        from nti.schema import field
+        assert_that(calling(getattr).with_args(field, 'NoSuchField'),
+                    raises(AttributeError))
+
+    def test_schema_configured_deprecated(self):
+        from nti.schema import field
+        from nti.schema.schema import SchemaConfigured
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            self.assertIs(field.SchemaConfigured, SchemaConfigured)
+        assert_that(w, has_length(1))
+        self.assertIs(w[0].category, DeprecationWarning)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for instrumentation.py
+
+"""
+
+import doctest
+import unittest
+
+from zope.interface import Interface
+from zope.interface import implementer
+from zope.schema.interfaces import ValidationError
+
+from hamcrest import assert_that
+from hamcrest import contains_string
+from hamcrest import greater_than_or_equal_to
+from hamcrest import has_entries
+from hamcrest import has_key
+from hamcrest import is_
+from hamcrest import is_not
+from hamcrest import none
+
+from nti.schema.field import Int
+from nti.schema.field import ListOrTupleFromObject
+from nti.schema.field import ValidTextLine
+from nti.schema.field import Variant
+from nti.schema.fieldproperty import createDirectFieldProperties
+from nti.schema.schema import SchemaConfigured
+
+from nti.schema.instrumentation import Recorder
+from nti.schema.instrumentation import disable_instrumentation
+from nti.schema.instrumentation import enable_instrumentation
+from nti.schema.instrumentation import get_recorder
+
+from . import SchemaLayer
+
+# pylint:disable=inherit-non-class,protected-access
+
+class IThing(Interface):
+    name = ValidTextLine(title='Name', max_length=5)
+
+@implementer(IThing)
+class Thing(SchemaConfigured):
+    createDirectFieldProperties(IThing)
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    layer = SchemaLayer
+
+    def setUp(self):
+        self.recorder = enable_instrumentation()
+
+    def tearDown(self):
+        disable_instrumentation()
+
+    def _stats(self, operation, label):
+        return self.recorder.snapshot()[operation][label]
+
+    def test_enable_disable(self):
+        import nti.schema.field
+        import nti.schema.schema
+        assert_that(get_recorder(), is_(self.recorder))
+        self.assertIs(nti.schema.field._recorder, self.recorder)
+
+        self.assertIs(disable_instrumentation(), self.recorder)
+        assert_that(get_recorder(), is_(none()))
+        assert_that(nti.schema.field._recorder, is_(none()))
+        assert_that(nti.schema.schema._recorder, is_(none()))
+
+        ValidTextLine(__name__='ignored').validate('abc')
+        assert_that(self.recorder.snapshot(), is_({}))
+
+        recorder = Recorder()
+        self.assertIs(enable_instrumentation(recorder), recorder)
+        self.assertIs(nti.schema.schema._recorder, recorder)
+
+    def test_validate(self):
+        IThing['name'].validate('abc')
+        with self.assertRaises(ValidationError):
+            IThing['name'].validate('abcdefgh')
+
+        assert_that(self._stats('validate', __name__ + '.IThing.name'),
+                    has_entries(count=2, failures=1,
+                                seconds=greater_than_or_equal_to(0)))
+
+        # Unnamed fields use their class
+        ValidTextLine().validate('abc')
+        assert_that(self._stats('validate', 'ValidTextLine'),
+                    has_entries(count=1, failures=0))
+
+    def test_convert_and_from_object(self):
+        field = ListOrTupleFromObject(Int(), __name__='numbers')
+        field.fromObject(['1', '2'])
+        assert_that(self.recorder.snapshot()['convert'], has_key('Int'))
+        assert_that(self._stats('convert', 'Int'), has_entries(count=2))
+
+        variant = Variant((Int(),), __name__='variant')
+        with self.assertRaises(ValidationError):
+            variant.fromObject('abc')
+        assert_that(self._stats('from_object', 'variant'),
+                    has_entries(count=1, failures=1))
+
+    def test_set_and_init(self):
+        thing = Thing(name='abc')
+        assert_that(self._stats('init', __name__ + '.Thing'),
+                    has_entries(count=1, failures=0))
+
+        IThing['name'].set(thing, 'def')
+        assert_that(self._stats('set', __name__ + '.IThing.name'),
+                    has_entries(count=1, failures=0))
+
+    def test_reset(self):
+        ValidTextLine().validate('abc')
+        assert_that(self.recorder.snapshot(), is_not({}))
+        self.recorder.reset()
+        assert_that(self.recorder.snapshot(), is_({}))
+
+    def test_to_prometheus(self):
+        self.recorder.record('validate', 'a "quoted"\nname', 0.5, True)
+        text = self.recorder.to_prometheus(prefix='app')
+        assert_that(text, contains_string('# TYPE app_calls_total counter\n'))
+        assert_that(text, contains_string(
+            'app_calls_total{operation="validate",field="a \\"quoted\\"\\nname"} 1\n'))
+        assert_that(text, contains_string(
+            'app_seconds_total{operation="validate",field="a \\"quoted\\"\\nname"} 0.5\n'))
+        assert_that(text, contains_string(
+            'app_failures_total{operation="validate",field="a \\"quoted\\"\\nname"} 1\n'))
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.defaultTestLoader.loadTestsFromName(__name__),
+        doctest.DocTestSuite("nti.schema.instrumentation",
+                             optionflags=doctest.ELLIPSIS),
+    ))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,11 +22,12 @@ from hamcrest import assert_that
 from hamcrest import has_property
 from hamcrest import none
 from hamcrest import is_
+from hamcrest import has_length
 
 __docformat__ = "restructuredtext en"
 
 #disable: accessing protected members, too many methods
-#pylint: disable=W0212,R0904
+#pylint: disable=W0212,R0904,inherit-non-class,no-value-for-parameter
 
 class TestInvalidValue(unittest.TestCase):
 
@@ -82,3 +83,87 @@ class TestInvalidValue(unittest.TestCase):
     def test_alias(self):
         from zope.schema import interfaces as sch_interfaces
         self.assertIs(InvalidValue, sch_interfaces.InvalidValue)
+
+
+class TestFindMostDerivedInterface(unittest.TestCase):
+
+    def test_cached_until_changed(self):
+        from zope.interface import Interface
+        from zope.interface import alsoProvides
+        from zope.interface import classImplements
+        from zope.interface import implementer
+        from zope.interface import providedBy
+        from nti.schema.interfaces import find_most_derived_interface
+
+        class IBase(Interface):
+            pass
+
+        class IDerived(IBase):
+            pass
+
+        class IMoreDerived(IDerived):
+            pass
+
+        @implementer(IDerived)
+        class Thing(object):
+            pass
+
+        thing = Thing()
+        assert_that(find_most_derived_interface(thing, IBase), is_(IDerived))
+        cache = providedBy(thing)._v_attrs['__nti_schema_most_derived']
+        assert_that(cache, is_({(IBase, None): IDerived}))
+        assert_that(find_most_derived_interface(thing, IBase), is_(IDerived))
+
+        assert_that(find_most_derived_interface(thing, IBase, (IBase,)), is_(IBase))
+        assert_that(cache, has_length(2))
+        # Lists aren't cached
+        assert_that(find_most_derived_interface(thing, IBase, [IMoreDerived]),
+                    is_(IMoreDerived))
+        assert_that(cache, has_length(2))
+
+        # Changing what's provided uses a different spec
+        alsoProvides(thing, IMoreDerived)
+        assert_that(find_most_derived_interface(thing, IBase), is_(IMoreDerived))
+        assert_that(find_most_derived_interface(Thing(), IBase), is_(IDerived))
+
+        # Changing the class's declaration clears the cache. (Use a
+        # different class; with a strict resolution order, Thing can't
+        # be declared to implement what a Thing instance already provides.)
+        @implementer(IDerived)
+        class OtherThing(object):
+            pass
+
+        assert_that(find_most_derived_interface(OtherThing(), IBase), is_(IDerived))
+        classImplements(OtherThing, IMoreDerived)
+        assert_that(find_most_derived_interface(OtherThing(), IBase), is_(IMoreDerived))
+
+
+class TestApplyInterfacePatches(unittest.TestCase):
+
+    def test_applied(self):
+        from zope.schema import interfaces as sch_interfaces
+        from ..interfaces import IBeforeSchemaFieldAssignedEvent
+        from ..interfaces import apply_interface_patches
+        self.assertTrue(sch_interfaces.IBeforeObjectAssignedEvent.extends(
+            IBeforeSchemaFieldAssignedEvent))
+        spec = sch_interfaces.IBeforeObjectAssignedEvent
+        sro = spec.__sro__
+        # Again does nothing.
+        apply_interface_patches()
+        self.assertIs(spec.__sro__, sro)
+
+    def test_deferred(self):
+        import os
+        import subprocess
+        import sys
+        env = dict(os.environ)
+        env['NTI_SCHEMA_DEFER_INTERFACE_PATCHES'] = '1'
+        out = subprocess.check_output([
+            sys.executable, '-c',
+            'from zope.schema.interfaces import IBeforeObjectAssignedEvent as I; '
+            'from nti.schema import interfaces; '
+            'print(I.extends(interfaces.IBeforeSchemaFieldAssignedEvent)); '
+            'interfaces.apply_interface_patches(); '
+            'print(I.extends(interfaces.IBeforeSchemaFieldAssignedEvent))'
+        ], env=env)
+        assert_that(out.split(), is_([b'False', b'True']))
@@ -13,8 +13,12 @@ import unittest
 
 from zope.interface import Interface
 from zope.interface import Attribute
+from zope.interface import implementer
+from zope.schema import Object
+from zope.i18n.interfaces import IUserPreferredLanguages
 
 from .. import jsonschema
+from . import SchemaLayer
 from ..field import DecodingValidTextLine
 from ..field import ListOrTuple
 from ..field import Dict
@@ -56,6 +60,491 @@ class TranslateTestSchema(jsonschema.JsonSchemafier):
         return text + self.context
 
 
+@implementer(IUserPreferredLanguages)
+class Languages(object):
+
+    def __init__(self, *languages):
+        self.languages = languages
+
+    def getPreferredLanguages(self):
+        return self.languages
+
+
+class TestJsonSchemafierCache(unittest.TestCase):
+
+    def _make_iface(self):
+        class IA(Interface):
+
+            field = DecodingValidTextLine(title='A title')
+            field.setTaggedValue(jsonschema.TAG_APPLICATION_INFO, {'list_key': [42]})
+
+        return IA
+
+    def test_cached_copies(self):
+        IA = self._make_iface()
+        schemafier = jsonschema.JsonSchemafier(IA, cache=True)
+        schema = schemafier.make_schema()
+        assert_that(schema, has_entry('field', has_entry('title', 'A title')))
+        assert_that(schema, is_(jsonschema.JsonSchemafier(IA).make_schema()))
+
+        # Mutating what we get back doesn't affect the cache
+        schema['field']['title'] = 'Changed'
+        schema['field']['application_info']['list_key'].append(1)
+        schema2 = jsonschema.JsonSchemafier(IA, cache=True).make_schema()
+        assert_that(schema2, has_entry('field', has_entry('title', 'A title')))
+        assert_that(schema2['field']['application_info'], has_entry('list_key', [42]))
+        assert_that(schema2, is_not(same_instance(schema)))
+
+        # But it did come from the cache
+        IA['field'].title = 'New title'
+        schema3 = jsonschema.JsonSchemafier(IA, cache=True).make_schema()
+        assert_that(schema3, has_entry('field', has_entry('title', 'A title')))
+
+        # Until the interface changes
+        IA.changed(IA) # pylint:disable=no-value-for-parameter
+        schema4 = jsonschema.JsonSchemafier(IA, cache=True).make_schema()
+        assert_that(schema4, has_entry('field', has_entry('title', 'New title')))
+
+        # The readonly override is part of the key
+        schema5 = jsonschema.JsonSchemafier(IA, readonly_override=True, cache=True).make_schema()
+        assert_that(schema5, has_entry('field', has_entry('readonly', True)))
+
+    def test_cache_key(self):
+        IA = self._make_iface()
+        Schemafier = jsonschema.JsonSchemafier
+        assert_that(Schemafier(IA).cache_key(),
+                    is_((Schemafier, None, None)))
+        assert_that(Schemafier(IA, True, Languages('en', 'fr')).cache_key(),
+                    is_((Schemafier, True, ('en', 'fr'))))
+        # Can't be used as a language
+        assert_that(Schemafier(IA, context=object()).cache_key(), is_(none()))
+        assert_that(TranslateTestSchema(IA, context=' TEST', cache=True).make_schema(),
+                    has_entry('field', has_entry('title', 'A title TEST')))
+        assert_that(TranslateTestSchema(IA, context=' TEST2', cache=True).make_schema(),
+                    has_entry('field', has_entry('title', 'A title TEST2')))
+
+        # Languages are kept separate
+        class LanguageSchema(jsonschema.JsonSchemafier):
+            def _translate(self, text):
+                return text + ' ' + self.context.languages[0]
+
+        assert_that(LanguageSchema(IA, context=Languages('en'), cache=True).make_schema(),
+                    has_entry('field', has_entry('title', 'A title en')))
+        assert_that(LanguageSchema(IA, context=Languages('fr'), cache=True).make_schema(),
+                    has_entry('field', has_entry('title', 'A title fr')))
+
+    def test_template(self):
+        IA = self._make_iface()
+
+        class CountingSchema(TranslateTestSchema):
+            walks = 0
+            processed = ()
+
+            def _make_schema_template(self):
+                CountingSchema.walks += 1
+                return super()._make_schema_template()
+
+            def post_process_field_template(self, name, field, item_template):
+                CountingSchema.processed += (item_template['title'],)
+
+            def template_cache_key(self):
+                return super().template_cache_key() + ('counting',)
+
+            def cache_key(self):
+                return self.template_cache_key() + (self.context,)
+
+        template = CountingSchema(IA, cache=True).make_schema_template()
+        assert_that(template, has_entry('field', has_entry('title', 'A title')))
+        # Post-processing sees a string equal to the untranslated value
+        assert_that(CountingSchema.processed, is_(('A title',)))
+
+        for suffix in ' en', ' fr', ' de':
+            schemafier = CountingSchema(IA, context=suffix, cache=True)
+            schema = schemafier.make_schema()
+            assert_that(schema, has_entry('field', has_entry('title', 'A title' + suffix)))
+            assert_that(schemafier.translate_template(template), is_(schema))
+        # We only walked the interface once.
+        assert_that(CountingSchema.walks, is_(1))
+
+        # The template is the same object; the translations are new
+        assert_that(CountingSchema(IA, cache=True).make_schema_template(),
+                    is_(same_instance(template)))
+        assert_that(template, has_entry('field', has_entry('title', 'A title')))
+
+    def test_post_process_field_translated(self):
+        IA = self._make_iface()
+
+        class ProcessingSchema(TranslateTestSchema):
+            processed = ()
+
+            def post_process_field(self, name, field, item_schema):
+                ProcessingSchema.processed += (item_schema['title'],)
+                item_schema['title'] += '!'
+
+            def cache_key(self):
+                return self.template_cache_key() + (self.context,)
+
+        for suffix in ' en', ' fr', ' en':
+            schema = ProcessingSchema(IA, context=suffix, cache=True).make_schema()
+            assert_that(schema, has_entry('field', has_entry('title', 'A title' + suffix + '!')))
+        # Cached for each language.
+        assert_that(ProcessingSchema.processed, is_(('A title en', 'A title fr')))
+
+    def test_nested_make_schema(self):
+        class INested(Interface):
+            field = DecodingValidTextLine(title='Nested')
+
+        class IOuter(Interface):
+            nested = Object(INested, title='Outer')
+
+        class NestingSchema(TranslateTestSchema):
+            def make_schema(self):
+                schema = super().make_schema()
+                schema['extra'] = self.schema.__name__
+                return schema
+
+        schema = NestingSchema(IOuter, context=' TEST').make_schema()
+        assert_that(schema, has_entry('extra', 'IOuter'))
+        assert_that(schema['nested']['schema'], has_entry('extra', 'INested'))
+        assert_that(schema['nested']['schema'],
+                    has_entry('field', has_entry('title', 'Nested TEST')))
+        # Without overriding, the same but for the extras.
+        del schema['extra']
+        del schema['nested']['schema']['extra']
+        assert_that(TranslateTestSchema(IOuter, context=' TEST').make_schema(), is_(schema))
+
+    def test_template_pickles(self):
+        import pickle
+        from zope.i18nmessageid import MessageFactory
+        _ = MessageFactory('nti.schema.test')
+
+        class IB(Interface):
+            field = DecodingValidTextLine(title=_('A title', default='The default'))
+
+        template = jsonschema.JsonSchemafier(IB).make_schema_template()
+        title = template['field']['title']
+        copied = pickle.loads(pickle.dumps(template))
+        copied_title = copied['field']['title']
+        assert_that(copied_title, is_(title))
+        assert_that(copied_title.msgid, is_(title.msgid))
+        assert_that(copied_title.msgid.domain, is_('nti.schema.test'))
+        assert_that(jsonschema.JsonSchemafier(IB).translate_template(copied),
+                    has_entry('field', has_entry('title', 'The default')))
+
+    def test_post_process_changes_choices(self):
+        from zope.schema import Choice
+        from zope.schema.vocabulary import SimpleTerm
+        from zope.schema.vocabulary import SimpleVocabulary
+
+        class IB(Interface):
+            choice = Choice(vocabulary=SimpleVocabulary([
+                SimpleTerm('a', 'a', 'A'),
+            ]))
+
+        class ExclaimingSchema(jsonschema.JsonSchemafier):
+            def post_process_field(self, name, field, item_schema):
+                for choice in item_schema.get('choices', ()):
+                    choice['title'] += '!'
+
+        for cache in False, True:
+            schema = ExclaimingSchema(IB, cache=cache).make_schema()
+            assert_that(schema['choice']['choices'][0], has_entry('title', 'A!'))
+        assert_that(jsonschema.get_data_from_choice_field(IB['choice'])[0][0],
+                    has_entry('title', 'A'))
+        assert_that(jsonschema.get_json_from_choice_field(IB['choice']),
+                    is_(b'[{"title":"A","token":"a","value":"a"}]'))
+
+    def test_not_a_spec(self):
+        class Schemafier(jsonschema.JsonSchemafier):
+            def _iter_names_and_descriptions(self):
+                return ()
+        assert_that(Schemafier(object(), cache=True).make_schema(), is_({}))
+
+
+class _Site(object):
+
+    def __init__(self):
+        from zope.component import getGlobalSiteManager
+        from zope.interface.registry import Components
+        self.components = Components(bases=(getGlobalSiteManager(),))
+
+    def getSiteManager(self):
+        return self.components
+
+
+class TestJsonSchemafierCacheVocabularies(unittest.TestCase):
+
+    layer = SchemaLayer
+
+    def setUp(self):
+        from zope.component import hooks
+        hooks.setHooks()
+        self.addCleanup(hooks.resetHooks)
+
+    def _register(self, components, values):
+        from zope.schema.interfaces import IVocabularyFactory
+        from zope.schema.vocabulary import SimpleVocabulary
+        def factory(_context):
+            return SimpleVocabulary.fromValues(values)
+        components.registerUtility(factory, IVocabularyFactory, 'Letters')
+        self.addCleanup(components.unregisterUtility,
+                        factory, IVocabularyFactory, 'Letters')
+
+    def _choices(self, iface):
+        schema = jsonschema.JsonSchemafier(iface, cache=True).make_schema()
+        return schema['choice']['choices']
+
+    def test_cached_per_site(self):
+        from zope import component
+        from zope.component import hooks
+        from zope.schema import Choice
+
+        class IA(Interface):
+            choice = Choice(title="Choice", vocabulary="Letters")
+
+        self._register(component.getGlobalSiteManager(), ['a', 'b'])
+        site = _Site()
+        self._register(site.components, ['c'])
+
+        assert_that(self._choices(IA), is_(['a', 'b']))
+        with hooks.site(site):
+            assert_that(self._choices(IA), is_(['c']))
+        assert_that(self._choices(IA), is_(['a', 'b']))
+
+    def test_site_managers_not_kept(self):
+        import gc
+        import weakref
+        from zope.component import hooks
+        from zope.schema import Choice
+        from zope.schema.interfaces import IVocabularyFactory
+        from zope.schema.vocabulary import SimpleVocabulary
+
+        class IA(Interface):
+            field = DecodingValidTextLine(title='A title')
+            choice = Choice(title="Choice", vocabulary="Letters")
+
+        site = _Site()
+        site.components.registerUtility(lambda _context: SimpleVocabulary.fromValues(['c']),
+                                        IVocabularyFactory, 'Letters',
+                                        # Events are kept by the test layer.
+                                        event=False)
+        with hooks.site(site):
+            schema = jsonschema.JsonSchemafier(IA, cache=True).make_schema()
+        assert_that(schema, has_entry('field', has_entry('title', 'A title')))
+        assert_that(schema, has_entry('choice', has_entry('choices', ['c'])))
+        assert_that(IA._v_attrs[jsonschema._SCHEMA_CACHE_KEY], has_length(1))
+        assert_that(jsonschema._exported_by_name, has_length(1))
+
+        components = weakref.ref(site.components)
+        del site
+        gc.collect()
+        assert_that(components(), is_(none()))
+        assert_that(IA._v_attrs[jsonschema._SCHEMA_CACHE_KEY], has_length(0))
+        assert_that(jsonschema._exported_by_name, has_length(0))
+
+    def test_discarded_when_vocabularies_change(self):
+        from zope import component
+        from zope.schema import Choice
+
+        class IA(Interface):
+            choice = Choice(title="Choice", vocabulary="Letters")
+
+        values = ['a', 'b']
+        self._register(component.getGlobalSiteManager(), values)
+        assert_that(self._choices(IA), is_(['a', 'b']))
+
+        values.append('c')
+        assert_that(self._choices(IA), is_(['a', 'b']))
+        jsonschema.vocabularies_changed()
+        assert_that(self._choices(IA), is_(['a', 'b', 'c']))
+        assert_that(IA._v_attrs, has_key(jsonschema._TEMPLATE_CACHE_KEY))
+
+
+class TestWriteSchema(unittest.TestCase):
+
+    def _make_iface(self):
+        class IA(Interface):
+            b_field = DecodingValidTextLine(title='A title')
+            a_field = List(DecodingValidTextLine(), title='A list')
+            c_field = Dict(DecodingValidTextLine(), Real(), description='\N{SNOWMAN}')
+
+        return IA
+
+    def test_text(self):
+        import io
+        import json
+        IA = self._make_iface()
+        for cache in False, True:
+            schemafier = TranslateTestSchema(IA, context=' TEST', cache=cache)
+            stream = io.StringIO()
+            schemafier.write_schema(stream)
+            assert_that(stream.getvalue(),
+                        is_(json.dumps(schemafier.make_schema(), sort_keys=True)))
+            assert_that(json.loads(stream.getvalue()),
+                        has_entry('b_field', has_entry('title', 'A title TEST')))
+
+    def test_bytes_flush(self):
+        import io
+        import json
+        IA = self._make_iface()
+
+        class Stream(io.BytesIO):
+            flushes = 0
+            def flush(self):
+                self.flushes += 1
+                super().flush()
+
+        stream = Stream()
+        schemafier = jsonschema.JsonSchemafier(IA)
+        schemafier.write_schema(stream, flush=True)
+        assert_that(stream.getvalue(),
+                    is_(json.dumps(schemafier.make_schema(), sort_keys=True).encode('utf-8')))
+        assert_that(stream.flushes, is_(4))
+
+        ascii_stream = io.BytesIO()
+        schemafier.write_schema(ascii_stream, encoding='ascii')
+        assert_that(ascii_stream.getvalue(),
+                    is_(json.dumps(schemafier.make_schema(), sort_keys=True).encode('ascii')))
+
+    def test_empty(self):
+        import io
+        stream = io.StringIO()
+        jsonschema.JsonSchemafier(Interface).write_schema(stream, flush=True)
+        assert_that(stream.getvalue(), is_('{}'))
+
+
+class TestDefinitions(unittest.TestCase):
+
+    def test_shared_definitions(self):
+        import io
+        import json
+
+        class ILeaf(Interface):
+            text = DecodingValidTextLine(title='Leaf text')
+
+        class INode(Interface):
+            leaf = Object(ILeaf)
+            leaves = List(Object(ILeaf))
+            parent = Object(Interface)
+
+        INode['parent'].schema = INode
+
+        class IA(Interface):
+            node = Object(INode)
+            other_leaf = Object(ILeaf)
+
+        schemafier = TranslateTestSchema(IA, context=' TEST', definitions=True)
+        schema = schemafier.make_schema()
+        leaf_ref = {'$ref': '#/$defs/' + ILeaf.__identifier__}
+        node_ref = {'$ref': '#/$defs/' + INode.__identifier__}
+        assert_that(schema, has_entry('node', has_entry('schema', node_ref)))
+        assert_that(schema, has_entry('other_leaf', has_entry('schema', leaf_ref)))
+
+        defs = schema[jsonschema.DEFINITIONS_KEY]
+        assert_that(sorted(defs), is_(sorted([ILeaf.__identifier__, INode.__identifier__])))
+        node = defs[INode.__identifier__]
+        assert_that(node, has_entry('leaf', has_entry('schema', leaf_ref)))
+        assert_that(node, has_entry('leaves',
+                                    has_entry('value_type', has_entry('schema', leaf_ref))))
+        assert_that(node, has_entry('parent', has_entry('schema', node_ref)))
+        assert_that(defs[ILeaf.__identifier__],
+                    has_entry('text', has_entry('title', 'Leaf text TEST')))
+
+        # Without definitions, nothing changes.
+        class IB(Interface):
+            leaves = List(Object(ILeaf))
+
+        schema = jsonschema.JsonSchemafier(IB).make_schema()
+        assert_that(schema, is_not(has_key(jsonschema.DEFINITIONS_KEY)))
+        assert_that(schema, has_entry('leaves', has_entry('value_type',
+                                                          has_entry('schema', has_key('text')))))
+
+        # Streaming produces the same thing
+        stream = io.StringIO()
+        schemafier.write_schema(stream)
+        assert_that(json.loads(stream.getvalue()), is_(schemafier.make_schema()))
+
+        # Each generation is new
+        assert_that(schemafier._definitions, is_(none()))
+        assert_that(jsonschema.JsonSchemafier(ILeaf, definitions=True).make_schema(),
+                    is_not(has_key(jsonschema.DEFINITIONS_KEY)))
+
+    def test_cache_key(self):
+        Schemafier = jsonschema.JsonSchemafier
+        assert_that(Schemafier(Interface, definitions=True).cache_key(),
+                    is_((Schemafier, None, '$defs', None)))
+
+
+class IBatchLeaf(Interface):
+    text = DecodingValidTextLine(title='Leaf text')
+
+class IBatchA(Interface):
+    leaf = ListOrTuple(Object(IBatchLeaf))
+
+class IBatchB(Interface):
+    leaf = Object(IBatchLeaf)
+    a = Object(IBatchA)
+
+
+class CountingBatchSchema(TranslateTestSchema):
+    walked = ()
+
+    def _make_schema_template(self):
+        CountingBatchSchema.walked += (self.schema,)
+        return super()._make_schema_template()
+
+
+class TestMakeSchemas(unittest.TestCase):
+
+    def setUp(self):
+        CountingBatchSchema.walked = ()
+
+    def test_shared_templates(self):
+        schemas = [IBatchA, IBatchB, IBatchLeaf, IBatchA]
+        results = jsonschema.make_schemas(schemas, context=' TEST', factory=CountingBatchSchema)
+        assert_that(results, is_([
+            TranslateTestSchema(schema, context=' TEST').make_schema()
+            for schema in schemas
+        ]))
+        assert_that(results[0], is_not(same_instance(results[3])))
+        assert_that(CountingBatchSchema.walked, is_((IBatchA, IBatchLeaf, IBatchB)))
+        assert_that(results[2], has_entry('text', has_entry('title', 'Leaf text TEST')))
+
+    def test_share_schema_templates(self):
+        templates = {}
+        schemafier = CountingBatchSchema(IBatchB, context=' TEST')
+        schemafier.share_schema_templates(templates)
+        schema = schemafier.translate_template(schemafier.make_schema_template())
+        assert_that(templates, has_length(3))
+        assert_that(CountingBatchSchema.walked, is_((IBatchB, IBatchLeaf, IBatchA)))
+
+        other = CountingBatchSchema(IBatchA, context=' TEST')
+        other.share_schema_templates(templates)
+        assert_that(other.make_schema_template(), is_(same_instance(templates[IBatchA])))
+        assert_that(CountingBatchSchema.walked, has_length(3))
+        assert_that(schema, is_(TranslateTestSchema(IBatchB, context=' TEST').make_schema()))
+
+    def test_definitions(self):
+        results = jsonschema.make_schemas([IBatchB], factory=jsonschema.JsonSchemafier,
+                                          definitions=True)
+        assert_that(results, is_([
+            jsonschema.JsonSchemafier(IBatchB, definitions=True).make_schema()
+        ]))
+        assert_that(results[0], has_key(jsonschema.DEFINITIONS_KEY))
+
+    def test_processes(self):
+        schemas = [IBatchA, IBatchB, IBatchLeaf]
+        results = jsonschema.make_schemas(schemas, context=' TEST',
+                                          factory=CountingBatchSchema,
+                                          processes=2)
+        assert_that(results, is_([
+            TranslateTestSchema(schema, context=' TEST').make_schema()
+            for schema in schemas
+        ]))
+        # Nothing was walked in this process
+        assert_that(CountingBatchSchema.walked, is_(()))
+
+
 class TestJsonSchemafier(unittest.TestCase):
 
     def test_application_info(self):
@@ -122,10 +611,51 @@ class TestJsonSchemafier(unittest.TestCase):
         schema = jsonschema.JsonSchemafier(IA).make_schema()
         assert_that(schema, has_entry('field', has_entry('type', 'MyType')))
 
+    def test_ui_types_memoized(self):
+        from zope.interface import providedBy
+        field = DecodingValidTextLine()
+        assert_that(jsonschema.get_ui_types_from_field(field),
+                    is_(('string', 'string')))
+        generation, cache = providedBy(field)._v_attrs['__nti_schema_ui_types']
+        assert_that(generation, is_(jsonschema._ui_types_generation))
+        assert_that(cache, has_entry((type(field), field._type), ('string', 'string')))
+        assert_that(jsonschema.get_ui_types_from_field(DecodingValidTextLine()),
+                    is_(('string', 'string')))
+
+    def test_register_ui_types(self):
+        class MyTextLine(DecodingValidTextLine):
+            pass
+
+        class MySubTextLine(MyTextLine):
+            pass
+
+        field = MySubTextLine()
+        assert_that(jsonschema.get_ui_types_from_field(field),
+                    is_(('string', 'string')))
+        jsonschema.register_ui_types(MyTextLine, 'MyType', 'string')
+        try:
+            assert_that(jsonschema.get_ui_types_from_field(field),
+                        is_(('MyType', 'string')))
+            # Others are unchanged
+            assert_that(jsonschema.get_ui_types_from_field(DecodingValidTextLine()),
+                        is_(('string', 'string')))
+
+            class IA(Interface):
+                field = MySubTextLine()
+            schema = jsonschema.JsonSchemafier(IA).make_schema()
+            assert_that(schema, has_entry('field', has_entry('type', 'MyType')))
+        finally:
+            jsonschema.unregister_ui_types(MyTextLine)
+        assert_that(jsonschema.get_ui_types_from_field(field),
+                    is_(('string', 'string')))
+        # Unregistering again does nothing
+        generation = jsonschema._ui_types_generation
+        jsonschema.unregister_ui_types(MyTextLine)
+        assert_that(jsonschema._ui_types_generation, is_(generation))
+
     def test_type_from_types(self):
         # TODO: Refactor and simplify
         # pylint:disable=too-many-statements
-        from zope.schema import Object
         from nti.schema.field import Variant
 
         def _assert_type(t, name='field',
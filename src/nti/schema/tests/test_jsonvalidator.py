@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for jsonvalidator.py
+"""
+
+import subprocess
+import sys
+import unittest
+
+from zope.interface import Interface
+from zope.schema import Bool
+from zope.schema import Choice
+from zope.schema import Int
+from zope.schema import Object
+
+from hamcrest import assert_that
+from hamcrest import contains_inanyorder
+from hamcrest import is_
+
+from ..field import Dict
+from ..field import Float
+from ..field import ListOrTuple
+from ..field import UniqueIterable
+from ..field import ValidTextLine
+from ..field import Variant
+from ..jsonschema import JsonSchemafier
+from ..jsonvalidator import compile_validator
+from ..jsonvalidator import compile_validator_for_interface
+
+# pylint:disable=inherit-non-class
+
+
+class ILeaf(Interface):
+    text = ValidTextLine(min_length=2, max_length=5)
+
+class INode(Interface):
+    name = ValidTextLine(required=False)
+    count = Int(min=0, max=10)
+    ratio = Float(required=False)
+    flag = Bool(required=False)
+    letter = Choice(values=('x', 'y'), required=False)
+    numbers = ListOrTuple(Int(), min_length=1, required=False)
+    unique = UniqueIterable(value_type=Int(), required=False)
+    mapping = Dict(ValidTextLine(), Int(), required=False)
+    leaf = Object(ILeaf, required=False)
+    leaves = ListOrTuple(Object(ILeaf), required=False)
+    variant = Variant((Int(), ValidTextLine(max_length=3)), required=False)
+    children = ListOrTuple(Object(Interface), required=False)
+    readonly = ValidTextLine(readonly=True)
+
+INode['children'].value_type.schema = INode
+
+
+class TestCompileValidator(unittest.TestCase):
+
+    def _check(self, validate):
+        assert_that(validate({'count': 1}), is_([]))
+        assert_that(validate({
+            'name': 'a name',
+            'count': 10,
+            'ratio': 1,
+            'flag': False,
+            'letter': 'x',
+            'numbers': [1, 2, 1],
+            'unique': [1, 2],
+            'mapping': {'a': 1},
+            'leaf': {'text': 'abc'},
+            'leaves': [{'text': 'ab'}],
+            'variant': 'abc',
+            'children': [{'count': 2, 'children': [{'count': 3}]}],
+            'ignored': object(),
+        }), is_([]))
+
+        assert_that(validate({}), is_([(('count',), 'RequiredMissing')]))
+        assert_that(validate([]), is_([((), 'WrongType')]))
+        assert_that(validate({
+            'name': 1,
+            'count': 11,
+            'ratio': 'a',
+            'flag': 0,
+            'letter': 'z',
+            'numbers': [],
+            'unique': [1, 1],
+            'mapping': {'a': 'b'},
+            'leaf': {},
+            'leaves': [{'text': 'a'}, {'text': 'abcdef'}, 'x'],
+            'variant': 'abcd',
+            'children': [{'count': True}],
+        }), contains_inanyorder(
+            (('name',), 'WrongType'),
+            (('count',), 'TooBig'),
+            (('ratio',), 'WrongType'),
+            (('flag',), 'WrongType'),
+            (('letter',), 'ConstraintNotSatisfied'),
+            (('numbers',), 'TooShort'),
+            (('unique',), 'NotUnique'),
+            (('mapping', 'a'), 'WrongType'),
+            (('leaf', 'text'), 'RequiredMissing'),
+            (('leaves', 0, 'text'), 'TooShort'),
+            (('leaves', 1, 'text'), 'TooLong'),
+            (('leaves', 2), 'WrongType'),
+            (('variant',), 'WrongContainedType'),
+            (('children', 0, 'count'), 'WrongType'),
+        ))
+        assert_that(validate({'count': -1, 'unique': [[1], [1]], 'numbers': {}}),
+                    contains_inanyorder(
+                        (('count',), 'TooSmall'),
+                        (('unique',), 'NotUnique'),
+                        (('numbers',), 'WrongType'),
+                    ))
+
+    def test_interface(self):
+        self._check(compile_validator_for_interface(INode))
+
+    def test_schema(self):
+        self._check(compile_validator(JsonSchemafier(INode, definitions=True).make_schema()))
+
+    def test_schema_without_definitions(self):
+        class IParent(Interface):
+            leaf = Object(ILeaf)
+
+        validate = compile_validator(JsonSchemafier(IParent).make_schema())
+        assert_that(validate({'leaf': {'text': 'ab'}}), is_([]))
+        assert_that(validate({'leaf': {'text': 'a'}}),
+                    is_([(('leaf', 'text'), 'TooShort')]))
+
+    def test_choice_values(self):
+        import json
+        from zope.schema.vocabulary import SimpleTerm
+        from zope.schema.vocabulary import SimpleVocabulary
+
+        class IChoices(Interface):
+            number = Choice(values=[1, 2, 3], required=False)
+            titled = Choice(vocabulary=SimpleVocabulary([
+                SimpleTerm(10, 'ten', 'Ten'),
+                SimpleTerm((1, 2), 'pair', 'Pair'),
+            ]), required=False)
+
+        schema = JsonSchemafier(IChoices).make_schema()
+        assert_that(schema['number']['choice_values'], is_([1, 2, 3]))
+        # As sent over the wire
+        validate = compile_validator(json.loads(json.dumps(schema)))
+        for number in 1, 3:
+            IChoices['number'].validate(number)
+            assert_that(validate({'number': number}), is_([]))
+        assert_that(validate({'number': '1', 'titled': 'ten'}), contains_inanyorder(
+            (('number',), 'ConstraintNotSatisfied'),
+            (('titled',), 'ConstraintNotSatisfied'),
+        ))
+        assert_that(validate({'number': 4}), is_([(('number',), 'ConstraintNotSatisfied')]))
+        # Values that can't be in JSON are sent as tokens
+        assert_that(validate({'titled': 10}), is_([]))
+        assert_that(validate({'titled': 'pair'}), is_([]))
+
+    def test_raw_schema(self):
+        validate = compile_validator({
+            'untyped': {},
+            'text': {'type': 'string', 'base_type': 'string', 'max_length': 2},
+            'no_schema': {'type': 'Object', 'schema': None},
+            'items': {'type': 'List', 'min_length': 1, 'max_length': 2, 'unique': True},
+            'hidden': {'type': 'Tuple', 'value_type': None},
+            'sized': {'type': 'dict', 'min_length': 1},
+            'chosen': {'choices': [
+                {'token': 'a', 'value': ['not', 'hashable']},
+                {'token': 'b', 'value': 2},
+            ]},
+            'bare': {'type': 'Choice', 'base_type': 'string', 'choices': ['a', 'b']},
+        })
+        assert_that(validate({
+            'untyped': object(),
+            'text': 'ab',
+            'no_schema': 42,
+            'items': [[1], [2]],
+            'hidden': [object()],
+            'sized': {'a': None},
+            'chosen': 2,
+            'bare': 'b',
+        }), is_([]))
+        assert_that(validate({
+            'text': 'abc',
+            'items': [[1], [1]],
+            'hidden': {},
+            'sized': {},
+            'chosen': ['a'],
+            'bare': 'c',
+        }), contains_inanyorder(
+            (('bare',), 'ConstraintNotSatisfied'),
+            (('text',), 'TooLong'),
+            (('items',), 'NotUnique'),
+            (('hidden',), 'WrongType'),
+            (('sized',), 'TooShort'),
+            (('chosen',), 'ConstraintNotSatisfied'),
+        ))
+        assert_that(validate({'items': [], 'sized': []}), contains_inanyorder(
+            (('items',), 'TooShort'),
+            (('sized',), 'WrongType'),
+        ))
+        assert_that(validate({'items': [1, 2, 3], 'chosen': 'a'}),
+                    is_([(('items',), 'TooLong')]))
+
+    def test_bad_reference(self):
+        with self.assertRaises(ValueError):
+            compile_validator({'a': {'schema': {'$ref': '#/$defs/missing'}}})
+
+    def test_no_zope_interface(self):
+        # The validator module doesn't need the component architecture.
+        out = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys; import nti.schema.jsonvalidator; '
+            'print(sorted(k for k in sys.modules if k.startswith("zope.interface")))'
+        ])
+        assert_that(out.strip(), is_(b'[]'))
+
+
+def test_suite():
+    import doctest
+    suite = unittest.defaultTestLoader.loadTestsFromName(__name__)
+    suite.addTest(doctest.DocTestSuite('nti.schema.jsonvalidator'))
+    return suite
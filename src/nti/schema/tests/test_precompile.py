@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for precompile.py
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from zope.interface import Interface
+from zope.interface import implementedBy
+from zope.interface import implementer
+from zope.schema import Choice
+from zope.schema import Int
+from zope.schema import List
+from zope.schema import Object
+from zope.schema import TextLine
+
+from hamcrest import assert_that
+from hamcrest import has_length
+from hamcrest import is_
+from hamcrest import none
+from hamcrest import not_none
+
+from nti.schema import precompile
+from nti.schema.eqhash import EqHash
+from nti.schema.interfaces import ISchemaConfigured
+from nti.schema.jsonschema import JsonSchemafier
+from nti.schema.schema import schemadict
+
+from nti.schema.precompile import PrecompileCache
+from nti.schema.precompile import get_installed_cache
+from nti.schema.precompile import install_cache
+from nti.schema.precompile import uninstall_cache
+
+# pylint:disable=inherit-non-class,protected-access,no-value-for-parameter
+
+class IBase(Interface):
+    name = TextLine(title='Name')
+
+class IDerived(IBase):
+    age = Int(title='Age')
+
+class IChoices(Interface):
+    letter = Choice(title='Letter', values=('a', 'b'))
+
+class INested(Interface):
+    things = List(title='Things',
+                  value_type=Object(ISchemaConfigured))
+
+def _local_interface():
+    class ILocal(Interface):
+        pass
+    return ILocal
+
+class IHasLocal(Interface):
+    local = Object(_local_interface())
+
+@implementer(IDerived)
+class Derived(object):
+    pass
+
+
+class TestPrecompileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache')
+
+    def tearDown(self):
+        uninstall_cache()
+        shutil.rmtree(self.directory)
+        for iface in (IBase, IDerived):
+            iface.changed(iface)
+
+    def _compute(self):
+        for iface in (IBase, IDerived):
+            iface.changed(iface)
+        return (
+            schemadict(IDerived),
+            schemadict(implementedBy(Derived)),
+            JsonSchemafier(IDerived, cache=True).make_schema_template(),
+        )
+
+    def test_install(self):
+        assert_that(get_installed_cache(), is_(none()))
+        cache = install_cache(self.path)
+        assert_that(get_installed_cache(), is_(cache))
+        assert_that(uninstall_cache(), is_(cache))
+        assert_that(get_installed_cache(), is_(none()))
+
+    def test_round_trip(self):
+        expected = self._compute()
+
+        cache = install_cache(self.path, 'v1')
+        assert_that(self._compute(), is_(expected))
+        self.assertTrue(cache.dirty)
+        cache.save()
+        self.assertFalse(cache.dirty)
+        assert_that(cache, has_length(3))
+
+        # A new process
+        cache = install_cache(self.path, 'v1')
+        assert_that(cache, has_length(3))
+        assert_that(cache.get_schemadict(IDerived), is_(expected[0]))
+        assert_that(cache.get_schemadict(implementedBy(Derived)), is_(expected[1]))
+        key = JsonSchemafier(IDerived).template_cache_key()
+        assert_that(cache.get_template(IDerived, key), is_(expected[2]))
+        assert_that(self._compute(), is_(expected))
+        self.assertFalse(cache.dirty)
+
+        # The fields are our own.
+        self.assertIs(schemadict(IDerived)['age'], IDerived['age'])
+
+    def test_other_version_ignored(self):
+        cache = install_cache(self.path, 'v1')
+        self._compute()
+        cache.save()
+        assert_that(PrecompileCache(self.path, 'v2'), has_length(0))
+        assert_that(PrecompileCache(self.path, 'v1'), has_length(3))
+
+    def test_bad_files_ignored(self):
+        assert_that(PrecompileCache(self.path), has_length(0))
+        with open(self.path, 'wb'):
+            pass
+        assert_that(PrecompileCache(self.path), has_length(0))
+        with open(self.path, 'wb') as f:
+            f.write(b'not a pickle')
+        assert_that(PrecompileCache(self.path), has_length(0))
+
+    def test_unreachable_not_cached(self):
+        class ILocal(Interface):
+            name = TextLine(title='Name')
+        cache = install_cache(self.path)
+        fields = schemadict(ILocal)
+        assert_that(fields, has_length(1))
+        assert_that(cache.get_schemadict(ILocal), is_(none()))
+        assert_that(cache, has_length(0))
+
+    def test_nested_interfaces_in_key(self):
+        cache = install_cache(self.path)
+        schemafier = JsonSchemafier(INested, cache=True)
+        template = schemafier.make_schema_template()
+        key = schemafier.template_cache_key()
+        assert_that(cache.get_template(INested, key), is_(template))
+
+        # The module of the nested interface changes, but ours doesn't.
+        module_hashes = precompile._module_hashes
+        self.addCleanup(module_hashes.pop, 'nti.schema.interfaces')
+        module_hashes['nti.schema.interfaces'] = b'changed'
+        assert_that(cache.get_template(INested, key), is_(none()))
+
+    def test_unreachable_nested_not_cached(self):
+        cache = install_cache(self.path)
+        cache.set_template(IBase, (), {})
+        assert_that(cache, has_length(1))
+        cache.set_template(IHasLocal, (), {})
+        assert_that(cache, has_length(1))
+        assert_that(cache.get_template(IHasLocal, ()), is_(none()))
+
+    def test_choices_not_cached(self):
+        cache = install_cache(self.path)
+        schemafier = JsonSchemafier(IChoices, cache=True)
+        template = schemafier.make_schema_template()
+        assert_that(template['letter']['choices'], is_(['a', 'b']))
+        assert_that(cache.get_template(IChoices, schemafier.template_cache_key()),
+                    is_(none()))
+        assert_that(cache, has_length(0))
+
+    def test_unpicklable_not_cached(self):
+        cache = PrecompileCache(self.path)
+        cache.set(('key',), lambda: None)
+        assert_that(cache, has_length(0))
+        self.assertFalse(cache.dirty)
+
+    def test_code(self):
+        cache = install_cache(self.path)
+
+        @EqHash('a', 'b')
+        class Thing(object):
+            def __init__(self, a, b):
+                self.a = a
+                self.b = b
+
+        assert_that(Thing(1, 2), is_(Thing(1, 2)))
+        # __eq__ and __hash__
+        assert_that(cache, has_length(2))
+        cache.save()
+
+        cache = PrecompileCache(self.path)
+        source = 'def f():\n    return 42'
+        assert_that(cache.get(('code', source)), is_(none()))
+        code = cache.get_code(source)
+        assert_that(code, is_(not_none()))
+        cache.save()
+        ns = {}
+        exec(PrecompileCache(self.path).get_code(source), ns) # pylint:disable=exec-used
+        assert_that(ns['f'](), is_(42))
+
+    def test_clear(self):
+        cache = install_cache(self.path)
+        self._compute()
+        cache.save()
+        cache.clear()
+        cache.save()
+        assert_that(PrecompileCache(self.path), has_length(0))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for prefork.py
+
+"""
+
+import gc
+import unittest
+from unittest import mock
+
+from zope.interface import Interface
+from zope.interface import implementer
+from zope.schema import List
+from zope.schema import Object
+
+from hamcrest import assert_that
+from hamcrest import contains_string
+from hamcrest import has_properties
+from hamcrest import is_
+from hamcrest import none
+
+from nti.schema.field import Choice
+from nti.schema.field import ValidTextLine
+from nti.schema.fieldproperty import createDirectFieldProperties
+from nti.schema.schema import SchemaConfigured
+
+from . import SchemaLayer
+
+# pylint:disable=inherit-non-class,protected-access
+
+class IAddress(Interface):
+    country = Choice(title='Country', vocabulary='Countries')
+
+class IPerson(Interface):
+    name = ValidTextLine(title='Name')
+    address = Object(IAddress)
+    missing = Choice(title='Missing', vocabulary='No Such Vocabulary')
+
+class IPhone(Interface):
+    number = ValidTextLine(title='Number')
+
+class IContact(Interface):
+    phones = List(title='Phones', value_type=Object(IPhone))
+    countries = List(title='Countries',
+                     value_type=Choice(title='Country', vocabulary='Countries'))
+
+@implementer(IPerson)
+class Person(SchemaConfigured):
+    createDirectFieldProperties(IPerson)
+
+
+class TestWarmup(unittest.TestCase):
+
+    layer = SchemaLayer
+
+    def setUp(self):
+        for iface in IAddress, IPerson, IPhone, IContact:
+            iface.changed(iface)
+        Person.sc_changed()
+
+    def test_warmup(self):
+        from nti.schema import warmup
+        from nti.schema.vocabulary import CountryVocabularyFactory
+
+        report = warmup([Person, IPerson], freeze=False)
+        assert_that(report, has_properties(
+            classes=1,
+            schema_configured=1,
+            # Including ISchemaConfigured
+            interfaces=3,
+            # Not IPerson, its missing vocabulary can't be exported
+            templates=2,
+            fields=7,
+            vocabularies=1,
+            frozen=none(),
+        ))
+        assert_that(str(report), contains_string('3 interfaces'))
+
+        self.assertIn('__SchemaConfigured_elide_fieldproperty', Person.__dict__)
+        for iface in IAddress, IPerson:
+            self.assertIn('__nti_schema_schemadict', iface._v_attrs)
+        self.assertIn('__nti_schema_jsonschema_template', IAddress._v_attrs)
+        vocabulary = CountryVocabularyFactory(None)
+        assert_that(vocabulary._prefix_index, is_(list))
+        self.assertIn('_v_nti_schema_exported', vocabulary.__dict__)
+
+    def test_warmup_collections(self):
+        from nti.schema.prefork import warmup
+
+        report = warmup([IContact], freeze=False)
+        assert_that(report, has_properties(
+            interfaces=2,
+            templates=2,
+            fields=3,
+            vocabularies=1,
+        ))
+        self.assertIn('__nti_schema_jsonschema_template', IPhone._v_attrs)
+
+    def test_freeze(self):
+        from nti.schema.prefork import warmup
+        if not hasattr(gc, 'freeze'): # pragma: no cover
+            return
+        with mock.patch('gc.collect') as collect:
+            try:
+                report = warmup([IPerson], json_schemas=False)
+            finally:
+                gc.unfreeze()
+            collect.assert_not_called()
+            self.assertGreater(report.frozen, 0)
+            assert_that(report.templates, is_(0))
+
+            try:
+                warmup([IPerson], json_schemas=False, collect=True)
+            finally:
+                gc.unfreeze()
+            collect.assert_called_once_with()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for profiling.py
+
+"""
+
+import doctest
+import os
+import shutil
+import tempfile
+import unittest
+
+from zope.interface import Interface
+from zope.interface import implementer
+from zope.schema.interfaces import ValidationError
+
+from hamcrest import assert_that
+from hamcrest import contains_string
+from hamcrest import has_entries
+from hamcrest import has_key
+from hamcrest import is_
+from hamcrest import none
+
+from nti.schema.field import Object
+from nti.schema.field import ValidTextLine
+from nti.schema.fieldproperty import createDirectFieldProperties
+from nti.schema.instrumentation import disable_instrumentation
+from nti.schema.instrumentation import enable_instrumentation
+from nti.schema.instrumentation import get_recorder
+from nti.schema.schema import SchemaConfigured
+
+from nti.schema.profiling import Profiler
+from nti.schema.profiling import profile
+
+# pylint:disable=inherit-non-class
+
+class IAddress(Interface):
+    city = ValidTextLine(title='City', max_length=10)
+
+class IPerson(Interface):
+    address = Object(IAddress, title='Address')
+
+@implementer(IAddress)
+class Address(SchemaConfigured):
+    createDirectFieldProperties(IAddress)
+
+@implementer(IPerson)
+class Person(SchemaConfigured):
+    createDirectFieldProperties(IPerson)
+
+PERSON = __name__ + '.Person'
+ADDRESS = __name__ + '.IPerson.address(Object)'
+CITY = __name__ + '.IAddress.city(ValidTextLine)'
+
+
+class TestProfile(unittest.TestCase):
+
+    def tearDown(self):
+        disable_instrumentation()
+
+    def test_nested(self):
+        with profile() as profiler:
+            Person(address=Address(city='Here'))
+            with self.assertRaises(ValidationError):
+                Address(city='A long city name')
+
+        assert_that(get_recorder(), is_(none()))
+        paths = profiler.paths()
+        assert_that(paths, has_key(('init:' + PERSON,)))
+        assert_that(paths[('init:' + PERSON,)],
+                    has_entries(count=1, failures=0))
+        assert_that(paths[('init:' + PERSON, 'validate:' + ADDRESS,
+                           'validate:' + CITY)],
+                    has_entries(count=1, failures=0))
+        assert_that(paths[('init:' + __name__ + '.Address', 'validate:' + CITY)],
+                    has_entries(count=2, failures=1))
+        # The flat statistics are kept too
+        assert_that(profiler.snapshot()['init'][PERSON], has_entries(count=1))
+
+        tree = profiler.format_tree(unit='us')
+        assert_that(tree, contains_string('calls init:' + PERSON + '\n'))
+        assert_that(tree, contains_string('\n    '))
+        assert_that(str(profiler), contains_string('ms 1 calls validate:' + CITY))
+
+        profiler.reset()
+        assert_that(profiler.paths(), is_({}))
+        assert_that(profiler.collapsed(), is_(''))
+
+    def test_collapsed(self):
+        profiler = Profiler()
+        profiler._paths = { # pylint:disable=protected-access
+            ('a',): [1, 0.003, 0],
+            ('a', 'b'): [2, 0.002, 0],
+            ('a', 'b', 'c'): [2, 0.0015, 1],
+            ('a', 'd'): [1, 0.0000001, 0],
+        }
+        assert_that(profiler.collapsed(),
+                    is_('a 1000\na;b 500\na;b;c 1500\n'))
+        assert_that(profiler.collapsed(scale=1e3), is_('a 1\na;b;c 2\n'))
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'out.folded')
+            profiler.write_collapsed(path)
+            with open(path, encoding='utf-8') as f:
+                assert_that(f.read(), is_(profiler.collapsed()))
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_restores_previous_recorder(self):
+        recorder = enable_instrumentation()
+        with profile() as profiler:
+            self.assertIs(get_recorder(), profiler)
+        self.assertIs(get_recorder(), recorder)
+
+    def test_package_function(self):
+        from nti.schema import profile as package_profile
+        assert_that(package_profile(), is_(Profiler))
+
+
+def test_suite():
+    return unittest.TestSuite((
+        unittest.defaultTestLoader.loadTestsFromName(__name__),
+        doctest.DocTestSuite("nti.schema.profiling"),
+    ))
+
+if __name__ == '__main__':
+    unittest.main()
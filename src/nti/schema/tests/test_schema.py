@@ -14,6 +14,7 @@ from hamcrest import calling
 from hamcrest import raises
 does_not = is_not
 
+import gc
 import unittest
 
 from zope import interface
@@ -88,6 +89,32 @@ class TestSchemaConfigured(unittest.TestCase):
         A.sc_changed()
         self.assertNotIn('__SchemaConfigured_elide_fieldproperty', A.__dict__)
 
+    def test_sc_warmup(self):
+        class IA(interface.Interface):
+            field = Number()
+
+        @interface.implementer(IA)
+        class A(SchemaConfigured):
+            pass
+
+        schema = A.sc_warmup()
+        self.assertEqual(list(schema), ['field'])
+        self.assertIn('__SchemaConfigured_elide_fieldproperty', A.__dict__)
+
+    def test_sc_warmup_schema_spec(self):
+        class IA(interface.Interface):
+            field = Number()
+
+        class IB(interface.Interface):
+            other = Number()
+
+        @interface.implementer(IA)
+        class A(SchemaConfigured):
+            def sc_schema_spec(self):
+                return IB
+
+        self.assertEqual(list(A.sc_warmup()), ['other'])
+
     def test_readonly(self):
         from nti.schema.fieldproperty import createDirectFieldProperties
         class IA(interface.Interface):
@@ -168,6 +195,14 @@ class TestSchemaitems(unittest.TestCase):
 
 class TestSchemadict(unittest.TestCase):
 
+    def setUp(self):
+        # The tests each define an ``IA``, and interfaces with the
+        # same name and module are equal. If the one from an earlier
+        # test is still waiting to be collected, it can take the place of
+        # the new one in ``Interface``'s dependents and be removed
+        # from there at any time, breaking ``__bases__`` assignment.
+        gc.collect()
+
     def test_single_interface(self):
         class IA(interface.Interface):
             field1 = Number()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for _sitecache.py
+
+"""
+
+import gc
+import unittest
+import weakref
+
+from zope.component import getGlobalSiteManager
+from zope.component import hooks
+from zope.interface.registry import Components
+
+from hamcrest import assert_that
+from hamcrest import has_length
+from hamcrest import is_
+from hamcrest import none
+
+from nti.schema._sitecache import SiteCache
+
+
+class Site(object):
+
+    def __init__(self, components=None):
+        self.components = components if components is not None else Components(
+            bases=(getGlobalSiteManager(),))
+
+    def getSiteManager(self):
+        return self.components
+
+
+class TestSiteCache(unittest.TestCase):
+
+    def setUp(self):
+        hooks.setHooks()
+        self.addCleanup(hooks.resetHooks)
+
+    def test_per_site(self):
+        cache = SiteCache()
+        assert_that(cache.get('key'), is_(none()))
+        assert_that(cache.get('key', 42), is_(42))
+        cache.set('key', 'global')
+
+        site = Site()
+        with hooks.site(site):
+            assert_that(cache.get('key'), is_(none()))
+            cache.set('key', 'local')
+            assert_that(cache.get('key'), is_('local'))
+        assert_that(cache.get('key'), is_('global'))
+        assert_that(cache, has_length(2))
+
+        cache.clear()
+        assert_that(cache, has_length(0))
+        assert_that(cache.get('key'), is_(none()))
+
+    def test_site_managers_not_kept(self):
+        cache = SiteCache()
+        site = Site()
+        with hooks.site(site):
+            cache.set('key', 'local')
+        assert_that(cache, has_length(1))
+
+        components = weakref.ref(site.components)
+        del site
+        gc.collect()
+        assert_that(components(), is_(none()))
+        assert_that(cache, has_length(0))
+
+    def test_not_weakly_referenced(self):
+        cache = SiteCache()
+        with hooks.site(Site(components=42)):
+            cache.set('key', 'value')
+            assert_that(cache.get('key', 'default'), is_('default'))
+        assert_that(cache, has_length(0))
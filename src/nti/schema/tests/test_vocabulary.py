@@ -5,6 +5,7 @@ from __future__ import division
 from __future__ import print_function
 
 # stdlib imports
+import pickle
 import unittest
 
 from zope.interface import Interface
@@ -16,11 +17,16 @@ from . import SchemaLayer
 from hamcrest import assert_that
 from hamcrest import has_entry
 from hamcrest import has_item
+from hamcrest import has_length
 from hamcrest import has_property
 from hamcrest import is_
 from hamcrest import is_in
 from hamcrest import is_not
+from hamcrest import none
 from hamcrest import not_none
+from hamcrest import same_instance
+
+from nti.testing.matchers import verifiably_provides
 
 # disable: accessing protected members, too many methods
 # pylint: disable=W0212,R0904,inherit-non-class
@@ -54,6 +60,344 @@ class TestConfiguredVocabulary(unittest.TestCase):
         schema = JsonSchemafier(IA).make_schema()
         assert_that(schema, has_entry('choice', has_entry('choices', has_item(ext))))
 
+    def test_country_vocabulary_shared(self):
+        from zope import component
+        from nti.i18n.locales.interfaces import ICountryAvailability
+        from nti.schema.vocabulary import CountryTerm
+        from nti.schema.vocabulary import CountryVocabularyFactory
+
+        vocabulary = CountryVocabularyFactory(None)
+        assert_that(CountryVocabularyFactory(None), is_(same_instance(vocabulary)))
+        # Terms keep their flag, in their dict, when pickled.
+        term = pickle.loads(pickle.dumps(vocabulary.getTermByToken('us')))
+        assert_that(term, is_(CountryTerm))
+        assert_that(term.flag, is_('countryflag/us'))
+
+        class Countries(object):
+            def getCountries(self):
+                return {'zz': {'name': 'Zed', 'flag': 'countryflag/zz'}}
+
+        gsm = component.getGlobalSiteManager()
+        original = gsm.getUtility(ICountryAvailability)
+        gsm.registerUtility(Countries(), ICountryAvailability)
+        try:
+            replaced = CountryVocabularyFactory(None)
+            assert_that(list(replaced.by_token), is_(['zz']))
+        finally:
+            gsm.registerUtility(original, ICountryAvailability)
+        restored = CountryVocabularyFactory(None)
+        assert_that(restored, is_not(same_instance(vocabulary)))
+        assert_that('us', is_in(restored))
+
+    def test_choices_cached_by_name(self):
+        from zope import component
+        from zope.schema import Choice
+        from zope.schema.interfaces import IVocabularyFactory
+        from zope.schema.vocabulary import SimpleVocabulary
+        from nti.schema import jsonschema
+
+        calls = []
+        def factory(_context):
+            calls.append(1)
+            return SimpleVocabulary.fromValues(['a', 'b'])
+
+        gsm = component.getGlobalSiteManager()
+        gsm.registerUtility(factory, IVocabularyFactory, 'Letters')
+        try:
+            class IA(Interface):
+                choice = Choice(title="Choice", vocabulary="Letters")
+
+            field = IA['choice']
+            choices, base_type = jsonschema.get_data_from_choice_field(field)
+            assert_that(choices, is_(['a', 'b']))
+            assert_that(base_type, is_('string'))
+            assert_that(jsonschema.get_data_from_choice_field(field, 'int'),
+                        is_((['a', 'b'], 'int')))
+            assert_that(jsonschema.get_json_from_choice_field(field),
+                        is_(b'["a","b"]'))
+            assert_that(calls, is_([1]))
+
+            # Changing the registrations discards the cache
+            gsm.registerUtility(factory, IVocabularyFactory, 'Other')
+            assert_that(jsonschema.get_data_from_choice_field(field)[0],
+                        is_(['a', 'b']))
+            assert_that(calls, is_([1, 1]))
+        finally:
+            gsm.unregisterUtility(factory, IVocabularyFactory, 'Letters')
+            gsm.unregisterUtility(factory, IVocabularyFactory, 'Other')
+        assert_that(jsonschema._exported_by_name, has_length(0))
+
+    def test_choices_cached_by_vocabulary(self):
+        from zope.schema import Choice
+        from zope.schema.vocabulary import SimpleTerm
+        from zope.schema.vocabulary import SimpleVocabulary
+        from nti.schema import jsonschema
+
+        class Term(SimpleTerm):
+            def toExternalObject(self):
+                return {'token': self.token, 'title': self.title}
+
+        vocabulary = SimpleVocabulary([Term(1, 'one', 'One')])
+        field = Choice(vocabulary=vocabulary)
+        assert_that(jsonschema.get_data_from_choice_field(field),
+                    is_(([{'token': 'one', 'title': 'One'}], 'string')))
+        assert_that(jsonschema.get_json_from_choice_field(field),
+                    is_(b'[{"title":"One","token":"one"}]'))
+
+        vocabulary._terms.append(Term(2, 'two', 'Two'))
+        assert_that(jsonschema.get_data_from_choice_field(field)[0], has_length(1))
+        jsonschema.vocabularies_changed(vocabulary)
+        assert_that(jsonschema.get_data_from_choice_field(field)[0], has_length(2))
+        assert_that(jsonschema.get_json_from_choice_field(field),
+                    is_(b'[{"title":"One","token":"one"},{"title":"Two","token":"two"}]'))
+
+class TestSnapshot(unittest.TestCase):
+
+    layer = SchemaLayer
+
+    def test_valid_choice_snapshot(self):
+        from zope import component
+        from zope.schema.interfaces import ConstraintNotSatisfied
+        from zope.schema.interfaces import IVocabularyFactory
+        from zope.schema.vocabulary import SimpleVocabulary
+        from nti.schema.field import ValidChoice
+
+        calls = []
+        def factory(_context):
+            calls.append(1)
+            return SimpleVocabulary.fromValues(['a', 'b'])
+
+        gsm = component.getGlobalSiteManager()
+        gsm.registerUtility(factory, IVocabularyFactory, 'Letters')
+        try:
+            field = ValidChoice(vocabulary='Letters', snapshot=True)
+            field.validate('a')
+            field.validate('b')
+            with self.assertRaises(ConstraintNotSatisfied):
+                field.validate('c')
+            with self.assertRaises(ConstraintNotSatisfied):
+                field.validate(['a'])
+            assert_that(calls, is_([1]))
+
+            # Bound copies use the same vocabulary and snapshot
+            bound = field.bind(self)
+            assert_that(bound.vocabulary, has_length(2))
+            bound.validate('a')
+            with self.assertRaises(ConstraintNotSatisfied):
+                bound.validate('c')
+            rebound = bound.bind(None)
+            assert_that(rebound.vocabulary, is_(same_instance(bound.vocabulary)))
+            rebound.validate('b')
+            assert_that(calls, is_([1]))
+
+            # Without a snapshot, we look it up each time
+            ValidChoice(vocabulary='Letters').validate('a')
+            ValidChoice(vocabulary='Letters').bind(None).validate('a')
+            assert_that(calls, is_([1, 1, 1]))
+
+            # Changing the registrations discards the snapshot
+            gsm.registerUtility(lambda _: SimpleVocabulary.fromValues(['c']),
+                                IVocabularyFactory, 'Letters')
+            field.validate('c')
+            with self.assertRaises(ConstraintNotSatisfied):
+                field.validate('a')
+        finally:
+            gsm.unregisterUtility(provided=IVocabularyFactory, name='Letters')
+
+        # Missing vocabularies are handled as usual
+        from zope.schema.interfaces import ValidationError
+        with self.assertRaises(ValidationError):
+            field.validate('a')
+
+    def test_snapshot_per_site(self):
+        import gc
+        import weakref
+        from zope import component
+        from zope.component import hooks
+        from zope.schema.interfaces import ConstraintNotSatisfied
+        from zope.schema.interfaces import IVocabularyFactory
+        from zope.schema.vocabulary import SimpleVocabulary
+        from nti.schema import vocabulary
+        from nti.schema.field import ValidChoice
+        from .test_sitecache import Site
+
+        hooks.setHooks()
+        self.addCleanup(hooks.resetHooks)
+
+        gsm = component.getGlobalSiteManager()
+        gsm.registerUtility(lambda _context: SimpleVocabulary.fromValues(['a']),
+                            IVocabularyFactory, 'Letters')
+        self.addCleanup(gsm.unregisterUtility, provided=IVocabularyFactory, name='Letters')
+
+        field = ValidChoice(vocabulary='Letters', snapshot=True)
+        site = Site()
+        site.components.registerUtility(lambda _context: SimpleVocabulary.fromValues(['c']),
+                                        IVocabularyFactory, 'Letters',
+                                        # Events are kept by the test layer.
+                                        event=False)
+        with hooks.site(site):
+            field.validate('c')
+            field.bind(None).validate('c')
+        with self.assertRaises(ConstraintNotSatisfied):
+            field.validate('c')
+        field.validate('a')
+        assert_that(vocabulary._snapshots_by_name, has_length(2))
+
+        components = weakref.ref(site.components)
+        del site
+        gc.collect()
+        assert_that(components(), is_(none()))
+        assert_that(vocabulary._snapshots_by_name, has_length(1))
+
+    def test_countries_snapshot(self):
+        from zope.schema.interfaces import ConstraintNotSatisfied
+        from nti.schema.field import ValidChoice
+        from nti.schema.vocabulary import LazyVocabulary
+        from nti.schema.vocabulary import membership_snapshot
+
+        field = ValidChoice(vocabulary='Countries', snapshot=True)
+        field.validate('us')
+        with self.assertRaises(ConstraintNotSatisfied):
+            field.validate('United States')
+
+        assert_that(1, is_in(membership_snapshot(LazyVocabulary([(None, 1, None)]))))
+
+        class Vocab(LazyVocabulary):
+            membership_snapshot = None
+        assert_that(membership_snapshot(Vocab(())), is_(none()))
+
+
+class TestIndexedVocabulary(unittest.TestCase):
+
+    def _make(self, **kwargs):
+        from zope.schema.vocabulary import SimpleTerm
+        from nti.schema.vocabulary import IndexedVocabulary
+        return IndexedVocabulary([
+            SimpleTerm(1, 'us', 'United States'),
+            SimpleTerm(2, 'gb', 'United Kingdom'),
+            SimpleTerm(3, 'uy', 'Uruguay'),
+            SimpleTerm(4, 'de', 'Germany'),
+            SimpleTerm(5, 'un'),
+        ], **kwargs)
+
+    def _tokens(self, terms):
+        return [term.token for term in terms]
+
+    def test_search(self):
+        vocab = self._make()
+        assert_that(self._tokens(vocab.search('U')), is_(['us', 'gb', 'uy', 'un']))
+        assert_that(self._tokens(vocab.search('united k')), is_(['gb']))
+        assert_that(self._tokens(vocab.search('g')), is_(['gb', 'de']))
+        assert_that(self._tokens(vocab.search('u', start=1, limit=2)), is_(['gb', 'uy']))
+        assert_that(vocab.search('x'), is_([]))
+        assert_that(self._tokens(vocab.search('')), has_length(5))
+
+    def test_page(self):
+        vocab = self._make()
+        assert_that(self._tokens(vocab.page(limit=2)), is_(['us', 'gb']))
+        assert_that(self._tokens(vocab.page(3)), is_(['de', 'un']))
+
+    def test_fuzzy_search(self):
+        vocab = self._make()
+        with self.assertRaises(TypeError):
+            vocab.fuzzy_search('germny')
+
+        vocab = self._make(fuzzy=True)
+        assert_that(self._tokens(vocab.fuzzy_search('germny')), is_(['de']))
+        assert_that(self._tokens(vocab.fuzzy_search('united', limit=2)), is_(['us', 'gb']))
+        assert_that(vocab.fuzzy_search('zzzz'), is_([]))
+
+    def test_choice(self):
+        from nti.schema.field import ValidChoice
+        from nti.schema import jsonschema
+        vocab = self._make()
+        field = ValidChoice(vocabulary=vocab)
+        field.validate(1)
+        choices, _ = jsonschema.get_data_from_choice_field(field, start=1, limit=2)
+        assert_that(choices, is_([{'token': 'gb', 'value': 2, 'title': 'United Kingdom'},
+                                  {'token': 'uy', 'value': 3, 'title': 'Uruguay'}]))
+
+    def test_countries(self):
+        from nti.i18n.locales.countries import CountryAvailability
+        from nti.schema.vocabulary import _make_country_vocabulary
+        vocab = _make_country_vocabulary(CountryAvailability())
+        assert_that(self._tokens(vocab.search('united k')), is_(['gb']))
+        assert_that(self._tokens(vocab.fuzzy_search('Germny', limit=1)), is_(['de']))
+
+
+class TestLazyVocabulary(unittest.TestCase):
+
+    def _items(self):
+        return [
+            ('one', 1, 'One'),
+            (None, 2, None),
+            (b'thr\xe9e', 3, 'Three'),
+            ('f\N{SNOWMAN}ur', 4, 'Four'),
+        ]
+
+    def test_build_indexes(self):
+        from nti.schema.vocabulary import LazyVocabulary
+        vocab = LazyVocabulary(self._items)
+        vocab.build_indexes()
+        assert_that(vocab._by_token, has_length(4))
+        assert_that(vocab._by_value, has_length(4))
+
+        vocab = LazyVocabulary([('a', [], 'Unhashable')])
+        vocab.build_indexes()
+        assert_that(vocab._by_token, has_length(1))
+        assert_that(vocab._by_value, is_(none()))
+
+    def test_lazy(self):
+        from zope.schema.interfaces import IVocabularyTokenized
+        from zope.schema.vocabulary import SimpleTerm
+        from nti.schema.vocabulary import LazyVocabulary
+
+        loaded = []
+        def loader():
+            loaded.append(1)
+            return self._items()
+
+        vocab = LazyVocabulary(loader)
+        assert_that(vocab, verifiably_provides(IVocabularyTokenized))
+        assert_that(loaded, is_([]))
+        assert_that(len(vocab), is_(4))
+        assert_that(loaded, is_([1]))
+
+        assert_that(1, is_in(vocab))
+        assert_that(5, is_not(is_in(vocab)))
+        assert_that([], is_not(is_in(vocab)))
+
+        assert_that(vocab.getTerm(1), is_(SimpleTerm(1, 'one', 'One')))
+        assert_that(vocab.getTermByToken('2'), is_(SimpleTerm(2)))
+        assert_that(vocab.getTermByToken('thr\\xe9e'), is_(SimpleTerm(3, b'thr\xe9e', 'Three')))
+        assert_that(vocab.getTerm(4).token, is_('f\\u2603ur'))
+        with self.assertRaises(LookupError):
+            vocab.getTerm(5)
+        with self.assertRaises(LookupError):
+            vocab.getTerm([])
+        with self.assertRaises(LookupError):
+            vocab.getTermByToken('5')
+
+        assert_that([term.value for term in vocab], is_([1, 2, 3, 4]))
+        assert_that(loaded, is_([1]))
+
+    def test_choice(self):
+        from zope.schema import Choice
+        from nti.schema.vocabulary import CountryTerm
+        from nti.schema.vocabulary import LazyVocabulary
+        from nti.schema import jsonschema
+
+        def factory(value, token, title):
+            return CountryTerm(value, token, title, flag='countryflag/' + token)
+
+        vocab = LazyVocabulary(self._items()[:1], term_factory=factory)
+        field = Choice(vocabulary=vocab)
+        field.validate(1)
+        assert_that(jsonschema.get_data_from_choice_field(field)[0],
+                    is_([{'token': 'one', 'value': 1, 'title': 'One',
+                          'flag': 'countryflag/one'}]))
+
+
 def test_suite():
     import doctest
     suite = unittest.defaultTestLoader.loadTestsFromName(__name__)
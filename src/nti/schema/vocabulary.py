@@ -14,12 +14,19 @@ vocabulary named ``Countries`` available::
   ...                      vocabulary="Countries")
 """
 
+from bisect import bisect_left
+
 from zope import component
+from zope.interface import implementer
+from zope.schema.interfaces import IVocabularyTokenized
 from zope.schema.vocabulary import SimpleTerm as _SimpleTerm
 from zope.schema.vocabulary import SimpleVocabulary as _SimpleVocabulary
+from zope.schema.vocabulary import getVocabularyRegistry
 
 from nti.i18n.locales.interfaces import ICountryAvailability
 
+from nti.schema._sitecache import SiteCache
+
 __docformat__ = "restructuredtext en"
 
 
@@ -51,7 +58,250 @@ class CountryTerm(_SimpleTerm):
             'flag': self.flag
         }
 
-class _CountryVocabulary(_SimpleVocabulary):
+def _trigrams(text):
+    text = '  ' + text + ' '
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class IndexedVocabulary(_SimpleVocabulary):
+    """
+    A simple vocabulary that can search its terms by the prefix of their
+    tokens or titles and, if created with ``fuzzy=True``, by
+    similarity, and that can return pages of its terms.
+
+    Searches ignore case. The indexes are built when first needed.
+    Like any :class:`~zope.schema.vocabulary.SimpleVocabulary`, the terms
+    must not be changed after the vocabulary is created.
+
+    .. versionadded:: NEXT
+    """
+
+    _prefix_index = None
+    _trigram_index = None
+
+    def __init__(self, terms, *interfaces, **kwargs):
+        self.fuzzy = kwargs.pop('fuzzy', False)
+        super().__init__(terms, *interfaces, **kwargs)
+
+    def _texts(self, term):
+        texts = {term.token.casefold()}
+        title = getattr(term, 'title', None)
+        if title:
+            texts.add(str(title).casefold())
+        return texts
+
+    def _get_prefix_index(self):
+        index = self._prefix_index
+        if index is None:
+            index = self._prefix_index = sorted(
+                (text, i)
+                for i, term in enumerate(self._terms)
+                for text in self._texts(term)
+            )
+        return index
+
+    def _get_trigram_index(self):
+        index = self._trigram_index
+        if index is None:
+            index = {}
+            for i, term in enumerate(self._terms):
+                for text in self._texts(term):
+                    for trigram in _trigrams(text):
+                        index.setdefault(trigram, set()).add(i)
+            self._trigram_index = index
+        return index
+
+    def build_indexes(self):
+        """
+        Build the indexes now, instead of when they are first needed.
+        """
+        self._get_prefix_index()
+        if self.fuzzy:
+            self._get_trigram_index()
+
+    def page(self, start=0, limit=None):
+        """
+        Return a list of at most *limit* terms (all of them if *limit* is None),
+        in vocabulary order, beginning with the term at *start*.
+        """
+        end = None if limit is None else start + limit
+        return self._terms[start:end]
+
+    def search(self, prefix, start=0, limit=None):
+        """
+        Return a list of the terms whose token or title begins with
+        *prefix*, in vocabulary order, paginated like :meth:`page`.
+        """
+        index = self._get_prefix_index()
+        prefix = prefix.casefold()
+        matches = set()
+        # Every key beginning with the prefix sorts at or after
+        # (prefix,), and before the first key that doesn't begin with it.
+        for i in range(bisect_left(index, (prefix,)), len(index)):
+            text, term_index = index[i]
+            if not text.startswith(prefix):
+                break
+            matches.add(term_index)
+        end = None if limit is None else start + limit
+        terms = self._terms
+        return [terms[i] for i in sorted(matches)[start:end]]
+
+    def fuzzy_search(self, text, limit=10, threshold=0.3):
+        """
+        Return a list of at most *limit* terms whose token or title is
+        similar to *text*, most similar first.
+
+        Similarity is the fraction of the trigrams of *text* that
+        are found in the token or title of the term; terms below the
+        *threshold* aren't returned.
+
+        :raises TypeError: If this vocabulary wasn't created with
+            ``fuzzy=True``.
+        """
+        if not self.fuzzy:
+            raise TypeError("Vocabulary not created with fuzzy=True")
+        index = self._get_trigram_index()
+        trigrams = _trigrams(text.casefold())
+        counts = {}
+        for trigram in trigrams:
+            for term_index in index.get(trigram, ()):
+                counts[term_index] = counts.get(term_index, 0) + 1
+        minimum = threshold * len(trigrams)
+        best = sorted(
+            (-count, term_index)
+            for term_index, count in counts.items()
+            if count >= minimum
+        )[:limit]
+        terms = self._terms
+        return [terms[term_index] for _, term_index in best]
+
+
+def _normalize_token(token):
+    # The same as SimpleTerm does.
+    if isinstance(token, bytes):
+        token = token.decode('raw_unicode_escape')
+    elif not isinstance(token, str):
+        token = str(token)
+    return token.encode('ascii', 'backslashreplace').decode('ascii')
+
+@implementer(IVocabularyTokenized)
+class LazyVocabulary(object):
+    """
+    A tokenized vocabulary that keeps its terms as ``(token, value,
+    title)`` tuples, creating term objects only when they are
+    accessed.
+
+    This uses much less memory than a
+    :class:`~zope.schema.vocabulary.SimpleVocabulary` for large
+    vocabularies, and if *items* is a callable, nothing is loaded
+    until the vocabulary is first used. Term objects are created on
+    each access (they compare equal). Lookups by value or token take
+    constant time.
+
+    :param items: An iterable of ``(token, value, title)`` tuples, or
+        a callable with no arguments returning one. A token of None
+        means to use the value, and a title may be None.
+    :keyword term_factory: A callable accepting ``(value, token, title)``
+        and returning a term. By default,
+        :class:`~zope.schema.vocabulary.SimpleTerm`.
+
+    .. versionadded:: NEXT
+    """
+
+    def __init__(self, items, term_factory=_SimpleTerm):
+        self._loader = items if callable(items) else None
+        self._items = None if self._loader is not None else self._load(items)
+        self._by_token = None
+        self._by_value = None
+        self.term_factory = term_factory
+
+    @staticmethod
+    def _load(items):
+        loaded = []
+        for item in items:
+            token, value, title = item
+            # Keep the tuples we're given if we can.
+            # pylint:disable-next=unidiomatic-typecheck
+            if type(item) is not tuple or not isinstance(token, str) or not token.isascii():
+                item = (_normalize_token(value if token is None else token), value, title)
+            loaded.append(item)
+        return tuple(loaded)
+
+    def _get_items(self):
+        items = self._items
+        if items is None:
+            items = self._items = self._load(self._loader())
+            self._loader = None
+        return items
+
+    def _get_by_token(self):
+        by_token = self._by_token
+        if by_token is None:
+            by_token = self._by_token = {
+                item[0]: i for i, item in enumerate(self._get_items())
+            }
+        return by_token
+
+    def _get_by_value(self):
+        by_value = self._by_value
+        if by_value is None:
+            by_value = self._by_value = {
+                item[1]: i for i, item in enumerate(self._get_items())
+            }
+        return by_value
+
+    def build_indexes(self):
+        """
+        Load the items and build the indexes now, instead of when they are
+        first needed.
+        """
+        self._get_by_token()
+        try:
+            self._get_by_value()
+        except TypeError:
+            # Unhashable values can't be looked up anyway.
+            pass
+
+    def _make_term(self, item):
+        token, value, title = item
+        return self.term_factory(value, token, title)
+
+    def __iter__(self):
+        make_term = self._make_term
+        for item in self._get_items():
+            yield make_term(item)
+
+    def __len__(self):
+        return len(self._get_items())
+
+    def __contains__(self, value):
+        try:
+            return value in self._get_by_value()
+        except TypeError:
+            # Unhashable
+            return False
+
+    def membership_snapshot(self):
+        """
+        Return a frozenset of the values.
+        """
+        return frozenset(self._get_by_value())
+
+    def getTerm(self, value):
+        try:
+            i = self._get_by_value()[value]
+        except (KeyError, TypeError):
+            raise LookupError(value) from None
+        return self._make_term(self._items[i])
+
+    def getTermByToken(self, token):
+        try:
+            i = self._get_by_token()[token]
+        except (KeyError, TypeError):
+            raise LookupError(token) from None
+        return self._make_term(self._items[i])
+
+
+class _CountryVocabulary(IndexedVocabulary):
     """
     ``__contains__`` is based on the token, not the value.
     """
@@ -59,11 +309,142 @@ class _CountryVocabulary(_SimpleVocabulary):
     def __contains__(self, token):
         return token in self.by_token
 
+    def membership_snapshot(self):
+        return frozenset(self.by_token)
+
+#: The vocabularies made by :func:`CountryVocabularyFactory`, keyed
+#: by the :class:`~nti.i18n.locales.interfaces.ICountryAvailability`
+#: they came from.
+_country_vocabularies = {}
+
+def _make_country_vocabulary(countries):
+    return _CountryVocabulary([CountryTerm.fromItem(item)
+                               for item
+                               in countries.getCountries().items()],
+                              fuzzy=True)
+
 def CountryVocabularyFactory(_context):
     """
     A vocabulary factory.
+
+    .. versionchanged:: NEXT
+       The vocabulary is made only once for each
+       :class:`~nti.i18n.locales.interfaces.ICountryAvailability` utility
+       and shared. See :func:`country_vocabularies_changed`.
     """
     countries = component.getUtility(ICountryAvailability)
-    return _CountryVocabulary([CountryTerm.fromItem(item)
-                               for item
-                               in countries.getCountries().items()])
+    try:
+        return _country_vocabularies[countries]
+    except KeyError:
+        pass
+    except TypeError: # pragma: no cover
+        # Unhashable
+        return _make_country_vocabulary(countries)
+    vocabulary = _country_vocabularies[countries] = _make_country_vocabulary(countries)
+    return vocabulary
+
+def country_vocabularies_changed():
+    """
+    Discard the vocabularies cached by :func:`CountryVocabularyFactory`.
+
+    This is called automatically when an
+    :class:`~nti.i18n.locales.interfaces.ICountryAvailability` utility
+    is registered or unregistered.
+
+    .. versionadded:: NEXT
+    """
+    _country_vocabularies.clear()
+
+
+
+class _MembershipSnapshot(object):
+    __slots__ = ('members',)
+
+    def __init__(self, members):
+        self.members = members
+
+    def __contains__(self, value):
+        try:
+            return value in self.members
+        except TypeError:
+            # Unhashable
+            return False
+
+def membership_snapshot(vocabulary):
+    """
+    Return an object whose ``__contains__`` answers the same as that of
+    *vocabulary*, but in constant time and without reference to
+    *vocabulary*, or None if that can't be done.
+
+    If *vocabulary* has a ``membership_snapshot`` method, it is called
+    to get the (hashable) members. Otherwise, if *vocabulary* is a
+    :class:`~zope.schema.vocabulary.SimpleVocabulary` that doesn't
+    change ``__contains__``, its values are the members.
+
+    .. versionadded:: NEXT
+    """
+    snapshot = getattr(vocabulary, 'membership_snapshot', None)
+    if snapshot is not None:
+        return _MembershipSnapshot(snapshot())
+    if isinstance(vocabulary, _SimpleVocabulary) \
+       and type(vocabulary).__contains__ is _SimpleVocabulary.__contains__:
+        return _MembershipSnapshot(frozenset(vocabulary.by_value))
+    return None
+
+#: The ``(vocabulary, membership_snapshot(vocabulary))`` pairs of named
+#: vocabularies, kept for each site.
+_snapshots_by_name = SiteCache()
+
+_NOT_CACHED = object()
+
+def _named_vocabulary_snapshot(name):
+    # Return the vocabulary named *name* and its membership snapshot,
+    # or None. Vocabularies that can't be snapshotted are remembered
+    # too, so they aren't looked for again.
+    cached = _snapshots_by_name.get(name, _NOT_CACHED)
+    if cached is not _NOT_CACHED:
+        return cached
+    try:
+        vocabulary = getVocabularyRegistry().get(None, name)
+    except LookupError:
+        return None
+    snapshot = membership_snapshot(vocabulary)
+    result = (vocabulary, snapshot) if snapshot is not None else None
+    _snapshots_by_name.set(name, result)
+    return result
+
+def named_membership_snapshot(name):
+    """
+    Return the :func:`membership_snapshot` of the vocabulary named
+    *name*, found in the current site, or None if there is no such
+    vocabulary or it cannot be snapshotted.
+
+    Results are cached until :func:`vocabulary_snapshots_changed`
+    is called.
+
+    .. versionadded:: NEXT
+    """
+    result = _named_vocabulary_snapshot(name)
+    return result[1] if result is not None else None
+
+def vocabulary_snapshots_changed():
+    """
+    Discard the snapshots cached by :func:`named_membership_snapshot`.
+
+    This is called automatically when an
+    :class:`~zope.schema.interfaces.IVocabularyFactory` or
+    :class:`~nti.i18n.locales.interfaces.ICountryAvailability`
+    utility is registered or unregistered.
+
+    .. versionadded:: NEXT
+    """
+    _snapshots_by_name.clear()
+
+try:
+    from zope.testing import cleanup
+except ImportError: # pragma: no cover
+    pass
+else:
+    cleanup.addCleanUp(country_vocabularies_changed)
+    cleanup.addCleanUp(vocabulary_snapshots_changed)
+    del cleanup